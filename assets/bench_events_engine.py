@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+bench_events_engine.py — Compare the per-row and columnar engines of
+generate_events_from_clean.py on generated calendar sheets.
+
+Usage:
+  python assets/bench_events_engine.py
+  python assets/bench_events_engine.py --sizes 1000,100000 --repeat 3
+  python assets/bench_events_engine.py --rows-max 100000   # skip the slow loop on 1M
+
+Each size is written to a temporary CSV (mixed HH:MM / AM-PM / Excel-fraction
+times, blank cells, repeated venues), loaded once, then converted by both
+engines in deterministic id-mode. The JSON output of both engines is compared
+byte-for-byte before any timings are reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+import generate_events_from_clean as gen
+
+TIMES = ["19:30", "7:30 PM", "18:00", "", 0.8125, 0.75, "10:00 AM", "21:30", "02:30"]
+TITLES = [
+    "Monthly Meeting", "NO MEETING", "The Saignée Process - get some free rosé",
+    "Mini competition judging", "Christmas Party", "Bottling workshop",
+]
+VENUES = ["Club Rivers 32 Littleton St, Riverwood NSW 2210", "", "TBA"]
+
+
+def make_sheet(n: int, seed: int = 1) -> pd.DataFrame:
+    """Synthetic cleaned sheet with n rows spread over ~30 years."""
+    rnd = random.Random(seed)
+    base = date(2000, 1, 1)
+    rows = []
+    for i in range(n):
+        d = base + timedelta(days=rnd.randrange(11000))
+        rows.append({
+            "Date": d.strftime("%d/%m/%Y"),
+            "Start": rnd.choice(TIMES),
+            "End": rnd.choice(TIMES),
+            "Meeting Activity": rnd.choice(TITLES),
+            "Mini Competition": rnd.choice(["", "Blended red wine of any variety."]),
+            "Comments": "",
+            "Location": rnd.choice(VENUES),
+            "Description": f"Generated row {i}",
+        })
+    return pd.DataFrame(rows)
+
+
+def run(df: pd.DataFrame, convert) -> tuple[float, str]:
+    cols = gen.resolve_columns(df)
+    t0 = time.perf_counter()
+    events = convert(df, cols, gen.DEFAULT_TZ, "deterministic")
+    buf = io.StringIO()
+    gen.write_events_json(events, buf)
+    return time.perf_counter() - t0, buf.getvalue()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark events_from_rows vs events_from_frame")
+    ap.add_argument("--sizes", default="1000,100000,1000000", help="Comma-separated row counts")
+    ap.add_argument("--repeat", type=int, default=1, help="Best-of-N timing per engine")
+    ap.add_argument("--rows-max", type=int, default=None, help="Skip the per-row engine above this size")
+    args = ap.parse_args(argv)
+
+    print(f"{'rows':>9}  {'per-row s':>10}  {'columnar s':>10}  {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (int(s) for s in args.sizes.split(",")):
+            path = Path(tmp) / f"sheet-{n}.csv"
+            make_sheet(n).to_csv(path, index=False)
+            df = gen.load_frame(path)
+
+            fast, fast_out = min(run(df, gen.events_from_frame) for _ in range(args.repeat))
+            if args.rows_max is not None and n > args.rows_max:
+                print(f"{n:>9}  {'skipped':>10}  {fast:>10.3f}  {'-':>8}")
+                continue
+            slow, slow_out = min(run(df, gen.events_from_rows) for _ in range(args.repeat))
+            if slow_out != fast_out:
+                print(f"ERROR: engines disagree on {n} rows", file=sys.stderr)
+                return 1
+            print(f"{n:>9}  {slow:>10.3f}  {fast:>10.3f}  {slow / fast:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
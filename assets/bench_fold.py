@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+bench_fold.py — ICS line folding, before and after the octet-based sawc_ics.fold
+
+Usage:
+  python assets/bench_fold.py
+  python assets/bench_fold.py --sizes 1,4,16,64 --repeat 5
+
+Times folding a DESCRIPTION line of each --sizes KB, once ASCII-only and once
+mixed with multibyte text (accents, CJK, emoji), with the original
+character-based fold ("before") and sawc_ics.fold ("after"). The "over" column
+counts physical lines the old fold left longer than 75 octets.
+
+The randomized property checks of sawc_ics.fold (line length, no split
+characters, unfolding, ASCII identical to the old fold) are in
+tests/test_fold.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+
+from sawc_ics import fold
+
+ASCII = "abcdefghijklmnopqrstuvwxyz ABCDEFGHIJKLMNOPQRSTUVWXYZ 0123456789 ,.;:\\"
+MULTIBYTE = "éüñßøå—“”€ 中文字符 日本語 한국어 🙂📅🏆 Ωλπ"
+
+
+# ---- before: the character-based fold this replaced ----
+
+def fold_before(line: str) -> str:
+    res = []
+    s = line
+    while len(s) > 74:
+        res.append(s[:74])
+        s = " " + s[74:]
+    res.append(s)
+    return "\r\n".join(res)
+
+
+def make_line(kb: int, alphabet: str, seed: int = 1) -> str:
+    rnd = random.Random(seed)
+    text = []
+    size = 0
+    while size < kb * 1024:
+        ch = rnd.choice(alphabet)
+        text.append(ch)
+        size += len(ch.encode("utf-8"))
+    return "DESCRIPTION:" + "".join(text)
+
+
+def over_long(folded: str, limit: int = 75) -> int:
+    return sum(len(part.encode("utf-8")) > limit for part in folded.split("\r\n"))
+
+
+def best_of(fn, line: str, repeat: int, number: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn(line)
+        best = min(best, time.perf_counter() - t0)
+    return best / number * 1e6
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark ICS line folding")
+    ap.add_argument("--sizes", default="1,4,16,64", help="Comma-separated line sizes in KB")
+    ap.add_argument("--repeat", type=int, default=5, help="Best-of-N")
+    args = ap.parse_args(argv)
+
+    print("microseconds per line; over = physical lines > 75 octets")
+    print(f"{'text':<10} {'KB':>4}  {'before':>9}  {'after':>9}  {'speedup':>8}  {'over':>5}")
+    for name, alphabet in (("ascii", ASCII), ("multibyte", ASCII + MULTIBYTE)):
+        for kb in (int(s) for s in args.sizes.split(",")):
+            line = make_line(kb, alphabet)
+            number = max(1, 2000 // kb)
+            if name == "ascii" and fold(line) != fold_before(line):
+                print("ERROR: ASCII outputs differ", file=sys.stderr)
+                return 1
+            t_before = best_of(fold_before, line, args.repeat, number)
+            t_after = best_of(fold, line, args.repeat, number)
+            over = over_long(fold_before(line))
+            print(f"{name:<10} {kb:>4}  {t_before:>9.1f}  {t_after:>9.1f}  {t_before / t_after:>7.1f}x  {over:>5}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+bench_rrule.py — Size and parse cost of plain vs RRULE-compressed ICS feeds
+
+Usage:
+  python assets/bench_rrule.py
+  python assets/bench_rrule.py --years 5,20,50 --topical 0.3
+
+Generates a club archive of --years years: a first-Thursday meeting every
+month (a --topical share of them with their own topic, January cancelled
+with a "NO MEETING" entry) plus a few Saturday workshops. For each size it
+renders the generate_ics.py feed with and without --rrule and prints bytes,
+VEVENT count, render time and the time to unfold and split the feed into
+properties, which is the first thing every subscribing client does.
+
+The archive comes from tests/rrule_fixtures.py, shared with the round-trip
+tests in tests/test_rrule.py (compressed feeds expand back to the plain
+feed's events).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import generate_ics
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests"))
+from rrule_fixtures import archive  # noqa: E402  (the schedules tests/test_rrule.py checks)
+
+
+def parse_time(text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        lines = text.replace("\r\n ", "").split("\r\n")
+        [line.partition(":") for line in lines]
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3
+
+
+def timed(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3, result
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark RRULE-compressed ICS feeds")
+    ap.add_argument("--years", default="5,20,50", help="Comma-separated archive lengths in years")
+    ap.add_argument("--topical", type=float, default=0.3, help="Share of meetings with their own topic")
+    ap.add_argument("--repeat", type=int, default=3, help="Best-of-N")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    print(f"generate_ics.py feed, {args.topical:.0%} topical meetings; times in ms")
+    print(f"{'years':>5} {'events':>7}  {'mode':<6} {'bytes':>9} {'VEVENTs':>8} {'render':>8} {'parse':>7}")
+    for years in (int(s) for s in args.years.split(",")):
+        events = archive(years, args.topical, args.seed)
+        for mode, rrule in (("plain", False), ("rrule", True)):
+            render_ms, text = timed(lambda: generate_ics.generate_ics(events, rrule=rrule), args.repeat)
+            print(f"{years:>5} {len(events):>7}  {mode:<6} {len(text.encode('utf-8')):>9} "
+                  f"{text.count('BEGIN:VEVENT'):>8} {render_ms:>8.1f} {parse_time(text, args.repeat):>7.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
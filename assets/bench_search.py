@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+bench_search.py — Results search: inverted index vs linear scan
+
+Usage:
+  python assets/bench_search.py
+  python assets/bench_search.py --entries 100000 --repeat 20 --check 2000
+
+Builds a synthetic archive of --entries show entries (winemaker names with
+accents, wine styles, optional wine names), indexes it with sawc_search.py
+exactly as build_results_index.py does for a year, and times each query:
+
+  scan     what results.js did on every keystroke: build each entry's
+           "<winemaker> <style> <name>" text, lower-case it, substring test
+  index    sawc_search.search() with postings decoded on first use (cold) and
+           from the memo (warm, i.e. the next keystroke on the same grams)
+
+Every query's index hits must equal a scan of the folded texts (word-prefix
+scan for 1-2 character queries) before timings are printed; --check N also
+compares N random substrings of the archive.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+
+import sawc_search
+
+FIRST = ["James", "David", "Roger", "Luigi", "Renée", "José", "Zoë", "Dimitris", "Andrew", "Siân",
+         "François", "Marta", "Chloé", "Björn", "Ana", "Richard", "Noémie", "Mateus", "Sørina", "Hugo"]
+LAST = ["Follent", "Martin", "Guérin", "Petrini", "Medanić", "Fedrigo", "Sommero", "Wilford",
+        "Andreou", "Frangeskos", "Nuñez", "Øster", "Lefèvre", "Kowalczyk", "Nguyễn", "O'Brien"]
+STYLES = ["Shiraz", "Cabernet Sauvignon", "Merlot", "Rosé", "Pinot Noir", "Chardonnay", "Sémillon",
+          "Riesling", "kumquat", "Mead - Dry", "Mead - Sweet", "Fortified Wine - Grape", "Blended red",
+          "Gewürztraminer", "Grüner Veltliner", "Tempranillo", "Citrus, Dry", "Spirits", "Saignée rosé"]
+NAMES = ["", "", "", "Old Vine", "Reserve", "Backyard Block", "Nonna's", "Cuvée Léa", "Top Paddock"]
+QUERIES = ["shiraz", "cab", "cabernet sauvignon", "rose", "rosé", "guerin", "martin", "mead - sw",
+           "ner ve", "zzz", "ll", "r", "jo", "reserve", "nguyen", "lefevre shiraz"]
+
+
+def make_archive(n: int, seed: int = 1) -> list[dict]:
+    """n entries shaped like results.json entries, each with its entrant inline."""
+    rnd = random.Random(seed)
+    people = [{"display_name": f"{rnd.choice(FIRST)} {rnd.choice(LAST)}"} for _ in range(max(1, n // 50))]
+    return [
+        {"entrant": rnd.choice(people),
+         "wine": {"style": rnd.choice(STYLES), "name": rnd.choice(NAMES) or None, "vintage": rnd.randrange(1990, 2026)}}
+        for _ in range(n)
+    ]
+
+
+def scan(archive: list[dict], query: str) -> list[int]:
+    """The old results.js filter, one query over every entry."""
+    q = query.strip().lower()
+    hits = []
+    for pos, entry in enumerate(archive):
+        wine = entry["wine"]
+        winemaker = entry["entrant"].get("display_name") or "Unnamed entrant"
+        haystack = f"{winemaker} {wine.get('style') or wine.get('name') or ''} {wine.get('name') or ''}".lower()
+        if q in haystack:
+            hits.append(pos)
+    return hits
+
+
+def folded_scan(texts: list[str], query: str) -> list[int]:
+    """What the index must return for query, found the slow way."""
+    q = sawc_search.fold(query.strip())
+    if 0 < len(q) < sawc_search.GRAM:
+        return [pos for pos, text in enumerate(texts) if any(w.startswith(q) for w in text.split())]
+    return [pos for pos, text in enumerate(texts) if q in text]
+
+
+def best(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the results search index against a linear scan")
+    ap.add_argument("--entries", type=int, default=100_000, help="Synthetic archive size")
+    ap.add_argument("--repeat", type=int, default=10, help="Best-of-N per query")
+    ap.add_argument("--check", type=int, default=500, metavar="N", help="Random substring queries to verify")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    archive = make_archive(args.entries, args.seed)
+    t0 = time.perf_counter()
+    texts = [sawc_search.fold(sawc_search.entry_text(e, e["entrant"])) for e in archive]
+    index = sawc_search.build_index(texts)
+    build_s = time.perf_counter() - t0
+    size = len(json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    print(f"{args.entries} entries: index built in {build_s:.2f} s, {size / 1024:.0f} KB "
+          f"({len(index['grams'])} trigrams, {len(index['prefixes'])} prefixes)")
+
+    rnd = random.Random(args.seed)
+    probes = []
+    for _ in range(args.check):
+        text = rnd.choice(texts)
+        start = rnd.randrange(len(text))
+        probes.append(text[start:start + rnd.randint(1, 8)])
+    for query in QUERIES + probes:
+        if sawc_search.search(index, texts, query) != folded_scan(texts, query):
+            print(f"ERROR: index and scan disagree on {query!r}", file=sys.stderr)
+            return 1
+
+    print(f"\n{'query':<22} {'hits':>7}  {'scan ms':>8}  {'cold ms':>8}  {'warm ms':>8}  {'speed-up':>8}")
+    for query in QUERIES:
+        memo: dict = {}
+        hits = sawc_search.search(index, texts, query, memo)
+        scan_s = best(lambda: scan(archive, query), args.repeat)
+        cold_s = best(lambda: sawc_search.search(index, texts, query, {}), args.repeat)
+        warm_s = best(lambda: sawc_search.search(index, texts, query, memo), args.repeat)
+        print(f"{query!r:<22} {len(hits):>7}  {scan_s * 1000:>8.2f}  {cold_s * 1000:>8.2f}  "
+              f"{warm_s * 1000:>8.2f}  {scan_s / warm_s:>7.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
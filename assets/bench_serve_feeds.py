@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+bench_serve_feeds.py — Load test and conformance check for serve_feeds.py
+
+Usage:
+  python assets/bench_serve_feeds.py
+  python assets/bench_serve_feeds.py --requests 50000 --connections 64 --conditional 0.8
+  python assets/bench_serve_feeds.py --url http://127.0.0.1:8001    # an already running server
+  python assets/bench_serve_feeds.py --check
+
+Starts serve_feeds.py on a free port (unless --url is given) and drives it
+from --connections keep-alive asyncio clients until --requests responses have
+arrived. Requests cycle through the filtered feeds; a --conditional share
+carries the If-None-Match a calendar client would send after its first poll
+and a --gzip share sends Accept-Encoding: gzip. Prints requests per second,
+latency percentiles and the status mix. Client and server share the machine,
+so on one core the client's own cost is included in the numbers.
+
+--check verifies the server instead, on a temporary copy of --events:
+  - each filtered feed equals generate_ics.py's output for the same events
+    (DTSTAMP aside), and its gzip body decompresses to the same bytes
+  - If-None-Match (strong or W/) gets a bodiless 304, a stale ETag a 200,
+    HEAD the headers only; bad parameters 400, other paths 404, POST 405
+  - rewriting the copy is picked up (new ETag, new events), and a broken
+    rewrite leaves the previous events serving
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from generate_ics import generate_ics
+from sawc_rrule import is_cancelled
+from serve_feeds import EVENING_HOUR, FEED_PATHS
+
+SCRIPT = Path(__file__).with_name("serve_feeds.py")
+QUERIES = ["", "?only=meetings", "?only=mini", "?only=daytime", "?hide=cancelled",
+           "?only=meetings&hide=cancelled", "?year=2025", "?only=mini,daytime&year=2026"]
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, target: str, headers: dict[str, str] | None = None,
+                      method: str = "GET") -> tuple[int, dict[str, str], bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host}"]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status, *fields = head[:-4].decode("latin-1").split("\r\n")
+        response = {}
+        for field in fields:
+            name, _, value = field.partition(":")
+            response[name.strip().lower()] = value.strip()
+        length = 0 if method == "HEAD" else int(response.get("content-length", 0))
+        body = await self.reader.readexactly(length)
+        if response.get("connection") == "close":
+            await self.close()
+        return int(status.split()[1]), response, body
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+# ---- server process ----
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(events: Path, port: int, quiet: bool = False) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, str(SCRIPT), "--events", str(events), "--port", str(port)],
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL if quiet else None, text=True)
+    line = proc.stdout.readline()  # "Serving ..." once the socket is listening
+    if not line.startswith("Serving"):
+        proc.kill()
+        raise SystemExit(f"serve_feeds.py did not start: {line.strip()}")
+    return proc
+
+
+# ---- load test ----
+
+async def load(host: str, port: int, path: str, requests: int, connections: int, conditional: float,
+               gzip_share: float, seed: int) -> dict:
+    rnd = random.Random(seed)
+    etags = {}  # (query, gzip) -> ETag, as a polling client remembers it
+    warm = Client(host, port)
+    for query in QUERIES:
+        for gz in (False, True):
+            _, headers, _ = await warm.request(path + query, {"Accept-Encoding": "gzip"} if gz else {})
+            etags[query, gz] = headers["etag"]
+    await warm.close()
+
+    plan = []
+    for _ in range(requests):
+        query, gz = rnd.choice(QUERIES), rnd.random() < gzip_share
+        headers = {"Accept-Encoding": "gzip"} if gz else {}
+        if rnd.random() < conditional:
+            headers["If-None-Match"] = etags[query, gz]
+        plan.append((path + query, headers))
+
+    latencies, statuses, received = [], {}, 0
+
+    async def worker(jobs: list) -> None:
+        nonlocal received
+        client = Client(host, port)
+        for target, headers in jobs:
+            t0 = time.perf_counter()
+            status, _, body = await client.request(target, headers)
+            latencies.append(time.perf_counter() - t0)
+            statuses[status] = statuses.get(status, 0) + 1
+            received += len(body)
+        await client.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(plan[i::connections]) for i in range(connections)))
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e3
+    return {"requests": requests, "seconds": elapsed, "rps": requests / elapsed, "p50": pct(0.5),
+            "p90": pct(0.9), "p99": pct(0.99), "statuses": statuses, "bytes": received}
+
+
+# ---- check ----
+
+def expected_feed(events: list[dict], query: str) -> str:
+    """generate_ics.py's feed of the events a query selects (naive filter)."""
+    params = dict(part.split("=") for part in query.lstrip("?").split("&") if part)
+    only = set(params.get("only", "").split(",")) - {""}
+    years = set(params.get("year", "").split(",")) - {""}
+
+    def kinds(ev: dict) -> set[str]:
+        if datetime.fromisoformat(ev["start"]).hour < EVENING_HOUR:
+            return {"daytime"}
+        return {"meetings", "mini"} if ev.get("miniCompetition") else {"meetings"}
+
+    chosen = [ev for ev in events
+              if (not only or kinds(ev) & only) and not (params.get("hide") and is_cancelled(ev))
+              and (not years or ev["start"][:4] in years)]
+    return generate_ics(chosen)
+
+
+def _unstamp(text: str) -> str:
+    return re.sub(r"DTSTAMP:\d{8}T\d{6}Z", "DTSTAMP:-", text)
+
+
+def _replace(path: Path, text: str) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)  # as the generators' atomic writes do
+
+
+async def check(events_path: Path) -> int:
+    problems = []
+    events = json.loads(events_path.read_text(encoding="utf-8"))
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = Path(tmp) / "events.json"
+        copy.write_text(json.dumps(events, ensure_ascii=False, indent=2), encoding="utf-8")
+        port = free_port()
+        proc = start_server(copy, port, quiet=True)  # the broken rewrite below is reported on stderr
+        client = Client("127.0.0.1", port)
+        try:
+            path = FEED_PATHS[0]
+            for query in QUERIES:
+                status, headers, body = await client.request(path + query)
+                want = _unstamp(expected_feed(events, query))
+                if status != 200 or _unstamp(body.decode("utf-8")) != want:
+                    problems.append(f"{query or '(all)'}: feed differs from generate_ics.py")
+                _, gz_headers, gz_body = await client.request(path + query, {"Accept-Encoding": "gzip, br"})
+                if gz_headers.get("content-encoding") != "gzip" or gzip.decompress(gz_body) != body:
+                    problems.append(f"{query or '(all)'}: gzip body differs")
+                if gz_headers["etag"] == headers["etag"]:
+                    problems.append(f"{query or '(all)'}: gzip and identity share an ETag")
+                for tag in (headers["etag"], "W/" + headers["etag"], f'"stale", {headers["etag"]}'):
+                    status, _, body304 = await client.request(path + query, {"If-None-Match": tag})
+                    if status != 304 or body304:
+                        problems.append(f"{query or '(all)'}: If-None-Match {tag} got {status}")
+                status, _, _ = await client.request(path + query, {"If-None-Match": '"stale"'})
+                if status != 200:
+                    problems.append(f"{query or '(all)'}: stale ETag got {status}")
+                status, head_headers, _ = await client.request(path + query, method="HEAD")
+                if status != 200 or head_headers.get("content-length") != str(len(body)):
+                    problems.append(f"{query or '(all)'}: HEAD got {status}")
+            for target, method, want_status in (("/assets/sawc-events.ics", "GET", 200),
+                                                (path + "?only=nope", "GET", 400), (path + "?x=1", "GET", 400),
+                                                ("/other.ics", "GET", 404), (path, "POST", 405)):
+                status, _, _ = await client.request(target, method=method)
+                if status != want_status:
+                    problems.append(f"{method} {target}: {status}, expected {want_status}")
+
+            # Hot reload: drop the first event, then write a broken file
+            _, before, _ = await client.request(path)
+            _replace(copy, json.dumps(events[1:], ensure_ascii=False, indent=2))
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                _, headers, body = await client.request(path)
+                if headers["etag"] != before["etag"]:
+                    break
+                await asyncio.sleep(0.05)
+            if body.count(b"BEGIN:VEVENT") != len(events) - 1:
+                problems.append("rewritten events.json was not reloaded within 5 s")
+            _replace(copy, "[{")
+            await asyncio.sleep(1)
+            status, after, _ = await client.request(path)
+            if status != 200 or after["etag"] != headers["etag"]:
+                problems.append("a broken events.json replaced the served feed")
+        finally:
+            await client.close()
+            proc.terminate()
+            proc.wait()
+
+    for problem in problems:
+        print(f"FAIL {problem}", file=sys.stderr)
+    if problems:
+        return 1
+    print(f"OK: {len(QUERIES)} feeds match generate_ics.py; conditional GET, gzip, errors and reload behave")
+    return 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Load test or check serve_feeds.py")
+    ap.add_argument("--events", default=str(Path(__file__).with_name("events.json")))
+    ap.add_argument("--url", help="Test a running server (http://HOST:PORT) instead of starting one")
+    ap.add_argument("--requests", type=int, default=20000)
+    ap.add_argument("--connections", type=int, default=32)
+    ap.add_argument("--conditional", type=float, default=0.7, help="Share of requests with If-None-Match")
+    ap.add_argument("--gzip", type=float, default=0.8, help="Share of requests accepting gzip")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--check", action="store_true", help="Verify the server's responses instead")
+    args = ap.parse_args(argv)
+
+    if args.check:
+        return asyncio.run(check(Path(args.events)))
+
+    proc = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", free_port()
+        proc = start_server(Path(args.events), port)
+    try:
+        r = asyncio.run(load(host, port, FEED_PATHS[0], args.requests, args.connections, args.conditional,
+                             args.gzip, args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    mix = ", ".join(f"{n} x {status}" for status, n in sorted(r["statuses"].items()))
+    print(f"{r['requests']} requests over {args.connections} connections in {r['seconds']:.2f} s: "
+          f"{r['rps']:,.0f} req/s")
+    print(f"latency ms: p50 {r['p50']:.2f}  p90 {r['p90']:.2f}  p99 {r['p99']:.2f}")
+    print(f"responses: {mix}; {r['bytes'] / 1e6:.1f} MB of bodies")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
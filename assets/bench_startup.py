@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+bench_startup.py — Cold-start cost of generate_events_from_clean.py per engine
+
+Usage:
+  python assets/bench_startup.py
+  python assets/bench_startup.py --sizes 200,5000,50000 --repeat 5 --top 10
+
+Every run is a fresh interpreter, as on the build runners. For each --sizes
+row count a plain CSV export (D/M/YYYY dates, "7:30 PM"-style times) is
+written to a temp dir and converted with --engine stdlib and --engine
+vectorized; "--help" is timed as the floor. The two engines' events.json must
+be identical before anything is printed.
+
+Reports best-of-N wall time per run, then a `python -X importtime` breakdown
+of the top-level imports (cumulative ms) of each engine on the smallest sheet,
+which shows where the start-up time goes (pandas/NumPy vs csv/zoneinfo).
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+SCRIPT = Path(__file__).with_name("generate_events_from_clean.py")
+ENGINES = ("stdlib", "vectorized")
+
+TIMES = ["19:30", "7:30 PM", "18:00", "", "6:00 PM", "10:00 AM", "21:30", "02:30"]
+TITLES = [
+    "Monthly Meeting", "NO MEETING", "The Saignée Process - get some free rosé",
+    "Mini competition judging", "Christmas Party", "Bottling workshop",
+]
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def write_sheet(path: Path, n: int, seed: int = 1) -> None:
+    """Plain CSV export with n rows spread over ~30 years."""
+    rnd = random.Random(seed)
+    base = date(2000, 1, 1)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["Date", "Start", "End", "Meeting Activity", "Mini Competition", "Comments", "Location"])
+        for _ in range(n):
+            d = base + timedelta(days=rnd.randrange(11000))
+            w.writerow([
+                f"{d.day}/{d.month}/{d.year}", rnd.choice(TIMES), rnd.choice(TIMES), rnd.choice(TITLES),
+                rnd.choice(["", "Blended red wine of any variety."]), "",
+                rnd.choice(["", "Club Rivers 32 Littleton St, Riverwood NSW 2210"]),
+            ])
+
+
+def run(args: list[str], *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, str(SCRIPT), *args],
+                          capture_output=True, text=True, check=True)
+
+
+def best_wall(args: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run(args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def import_breakdown(args: list[str]) -> tuple[float, list[tuple[float, str]]]:
+    """(total ms, [(cumulative ms, module)]) for top-level imports under -X importtime."""
+    top = []
+    for line in run(args, "-X", "importtime").stderr.splitlines():
+        m = _IMPORT_LINE.match(line)
+        if m and not m.group(3):
+            top.append((int(m.group(2)) / 1000, m.group(4)))
+    return sum(ms for ms, _ in top), sorted(top, reverse=True)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark interpreter start-up + conversion per engine")
+    ap.add_argument("--sizes", default="200,5000,50000", help="Comma-separated CSV row counts")
+    ap.add_argument("--repeat", type=int, default=5, help="Best-of-N")
+    ap.add_argument("--top", type=int, default=8, help="Imports listed per engine in the breakdown")
+    args = ap.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        print(f"{'run':<22}  {'CSV KB':>7}  {'wall s':>7}")
+        print(f"{'--help':<22}  {'-':>7}  {best_wall(['--help'], args.repeat):>7.3f}")
+        for n in sizes:
+            sheet = tmp / f"sheet{n}.csv"
+            write_sheet(sheet, n)
+            outputs = {}
+            for engine in ENGINES:
+                out = tmp / f"{engine}{n}.json"
+                cmd = [str(sheet), "--json", str(out), "--engine", engine, "--id-mode", "deterministic"]
+                wall = best_wall(cmd, args.repeat)
+                outputs[engine] = out.read_bytes()
+                print(f"{f'{n} rows, {engine}':<22}  {sheet.stat().st_size / 1024:>7.0f}  {wall:>7.3f}")
+            if outputs["stdlib"] != outputs["vectorized"]:
+                print(f"ERROR: engines disagree on {n} rows", file=sys.stderr)
+                return 1
+
+        sheet = tmp / f"sheet{sizes[0]}.csv"
+        for engine in ENGINES:
+            total, top = import_breakdown([str(sheet), "--json", str(tmp / "x.json"), "--engine", engine])
+            print(f"\n-X importtime, {engine} ({sizes[0]} rows): {total:.1f} ms in top-level imports")
+            for ms, name in top[:args.top]:
+                print(f"  {ms:>8.1f} ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
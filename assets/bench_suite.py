@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+bench_suite.py — End-to-end benchmarks of the generator scripts, with stage breakdowns
+
+Usage:
+  python assets/bench_suite.py
+  python assets/bench_suite.py --sizes 1000,20000 --repeat 5 --out bench.json
+  python assets/bench_suite.py --compare bench.json    # ratios against a saved run
+
+For each --sizes row count a synthetic calendar sheet is written to a temp
+dir: messy time formats ("7:30 PM", "7:30pm", "19:30:00", " 18:00 ", blanks),
+dates on the Sydney DST changes (first Sunday of April and October, 02:30
+starts included) and long unicode descriptions with commas, quotes and line
+breaks. A second, "messy" copy also has Excel day-fraction times, which the
+stdlib engine cannot take, so --engine auto falls back to pandas.
+
+Every case runs a real entry point in-process, as the build would:
+
+  events stdlib       generate_events_from_clean.main(), plain sheet, --json
+  events vectorized   the same with --engine vectorized, messy sheet
+  events all          plain sheet to --json --ics --feed --next-event
+  events merge        both sheets as two inputs, merged (sawc_merge.py)
+  events cache        plain sheet to --json --binary-cache (sawc_events.py)
+  generate_ics()      generate_ics.generate_ics() on that size's events.json
+  ics stream          generate_ics.main(), streaming events.json to a file
+  ics vtimezone       generate_ics_refactored.main()
+  ics cached          generate_ics.main() reading the events.json.bin above
+
+Best-of---repeat wall times are taken without instrumentation; one more run
+per case with --timings (sawc_timings.py) gives the stage breakdown and peak
+memory. --out saves everything as JSON; --compare prints each case's time as
+a ratio of the saved run's.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import platform
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import generate_events_from_clean as gen
+import generate_ics
+import generate_ics_refactored
+import sawc_calendar
+import sawc_timings
+from sawc_rrule import nth_weekday
+
+RESULTS_VERSION = 1
+HEADER = ["Date", "Start", "End", "Meeting Activity", "Mini Competition", "Comments", "Location", "Description"]
+TIMES = ["19:30", "7:30 PM", "7:30pm", "19:30:00", " 18:00 ", "", "10:00 AM", "21:30", "12:00 pm"]
+DST_TIMES = ["02:30", "2:30 AM", "01:45", "03:15"]
+TITLES = [
+    "Monthly Meeting", "NO MEETING", "The Saignée Process - get some free rosé",
+    "Mini competition judging", "Christmas Party", "Bottling workshop", "Vin de paille, \"straw wine\"",
+]
+VENUES = ["Club Rivers 32 Littleton St, Riverwood NSW 2210", "", "TBA", "Café Müller; back room"]
+UNICODE = "éüñßøå—“”€ 中文字符 日本語 한국어 🍷🍇🏆 Ωλπ, \"quoted\"; semi\ncolon\\ "
+
+
+def dst_days(first: int, last: int) -> list[date]:
+    """The days Sydney daylight saving ends (April) and starts (October)."""
+    return [nth_weekday(year, month, 6, 1) for year in range(first, last + 1) for month in (4, 10)]
+
+
+def long_text(rnd: random.Random) -> str:
+    return "".join(rnd.choice(UNICODE) for _ in range(rnd.randrange(300, 3000)))
+
+
+def write_sheet(path: Path, n: int, seed: int = 1, messy: bool = False) -> None:
+    """Synthetic cleaned sheet with n rows spread over 2000-2030."""
+    rnd = random.Random(seed)
+    base, changes = date(2000, 1, 1), dst_days(2000, 2030)
+    times = TIMES + ["0.8125", "0.75"] if messy else TIMES
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(HEADER)
+        for i in range(n):
+            if rnd.random() < 0.1:  # a DST change day, often in the skipped/repeated hour
+                d, start = rnd.choice(changes), rnd.choice(DST_TIMES + times)
+            else:
+                d, start = base + timedelta(days=rnd.randrange(11000)), rnd.choice(times)
+            w.writerow([
+                f"{d.day}/{d.month}/{d.year}", start, rnd.choice(times), rnd.choice(TITLES),
+                rnd.choice(["", "Blended red wine of any variety."]), "", rnd.choice(VENUES),
+                long_text(rnd) if rnd.random() < 0.2 else f"Generated row {i}",
+            ])
+
+
+def call_generate_ics(argv: list[str]) -> int:
+    """generate_ics.generate_ics() on an events.json, as a main() for the cases."""
+    ap = argparse.ArgumentParser()
+    ap.add_argument("in_path")
+    sawc_timings.add_timing_arguments(ap)
+    args = ap.parse_args(argv)
+    events = json.loads(Path(args.in_path).read_text(encoding="utf-8"))
+    with sawc_timings.session(args, "generate_ics()", [(sawc_calendar, "to_vevent", "vevent"),
+                                                       (sawc_calendar, "fold", "fold")]):
+        generate_ics.generate_ics(events)
+    return 0
+
+
+def run_main(main, argv: list[str]) -> float:
+    """Wall time of one in-process run of a script's main(), output discarded."""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        t0 = time.perf_counter()
+        code = main(argv)
+        elapsed = time.perf_counter() - t0
+    if code:
+        raise SystemExit(f"{main.__module__}.{main.__name__}({argv}) exited with {code}")
+    return elapsed
+
+
+def cases(tmp: Path, n: int) -> list[tuple[str, object, list[str]]]:
+    """(case, main, argv) for one size."""
+    plain, messy, out = tmp / f"sheet-{n}.csv", tmp / f"messy-{n}.csv", tmp / f"out-{n}"
+    events_json = str(out / "events.json")
+    return [
+        ("events stdlib", gen.main, [str(plain), "--json", events_json, "--id-mode", "deterministic"]),
+        ("events vectorized", gen.main, [str(messy), "--json", str(out / "messy.json"), "--id-mode", "deterministic",
+                                         "--engine", "vectorized"]),
+        ("events all", gen.main, [str(plain), "--json", str(out / "all.json"), "--ics", str(out / "calendar.ics"),
+                                  "--feed", str(out / "feed.ics"), "--next-event", str(out / "next.json")]),
+        ("events merge", gen.main, [str(plain), str(messy), "--json", str(out / "merged.json"),
+                                    "--id-mode", "deterministic"]),
+        ("events cache", gen.main, [str(plain), "--json", str(out / "cached.json"), "--id-mode", "deterministic",
+                                    "--binary-cache"]),
+        ("generate_ics()", call_generate_ics, [events_json]),
+        ("ics stream", generate_ics.main, ["--in", events_json, "--out", str(out / "sawc-events.ics")]),
+        ("ics vtimezone", generate_ics_refactored.main, ["--in", events_json, "--out", str(out / "vtz.ics")]),
+        ("ics cached", generate_ics.main, ["--in", str(out / "cached.json"), "--out", str(out / "cached.ics")]),
+    ]
+
+
+def check_engines(plain: Path, out: Path) -> int:
+    """Convert the plain sheet with both engines; their events.json must match. Returns the event count."""
+    outputs = []
+    for engine in ("stdlib", "vectorized"):
+        run_main(gen.main, [str(plain), "--json", str(out / f"{engine}.json"), "--id-mode", "deterministic",
+                            "--engine", engine])
+        outputs.append((out / f"{engine}.json").read_bytes())
+    if outputs[0] != outputs[1]:
+        raise SystemExit(f"ERROR: stdlib and vectorized engines disagree on {plain.name}")
+    return len(json.loads(outputs[0]))
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the generator scripts end to end, per stage")
+    ap.add_argument("--sizes", default="1000,10000", help="Comma-separated sheet row counts")
+    ap.add_argument("--repeat", type=int, default=3, help="Best-of-N wall time per case")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", help="Save the results as JSON")
+    ap.add_argument("--compare", help="A saved --out file to compare against")
+    args = ap.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        saved = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        baseline = {(c["case"], c["rows"]): c["bestSeconds"] for c in saved["cases"]}
+
+    results = []
+    print(f"{'case':<18} {'rows':>7} {'events':>7} {'best s':>8} {'peak MB':>8}  {'vs base':>7}  top stages")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for n in (int(s) for s in args.sizes.split(",")):
+            write_sheet(tmp / f"sheet-{n}.csv", n, args.seed)
+            write_sheet(tmp / f"messy-{n}.csv", n, args.seed, messy=True)
+            (tmp / f"out-{n}").mkdir()
+            events = check_engines(tmp / f"sheet-{n}.csv", tmp / f"out-{n}")  # also warms the imports
+            for case, entry, case_argv in cases(tmp, n):
+                best = min(run_main(entry, case_argv) for _ in range(args.repeat))
+                run_main(entry, case_argv + ["--timings", str(tmp / "timings.json")])
+                record = json.loads((tmp / "timings.json").read_text(encoding="utf-8"))
+                stages = sorted(record["stages"].items(), key=lambda kv: -kv[1]["seconds"])[:3]
+                top = ", ".join(f"{name} {entry['seconds'] / record['wallSeconds']:.0%}" for name, entry in stages)
+                base = baseline.get((case, n))
+                ratio = f"{best / base:>6.2f}x" if base else f"{'-':>7}"
+                print(f"{case:<18} {n:>7} {events:>7} {best:>8.3f} {record['peakBytes'] / 1e6:>8.1f}  {ratio}  {top}")
+                results.append({"case": case, "rows": n, "events": events, "bestSeconds": round(best, 6),
+                                "timings": record})
+
+    if args.out:
+        doc = {"version": RESULTS_VERSION, "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+               "python": platform.python_version(), "platform": platform.platform(), "options": vars(args),
+               "cases": results}
+        Path(args.out).write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
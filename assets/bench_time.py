@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+bench_time.py — Per-event cost of timezone/datetime handling, before and after
+the shared sawc_time helpers.
+
+Usage:
+  python assets/bench_time.py
+  python assets/bench_time.py --events 100000 --repeat 5
+
+Writes a synthetic events.json of --events meetings (spanning DST changes) to
+a temp dir, loads it, and times each step per event with the original
+per-row code ("before") and the sawc_time helpers ("after"):
+
+  build       datetime + isoformat for start/end (tz.gettz per row vs registry + midnight table)
+  fmt_local   DTSTART/DTEND wall clock (fromisoformat + strftime vs slicing)
+  to_utc      UTC DTSTART/DTEND (tz.gettz("UTC") per timestamp vs timezone.utc)
+
+Outputs of both sides are compared before timings are printed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from dateutil import tz
+
+import sawc_time
+
+TZNAME = "Australia/Sydney"
+
+
+# ---- before: the per-row code these helpers replaced ----
+
+def build_before(d, hm, end_hm):
+    start = datetime(d.year, d.month, d.day, hm[0], hm[1], tzinfo=tz.gettz(TZNAME))
+    end = datetime(start.year, start.month, start.day, end_hm[0], end_hm[1], tzinfo=tz.gettz(TZNAME))
+    return start.isoformat(), end.isoformat()
+
+
+def fmt_local_before(iso):
+    return datetime.fromisoformat(iso.replace("Z", "+00:00")).strftime("%Y%m%dT%H%M%S")
+
+
+def to_utc_before(iso):
+    return datetime.fromisoformat(iso).astimezone(tz.gettz("UTC")).strftime("%Y%m%dT%H%M%SZ")
+
+
+# ---- after ----
+
+def build_after(d, hm, end_hm):
+    zone = sawc_time.get_tz(TZNAME)
+    start = datetime(d.year, d.month, d.day, hm[0], hm[1], tzinfo=zone)
+    end = datetime(start.year, start.month, start.day, end_hm[0], end_hm[1], tzinfo=zone)
+    return sawc_time.local_isoformat(start, TZNAME), sawc_time.local_isoformat(end, TZNAME)
+
+
+def make_events(n: int, seed: int = 1) -> list[dict]:
+    rnd = random.Random(seed)
+    base = datetime(2000, 1, 1)
+    events = []
+    for i in range(n):
+        d = base + timedelta(days=rnd.randrange(11000))
+        start, end = build_before(d, (19, 30), (21, 30))
+        events.append({"id": str(i), "title": "Monthly Meeting", "start": start, "end": end})
+    return events
+
+
+def per_event(fn, items, repeat: int) -> tuple[float, list]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = [fn(*item) for item in items]
+        best = min(best, time.perf_counter() - t0)
+    return best / len(items) * 1e6, out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Micro-benchmark the shared time helpers")
+    ap.add_argument("--events", type=int, default=100_000, help="Number of events in the synthetic events.json")
+    ap.add_argument("--repeat", type=int, default=3, help="Best-of-N")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "events.json"
+        path.write_text(json.dumps(make_events(args.events)), encoding="utf-8")
+        events = json.loads(path.read_text(encoding="utf-8"))
+
+    rows = [(datetime.fromisoformat(e["start"]).date(), (19, 30), (21, 30)) for e in events]
+    isos = [(e[k],) for e in events for k in ("start", "end")]
+    cases = [
+        ("build", build_before, build_after, rows),
+        ("fmt_local", fmt_local_before, sawc_time.iso_to_ics_local, isos),
+        ("to_utc", to_utc_before, sawc_time.iso_to_ics_utc, isos),
+    ]
+
+    print(f"{len(events)} events; microseconds per call")
+    print(f"{'step':<10}  {'before':>8}  {'after':>8}  {'speedup':>8}")
+    for name, before, after, items in cases:
+        t_before, out_before = per_event(before, items, args.repeat)
+        t_after, out_after = per_event(after, items, args.repeat)
+        if out_before != out_after:
+            print(f"ERROR: {name} outputs differ", file=sys.stderr)
+            return 1
+        print(f"{name:<10}  {t_before:>8.2f}  {t_after:>8.2f}  {t_before / t_after:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
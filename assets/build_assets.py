@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+build_assets.py — Precompress and fingerprint the generated data files
+
+Usage:
+  python assets/build_assets.py                  # after the generators
+  python assets/build_assets.py --check          # exit 1 if anything is stale
+
+Run after generate_events_from_clean.py / build_results_index.py. For every
+file matched by ASSETS (globs relative to --root, the site's /assets/
+directory) it writes:
+
+  <file>.gz, <file>.br      the file's exact bytes at maximum compression
+                            (gzip -9, brotli -q 11) for hosts that serve
+                            precompressed siblings (nginx gzip_static /
+                            brotli_static, Caddy precompressed, ...)
+  <stem>.<hash><ext>        "fingerprint" assets only: a minified copy named
+  (+ .gz, .br)              by its content hash, cacheable forever
+                            (Cache-Control: immutable)
+
+and asset-manifest.json, keyed by path under /assets/:
+
+  {"version": 1, "assets": {"events.json": {
+      "etag": "\\"3f2a...\\"", "size": 15872, "gzip": 2411, "br": 1980,
+      "fingerprint": {"path": "events.91c0d2e4b7aa.json", "etag": "\\"91c0...\\"",
+                      "size": 11603, "gzip": 2234, "br": 1857}}, ...}}
+
+ETags are content hashes of the exact bytes, so a host or edge worker can
+answer If-None-Match from the manifest. events.js and nextevent.js
+revalidate the small manifest and then fetch the fingerprinted events file,
+which the browser keeps until it changes. Calendar feeds are not
+fingerprinted (subscribers poll a fixed URL), and the results shards already
+carry content hashes in data/results/index.json.
+
+gzip output is deterministic (no timestamp or name in the header). Files are
+only rewritten when their bytes change, and a source whose hash matches the
+manifest is not recompressed. .br files need the optional brotli package;
+without it they are skipped and stale ones removed. Siblings of sources that
+no longer exist are removed too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from sawc_manifest import write_if_changed
+
+try:
+    import brotli
+except ImportError:  # optional: only the .br variants need it
+    brotli = None
+
+MANIFEST_VERSION = 1
+HASH_CHARS = 12
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+# Glob under --root -> "fingerprint" (minified, hashed copy too) or "compress"
+ASSETS = {
+    "events.json": "fingerprint",
+    "next-event.json": "compress",
+    "events-future.json": "compress",
+    "sawc-events.ics": "compress",
+    "sawc-events-upcoming.ics": "compress",
+    "data/results/*.json": "compress",
+}
+_HASHED = re.compile(r"\.[0-9a-f]{%d}$" % HASH_CHARS)  # a fingerprinted stem
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_CHARS]
+
+
+def minify(path: Path, data: bytes) -> bytes:
+    """Compact JSON (same values, no whitespace); other files as generated."""
+    if path.suffix.lower() != ".json":
+        return data
+    return json.dumps(json.loads(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def brotli_bytes(data: bytes) -> bytes | None:
+    if brotli is None:
+        return None
+    return brotli.compress(data, quality=BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+
+
+def fingerprint_path(path: Path, digest: str) -> Path:
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}")
+
+
+class Output:
+    """Writes (or, with check=True, only compares) files; records what changed."""
+
+    def __init__(self, check: bool = False):
+        self.check = check
+        self.changed: list[str] = []
+
+    def put(self, path: Path, data: bytes) -> None:
+        if self.check:
+            try:
+                same = path.read_bytes() == data
+            except OSError:
+                same = False
+            if not same:
+                self.changed.append(str(path))
+        elif write_if_changed(path, data):
+            self.changed.append(str(path))
+
+    def remove(self, path: Path) -> None:
+        if path.exists():
+            if not self.check:
+                path.unlink()
+            self.changed.append(f"{path} (removed)")
+
+
+def publish(path: Path, data: bytes, out: Output) -> dict:
+    """Write path's .gz/.br siblings for data; returns its manifest fields."""
+    gz = gzip_bytes(data)
+    br = brotli_bytes(data)
+    out.put(path.with_name(path.name + ".gz"), gz)
+    if br is None:
+        out.remove(path.with_name(path.name + ".br"))
+    else:
+        out.put(path.with_name(path.name + ".br"), br)
+    return {"etag": f'"{content_hash(data)}"', "size": len(data), "gzip": len(gz),
+            "br": None if br is None else len(br)}
+
+
+def _outputs(root: Path, rel: str, entry: dict) -> list[Path]:
+    """Every file an asset's manifest entry says was written."""
+    paths = []
+    for part, name in ((entry, rel), (entry.get("fingerprint"), None)):
+        if part is None:
+            continue
+        path = root / (name or part["path"])
+        paths += [path, path.with_name(path.name + ".gz")]
+        if part.get("br") is not None:
+            paths.append(path.with_name(path.name + ".br"))
+    return paths
+
+
+def _up_to_date(root: Path, rel: str, entry: dict | None, etag: str) -> bool:
+    if not entry or entry.get("etag") != etag:
+        return False
+    if (entry.get("br") is None) != (brotli is None):  # brotli installed or removed since
+        return False
+    return all(p.exists() for p in _outputs(root, rel, entry))
+
+
+def build_asset(root: Path, rel: str, mode: str, previous: dict, out: Output) -> dict:
+    """Compress (and fingerprint) one asset; returns its manifest entry."""
+    path = root / rel
+    data = path.read_bytes()
+    if _up_to_date(root, rel, previous.get(rel), f'"{content_hash(data)}"'):
+        return previous[rel]
+    entry = publish(path, data, out)
+    if mode == "fingerprint":
+        small = minify(path, data)
+        hashed = fingerprint_path(path, content_hash(small))
+        out.put(hashed, small)
+        entry["fingerprint"] = {"path": hashed.relative_to(root).as_posix(), **publish(hashed, small, out)}
+        # Older fingerprints of this file (and their siblings)
+        pattern = re.compile(re.escape(path.stem) + r"\.[0-9a-f]{%d}" % HASH_CHARS
+                             + re.escape(path.suffix) + r"(\.gz|\.br)?$")
+        keep = {hashed.name, hashed.name + ".gz", hashed.name + ".br"}
+        for stale in sorted(path.parent.iterdir()):
+            if pattern.match(stale.name) and stale.name not in keep:
+                out.remove(stale)
+    return entry
+
+
+def find_assets(root: Path, assets: dict[str, str]) -> dict[str, str]:
+    """Relative path -> mode for every existing source file matched by assets."""
+    found = {}
+    for pattern, mode in assets.items():
+        for path in sorted(root.glob(pattern)):
+            if path.is_file() and not _HASHED.search(path.stem):
+                found[path.relative_to(root).as_posix()] = mode
+    return found
+
+
+def build_assets(root: str | Path, manifest_path: str | Path, check: bool = False,
+                 assets: dict[str, str] = ASSETS) -> list[str]:
+    """Bring every sibling, fingerprint and the manifest up to date; returns what changed."""
+    root = Path(root)
+    manifest_path = Path(manifest_path)
+    try:
+        previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+        previous = previous.get("assets", {}) if previous.get("version") == MANIFEST_VERSION else {}
+    except (OSError, ValueError, AttributeError):
+        previous = {}
+
+    out = Output(check)
+    entries = {rel: build_asset(root, rel, mode, previous, out) for rel, mode in find_assets(root, assets).items()}
+    for rel, entry in previous.items():
+        if rel not in entries:  # source deleted (e.g. a results year dropped)
+            for path in _outputs(root, rel, entry):
+                if path != root / rel:
+                    out.remove(path)
+
+    manifest = {"version": MANIFEST_VERSION, "assets": entries}
+    out.put(manifest_path, (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+    return out.changed
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Write precompressed and fingerprinted copies of the generated assets")
+    ap.add_argument("--root", default="./assets", help="The site's /assets/ directory")
+    ap.add_argument("--manifest", help="Manifest to write (default: <root>/asset-manifest.json)")
+    ap.add_argument("--check", action="store_true", help="Write nothing; exit 1 if any output is stale")
+    args = ap.parse_args(argv)
+
+    manifest = args.manifest or str(Path(args.root) / "asset-manifest.json")
+    t0 = time.perf_counter()
+    try:
+        changed = build_assets(args.root, manifest, check=args.check)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    note = "" if brotli is not None else " (brotli not installed: no .br files)"
+    if args.check:
+        if changed:
+            print("Stale: " + ", ".join(changed), file=sys.stderr)
+            return 1
+        print(f"{manifest} and every precompressed asset are up to date{note}.")
+        return 0
+    print((f"Updated {', '.join(changed)}" if changed else "Assets unchanged")
+          + f" in {time.perf_counter() - t0:.2f} s{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+build_calendars.py — Rebuild many event feeds in one run from a job manifest
+
+Usage:
+  python assets/build_calendars.py calendars.json
+  python assets/build_calendars.py calendars.json --jobs 8 --only 2025 --only 2026
+
+Each job turns one cleaned sheet (CSV/XLSX) into an events.json and,
+optionally, an .ics feed, exactly as generate_events_from_clean.py and
+generate_ics_refactored.py would. Jobs are spread over a process pool, so
+pandas is imported once per worker instead of once per calendar, and a
+failing job does not stop the others.
+
+Manifest (relative paths are resolved against the manifest's directory):
+
+  {
+    "defaults": {"tz": "Australia/Sydney", "idMode": "deterministic",
+                 "defaultLocation": "Club Rivers, 32 Littleton St, Riverwood NSW 2210"},
+    "jobs": [
+      {"name": "2025", "input": "sheets/2025.csv",
+       "json": "feeds/2025/events.json", "ics": "feeds/2025/events.ics"},
+      {"name": "mead", "input": "sheets/mead.xlsx", "json": "feeds/mead/events.json",
+       "tz": "Australia/Sydney", "defaultLocation": "", "calName": "SAWC Mead Group"}
+    ]
+  }
+
+Job keys: input, json (required); name, ics, tz, idMode, engine,
+defaultLocation, calName, calDesc, prodid (fall back to "defaults", then to
+the generators' own defaults). A bare list of jobs is accepted too.
+
+Exit status is 0 if every job succeeded, 1 if any failed, 2 for a bad manifest.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import generate_events_from_clean as gen_events
+import generate_ics_refactored as gen_ics
+from sawc_pipeline import publish
+
+JOB_DEFAULTS = {
+    "ics": None,
+    "tz": gen_events.DEFAULT_TZ,
+    "idMode": "uuid",
+    "engine": "vectorized",
+    "defaultLocation": gen_ics.DEFAULT_LOCATION,
+    "calName": gen_ics.CAL_NAME,
+    "calDesc": gen_ics.CAL_DESC,
+    "prodid": gen_ics.PRODID,
+}
+
+
+class ManifestError(ValueError):
+    """The job manifest is missing, malformed or inconsistent."""
+
+
+def load_jobs(path: str | Path) -> list[dict]:
+    """Read the manifest and return fully-resolved job dicts in manifest order."""
+    path = Path(path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ManifestError(f"Cannot read {path}: {e}") from None
+    if isinstance(data, list):
+        data = {"jobs": data}
+    if not isinstance(data, dict) or not isinstance(data.get("jobs"), list):
+        raise ManifestError("Manifest must be a list of jobs or an object with a 'jobs' list")
+
+    base = path.parent
+    defaults = {**JOB_DEFAULTS, **data.get("defaults", {})}
+    jobs, names, outputs = [], set(), set()
+    for i, raw in enumerate(data["jobs"], 1):
+        if not isinstance(raw, dict):
+            raise ManifestError(f"Job #{i} must be an object")
+        job = {**defaults, **raw}
+        missing = [k for k in ("input", "json") if not job.get(k)]
+        if missing:
+            raise ManifestError(f"Job #{i} is missing {missing}")
+        unknown = set(job) - set(JOB_DEFAULTS) - {"name", "input", "json"}
+        if unknown:
+            raise ManifestError(f"Job #{i} has unknown keys {sorted(unknown)}")
+        job["name"] = str(job.get("name") or job["input"])
+        if job["name"] in names:
+            raise ManifestError(f"Duplicate job name: {job['name']}")
+        names.add(job["name"])
+        for key in ("input", "json", "ics"):
+            if job[key]:
+                job[key] = str(base / job[key])
+        # Two jobs writing one file would race in the pool
+        for out in filter(None, (job["json"], job["ics"])):
+            resolved = os.path.realpath(out)
+            if resolved in outputs:
+                raise ManifestError(f"Output written by more than one job: {out}")
+            outputs.add(resolved)
+        jobs.append(job)
+    return jobs
+
+
+def run_job(job: dict) -> dict:
+    """Build one calendar; never raises, errors are reported in the result."""
+    t0 = time.perf_counter()
+    result = {"name": job["name"], "events": 0, "error": None}
+    try:
+        p = Path(job["input"])
+        if not p.exists():
+            raise FileNotFoundError(f"Input not found: {p}")
+        df = gen_events.load_frame(p)
+        if df.empty:
+            raise ValueError("No rows found in the input sheet.")
+        cols = gen_events.resolve_columns(df)
+        missing = [k for k in ("date", "title") if cols[k] is None]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}. Columns present: {list(df.columns)}")
+
+        convert = gen_events.events_from_rows if job["engine"] == "rows" else gen_events.events_from_frame
+        events = gen_events.with_unique_ids(convert(df, cols, job["tz"], job["idMode"]), job["idMode"])
+        del df
+
+        targets = [("json", job["json"])] + ([("vtimezone-ics", job["ics"])] if job["ics"] else [])
+        options = {"tzid": job["tz"], "calName": job["calName"], "calDesc": job["calDesc"],
+                   "prodid": job["prodid"], "defaultLocation": job["defaultLocation"]}
+        publish(events, targets, options)
+        result["events"] = len(events)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - t0
+    return result
+
+
+def run_jobs(jobs: list[dict], workers: int) -> list[dict]:
+    """Run jobs (in a pool when workers > 1); results come back in job order."""
+    if workers <= 1 or len(jobs) <= 1:
+        return [run_job(job) for job in jobs]
+
+    # Largest sheets first so one big calendar does not finish last on its own
+    order = sorted(range(len(jobs)), key=lambda i: -_size(jobs[i]["input"]))
+    results: list[dict | None] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {pool.submit(run_job, jobs[i]): i for i in order}
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+    return results
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Build several events.json/.ics feeds from a job manifest")
+    ap.add_argument("manifest", help="Path to the job manifest (JSON)")
+    ap.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                    help="Worker processes (default: CPU count; 1 runs serially in-process)")
+    ap.add_argument("--only", action="append", metavar="NAME", help="Build only the named job (repeatable)")
+    args = ap.parse_args(argv)
+
+    try:
+        jobs = load_jobs(args.manifest)
+    except ManifestError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    if args.only:
+        unknown = set(args.only) - {job["name"] for job in jobs}
+        if unknown:
+            print(f"ERROR: No such job: {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 2
+        jobs = [job for job in jobs if job["name"] in args.only]
+
+    t0 = time.perf_counter()
+    results = run_jobs(jobs, args.jobs)
+    wall = time.perf_counter() - t0
+
+    failed = [r for r in results if r["error"]]
+    for r in results:
+        if r["error"]:
+            print(f"✗ {r['name']}: {r['error']}", file=sys.stderr)
+        else:
+            print(f"✓ {r['name']}: {r['events']} events ({r['seconds']:.2f}s)")
+    print(f"{len(results)} jobs, {len(failed)} failed, {sum(r['events'] for r in results)} events "
+          f"in {wall:.2f}s (job time {sum(r['seconds'] for r in results):.2f}s, "
+          f"{min(max(args.jobs, 1), max(len(jobs), 1))} workers)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,666 @@
+#!/usr/bin/env python3
+"""
+build_pages.py — Prerender the event list, results tables and JSON-LD into static HTML
+
+Usage:
+  python assets/build_pages.py                   # after the generators
+  python assets/build_pages.py --check           # exit 1 if a page or the sitemap is stale
+  python assets/build_pages.py --now 2026-01-01T00:00:00+11:00
+
+index.html and results.html used to arrive empty ("Loading…") and were
+filled in by events.js, nextevent.js and results.js after their JSON
+downloads, so first paint waited for the data and crawlers saw no events,
+results or structured data. This step writes the same markup the scripts
+would produce into the pages, between marker comments:
+
+  <!-- prerender:NAME --> ... <!-- /prerender:NAME -->
+
+index.html        next-meeting, next-event-jsonld   the Next Meeting section and
+                                                    its Event JSON-LD (nextevent.js)
+                  events                            upcoming events grouped by month,
+                                                    each with its JSON-LD (events.js)
+results.html      head, subtitle, years, classes,   the newest show year's table,
+                  winemakers, summary, entries,     filters, summary and Event /
+                  jsonld                            BreadcrumbList JSON-LD (results.js)
+
+results.html is also the template of one static permalink page per year,
+class and winemaker:
+
+  results/<year>/index.html
+  results/<year>/class/<code>.html
+  results/<year>/winemaker/<name>.html
+
+each with its own title, canonical URL and JSON-LD. The scripts hydrate
+instead of re-rendering: events.js drops events that have ended since the
+build, nextevent.js keeps the prerendered meeting until it is over, and
+results.js takes its filters from the prerendered selects and only renders
+again when one changes.
+
+sitemap.xml gets an entry per results page (stale ones removed); a page's
+<lastmod> moves to today only when its HTML changed. Hand-written entries
+are kept as they are. Files are only rewritten when their bytes change, so
+rerunning without new data changes nothing; pages of years, classes and
+winemakers no longer in the data are removed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from datetime import date, datetime, time, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from html.parser import HTMLParser
+from pathlib import Path
+from xml.sax.saxutils import escape as xml_escape
+
+from build_assets import Output
+from sawc_search import fold
+from sawc_slices import EventIndex, select
+from sawc_time import get_zoneinfo
+
+SITE = "https://www.sydneyawc.com"
+TZ = "Australia/Sydney"
+CLUB = "Sydney Amateur Winemakers Club"
+MONTHS = ("January", "February", "March", "April", "May", "June", "July", "August", "September", "October",
+          "November", "December")
+# Intl.DateTimeFormat("en-AU", {month: "short"}) spellings
+MONTHS_SHORT = ("Jan", "Feb", "Mar", "Apr", "May", "June", "July", "Aug", "Sept", "Oct", "Nov", "Dec")
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+# (changefreq, priority) of new sitemap entries, by page kind
+SITEMAP_DEFAULTS = {"year": ("yearly", "0.6"), "class": ("yearly", "0.5"), "winemaker": ("yearly", "0.5")}
+_PAGE_PATH = re.compile(r"^\d{4}/(index|class/[^/]+|winemaker/[^/]+)\.html$")
+
+
+# ---- regions ----
+
+def fill(html: str, name: str, content: str | list[str]) -> str:
+    """html with the prerender region `name` holding content.
+
+    A string is placed inline; a list of lines goes on lines of their own,
+    indented like the opening marker. ValueError if the region is missing.
+    """
+    start, end = f"<!-- prerender:{name} -->", f"<!-- /prerender:{name} -->"
+    i = html.find(start)
+    j = html.find(end, i + len(start))
+    if i < 0 or j < 0:
+        raise ValueError(f"no {start} ... {end} region")
+    if isinstance(content, list):
+        indent = html[html.rfind("\n", 0, i) + 1:i]
+        indent = indent if not indent.strip() else ""
+        content = "".join(f"\n{indent}{line}" for line in content) + f"\n{indent}"
+    return html[:i + len(start)] + content + html[j:]
+
+
+def _esc(value) -> str:
+    """results.js escapeHtml(), also used for attribute values."""
+    return (str(value).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            .replace('"', "&quot;").replace("'", "&#39;"))
+
+
+def _text(value) -> str:
+    """Text content as the DOM serialises it (and nextevent.js esc()): &, < and > escaped."""
+    return str(value).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _json_ld(data: dict, indent: int | None = None) -> str:
+    """JSON for a <script type="application/ld+json">, with "<" escaped so it cannot close the tag."""
+    separators = None if indent else (",", ":")
+    return json.dumps(data, ensure_ascii=False, indent=indent, separators=separators).replace("<", "\\u003c")
+
+
+# ---- events (index.html) ----
+
+def _local(iso: str) -> datetime:
+    return datetime.fromisoformat(iso).astimezone(get_zoneinfo(TZ))
+
+
+def fmt_date(iso: str) -> str:
+    """events.js fmtDate: "Thu, 5 Feb 2026"."""
+    d = _local(iso)
+    return f"{WEEKDAYS[d.weekday()][:3]}, {d.day} {MONTHS_SHORT[d.month - 1]} {d.year}"
+
+
+def fmt_time(iso: str) -> str:
+    """events.js fmtTime: "7:30 pm"."""
+    d = _local(iso)
+    return f"{d.hour % 12 or 12}:{d.minute:02d} {'am' if d.hour < 12 else 'pm'}"
+
+
+def effective_end(ev: dict) -> datetime:
+    """When an event stops being upcoming: its end, or 23:59:59.999 on its (local) start day."""
+    if ev.get("end"):
+        return datetime.fromisoformat(ev["end"])
+    start = _local(ev["start"])
+    return datetime.combine(start.date(), time(23, 59, 59, 999000), start.tzinfo)
+
+
+def _end_attr(ev: dict) -> str:
+    return effective_end(ev).isoformat(timespec="milliseconds")
+
+
+def event_ld(ev: dict) -> dict:
+    """events.js buildEventLD."""
+    parts = [ev.get("description")]
+    if ev.get("meetingActivity"):
+        parts.append(f"Meeting activity: {ev['meetingActivity']}")
+    if ev.get("miniCompetition"):
+        parts.append(f"Mini competition: {ev['miniCompetition']}")
+    if ev.get("comments"):
+        parts.append(f"Notes: {ev['comments']}")
+    return {
+        "@context": "https://schema.org",
+        "@type": "Event",
+        "name": ev.get("title"),
+        "startDate": ev["start"],
+        "endDate": ev.get("end") or ev["start"],
+        "eventStatus": "https://schema.org/EventScheduled",
+        "eventAttendanceMode": "https://schema.org/OfflineEventAttendanceMode",
+        "location": {"@type": "Place", "name": ev.get("location") or "TBA",
+                     "address": ev.get("location") or "Sydney, NSW"},
+        "description": "\n\n".join(p for p in parts if p),
+    }
+
+
+def render_event(ev: dict) -> str:
+    """events.js renderEvent, plus the data-event-end the script prunes ended events by."""
+    when = (f'<time itemprop="startDate" datetime="{_esc(ev["start"])}">'
+            f"{fmt_date(ev['start'])} — {fmt_time(ev['start'])}</time>")
+    if ev.get("end"):
+        when += f' to <time itemprop="endDate" datetime="{_esc(ev["end"])}">{fmt_time(ev["end"])}</time>'
+    html = [f'<article class="event-item" itemscope="" itemtype="https://schema.org/Event" '
+            f'data-event-end="{_end_attr(ev)}">',
+            f'<h3 itemprop="name">{_text(ev.get("title") or "")}</h3>',
+            f'<p class="ev-when">{when}</p>']
+    if ev.get("location"):
+        html.append(f'<p class="ev-loc" itemprop="location">{_text(ev["location"])}</p>')
+    if ev.get("description"):
+        html.append(f'<p class="ev-desc" itemprop="description">{_text(ev["description"])}</p>')
+    rows = [(label, ev.get(key)) for label, key in (("Meeting Activity", "meetingActivity"),
+                                                    ("Mini Competition", "miniCompetition"),
+                                                    ("Comments", "comments"))]
+    rows = [f'<div class="ev-row"><span class="ev-label">{label}</span><span class="ev-val">{_text(value)}</span></div>'
+            for label, value in rows if value]
+    if rows:
+        html.append(f'<div class="ev-extra">{"".join(rows)}</div>')
+    html.append(f'<script type="application/ld+json">{_json_ld(event_ld(ev))}</script>')
+    return "".join(html) + "</article>"
+
+
+def render_upcoming(events: list[dict]) -> list[str]:
+    """events.js renderUpcoming: month blocks of events, in start order."""
+    if not events:
+        return ["<p>No upcoming events. Check back soon!</p>"]
+    lines, month = [], None
+    for ev in events:
+        d = _local(ev["start"])
+        if (d.year, d.month) != month:
+            if month is not None:
+                lines.append("</div>")
+            month = (d.year, d.month)
+            lines.append(f'<div class="event-month"><h4>{MONTHS[d.month - 1]} {d.year}</h4>')
+        lines.append(render_event(ev))
+    return lines + ["</div>"]
+
+
+class _SectionAttrs(HTMLParser):
+    """The attributes of the first <section class="meeting-info">."""
+
+    def __init__(self):
+        super().__init__()
+        self.attrs: dict[str, str] | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.attrs is None and tag == "section" and "meeting-info" in (dict(attrs).get("class") or "").split():
+            self.attrs = {k: v or "" for k, v in attrs}
+
+
+def meeting_location(section: dict[str, str], ev: dict) -> tuple[str, str, dict | None]:
+    """nextevent.js buildLocation: (name, display address, PostalAddress or None)."""
+    fallback_name = section.get("data-default-location-name") or "TBA"
+    fallback_addr = section.get("data-default-location-address") or ""
+    raw = (ev.get("location") or "").strip()
+    name = fallback_name
+    if raw:
+        if raw.lower() in ("tba", "to be announced"):
+            name = "To be announced"
+        elif not (fallback_name and raw.startswith(fallback_name)):
+            name = raw
+    if not (name == fallback_name and fallback_addr):
+        return name, "", None
+    address = {"@type": "PostalAddress"}
+    for field, attr in (("streetAddress", "street"), ("addressLocality", "locality"),
+                        ("addressRegion", "region"), ("postalCode", "postcode")):
+        if section.get(f"data-default-location-{attr}"):
+            address[field] = section[f"data-default-location-{attr}"]
+    address["addressCountry"] = section.get("data-default-location-country") or "AU"
+    return name, fallback_addr, address
+
+
+def _ordinal(n: int) -> str:
+    return f"{n}{'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')}"
+
+
+def render_next_meeting(section: dict[str, str], ev: dict | None) -> list[str]:
+    """nextevent.js renderIntoSection / renderNoUpcoming."""
+    if ev is None:
+        return ["<h2>Next Meeting</h2>", "<p><strong>No upcoming meeting scheduled</strong></p>",
+                "<p>Please check back soon.</p>"]
+    d = _local(ev["start"])
+    date_line = (f"{fmt_time(ev['start']).upper()} {WEEKDAYS[d.weekday()]} {_ordinal(d.day)} "
+                 f"{MONTHS[d.month - 1]} {d.year}")
+    name, address, _ = meeting_location(section, ev)
+    rows = []
+    for label, key in (("Meeting Activity", "meetingActivity"), ("Mini Competition", "miniCompetition"),
+                       ("Comments", "comments")):
+        if ev.get(key):
+            value = _text(ev[key]).replace("\n", "<br>") if key == "comments" else _text(ev[key])
+            rows.append(f'<div class="ev-row"><span class="ev-label">{label}</span>'
+                        f'<span class="ev-val">{value}</span></div>')
+    lines = ["<h2>Next Meeting</h2>",
+             f'<p data-event-end="{_end_attr(ev)}"><strong>{_text(date_line)}</strong></p>']
+    if rows:
+        lines.append(f'<div class="ev-extra">{"".join(rows)}</div>')
+    lines.append(f"<p><strong>{_text(name)}</strong>{f'<br>{_text(address)}' if address else ''}</p>")
+    return lines
+
+
+def next_meeting_ld(section: dict[str, str], ev: dict) -> dict:
+    """nextevent.js updateStructuredData."""
+    name, _, address = meeting_location(section, ev)
+    end = ev.get("end") or effective_end(ev).astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    parts = [s.strip() for s in (ev.get("description"), ev.get("comments")) if s and s.strip()]
+    title = (ev.get("meetingActivity") or "").strip() or (ev.get("title") or "").strip()
+    location = {"@type": "Place", "name": name}
+    if address:
+        location["address"] = address
+    return {
+        "@context": "https://schema.org",
+        "@type": "Event",
+        "name": title or f"{CLUB} Meeting",
+        "description": "\n".join(parts) or f"{CLUB} monthly meeting.",
+        "startDate": ev["start"],
+        "endDate": end,
+        "url": f"{SITE}/",
+        "isAccessibleForFree": True,
+        "eventStatus": "https://schema.org/EventScheduled",
+        "eventAttendanceMode": "https://schema.org/OfflineEventAttendanceMode",
+        "organizer": {"@type": "Organization", "name": CLUB, "url": f"{SITE}/",
+                      "email": "mailto:sydneyawclub@gmail.com"},
+        "performer": {"@type": "Organization", "name": CLUB},
+        "location": location,
+        "image": [f"{SITE}/og-image.png"],
+        "offers": [{"@type": "Offer", "url": f"{SITE}/", "price": 0, "priceCurrency": "AUD",
+                    "availability": "https://schema.org/InStock", "validFrom": ev["start"]}],
+    }
+
+
+def render_index(html: str, events: list[dict], now: datetime) -> str:
+    """index.html with the Next Meeting section, its JSON-LD and the upcoming events filled in."""
+    upcoming = select(EventIndex(events), "future", now)
+    parser = _SectionAttrs()
+    parser.feed(html)
+    section = parser.attrs or {}
+    nxt = upcoming[0] if upcoming else None
+    html = fill(html, "next-meeting", render_next_meeting(section, nxt))
+    script = ([] if nxt is None else
+              [f'<script type="application/ld+json" id="next-event-jsonld">{_json_ld(next_meeting_ld(section, nxt), 2)}'
+               "</script>"])
+    html = fill(html, "next-event-jsonld", script)
+    return fill(html, "events", render_upcoming(upcoming))
+
+
+# ---- results (results.html and permalinks) ----
+
+def _natural(value: str) -> list:
+    """localeCompare(..., {numeric: true, sensitivity: "base"}) order for entry numbers."""
+    return [(0, int(part), "") if part.isdigit() else (1, 0, fold(part)) for part in re.split(r"(\d+)", value) if part]
+
+
+def _number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _score(judging: dict):
+    # Number(judging.Score) as results.js takes it: null counts as 0, a missing score as none
+    if "Score" not in judging:
+        return None
+    return 0.0 if judging["Score"] is None else float(judging["Score"])
+
+
+def entry_rows(shard: dict) -> list[dict]:
+    """results.js buildYearData, for the fields the table shows."""
+    classes, entrants, lookups = shard.get("classes", []), shard.get("entrants", []), shard.get("lookups", {})
+    rows = []
+    for position, entry in enumerate(shard.get("entries", [])):
+        cls = classes[lookups["classById"][entry["class_id"]]] if entry.get("class_id") in lookups.get(
+            "classById", {}) else {}
+        entrant = entrants[lookups["entrantById"][entry["entrant_id"]]] if entry.get("entrant_id") in lookups.get(
+            "entrantById", {}) else {}
+        judging = entry.get("judging") or {}
+        wine = entry.get("wine") or {}
+        trophies = [t.lower() for t in judging.get("trophies") or [] if isinstance(t, str)]
+        rows.append({
+            "position": position,
+            "classNo": "" if cls.get("code") is None else str(cls["code"]),
+            "classSortOrder": cls["sort_order"] if _number(cls.get("sort_order")) else float("inf"),
+            "entryNo": str(entry.get("exhibit_number") or entry.get("entry_number") or ""),
+            "winemaker": entrant.get("display_name") or entrant.get("name") or "Unnamed entrant",
+            "winemakerKey": "" if entry.get("entrant_id") is None else f"id:{entry['entrant_id']}",
+            "wineName": wine.get("name") or "",
+            "wineType": wine.get("style") or wine.get("name") or "",
+            "wineVintage": wine.get("vintage"),
+            "score": _score(judging),
+            "medal": judging.get("Medal"),
+            "bestInClass": any("best in class" in t for t in trophies),
+            "champion": any("best in show" in t for t in trophies),
+        })
+    return rows
+
+
+def _sort_key(row: dict) -> tuple:
+    score = row["score"] if row["score"] is not None else float("-inf")
+    return -score, row["classSortOrder"], _natural(row["entryNo"])
+
+
+def format_score(score) -> str:
+    """results.js formatScore: whole numbers bare, otherwise one decimal (toFixed rounding)."""
+    if score is None:
+        return "—"
+    if score % 1 == 0:
+        return f"{score:.0f}"
+    return str(Decimal(score).quantize(Decimal("0.1"), ROUND_HALF_UP))
+
+
+def render_row(row: dict) -> str:
+    flags = []
+    if row["bestInClass"]:
+        flags.append("<span>BIC</span>")
+    if row["champion"]:
+        flags.append("<span>Champion</span>")
+    if row["medal"] and row["medal"] != "No Award":
+        flags.append(f"<span>{_esc(row['medal'])}</span>")
+    flag_markup = f'<div class="flag-group">{"".join(flags)}</div>' if flags else '<span class="empty-state">—</span>'
+    label = [row["wineName"] or row["wineType"]]
+    if row["wineVintage"]:
+        label.append(f"({row['wineVintage']})")
+    wine = " ".join(part for part in label if part) or row["wineType"]
+    return (f'<tr><td data-title="Class">{_esc(row["classNo"])}</td>'
+            f'<td data-title="Entry">{_esc(row["entryNo"])}</td>'
+            f'<td data-title="Winemaker">{_esc(row["winemaker"])}</td>'
+            f'<td data-title="Wine">{_esc(wine)}</td>'
+            f'<td data-title="Score">{format_score(row["score"])}</td>'
+            f'<td data-title="Flags">{flag_markup}</td></tr>')
+
+
+def edition_label(show: dict, year: int) -> str:
+    """results.js resolveEditionLabel."""
+    if show.get("edition"):
+        return show["edition"]
+    number = show["edition_number"] if _number(show.get("edition_number")) else max(1, year - 1975 + 1)
+    return f"{_ordinal(int(number))} Annual Wine Show"
+
+
+def edition_display(show: dict, year: int) -> str:
+    """results.js getEditionDisplay."""
+    if _number(show.get("edition_number")):
+        return _ordinal(int(show["edition_number"]))
+    m = re.match(r"^(\d+(?:st|nd|rd|th))", (show.get("edition") or "").strip(), re.I)
+    return m.group(1) if m else _ordinal(max(1, year - 1975 + 1))
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", fold(text)).strip("-") or "page"
+
+
+class Page:
+    """One results view: a show year, optionally narrowed to a class or a winemaker."""
+
+    def __init__(self, year: int, kind: str, path: str, class_code: str = "", winemaker_key: str = ""):
+        self.year, self.kind, self.path = year, kind, path
+        self.class_code, self.winemaker_key = class_code, winemaker_key
+
+    @property
+    def url(self) -> str:
+        return f"{SITE}/results/{self.path[:-len('index.html')] if self.kind == 'year' else self.path}"
+
+
+def results_pages(year: int, shard: dict) -> list[Page]:
+    """The year page plus one page per class with entries and per winemaker."""
+    lookups = shard.get("lookups", {})
+    pages = [Page(year, "year", f"{year}/index.html")]
+    for code, positions in lookups.get("entriesByClass", {}).items():
+        if positions:
+            pages.append(Page(year, "class", f"{year}/class/{_slug(code)}.html", class_code=code))
+    taken = set()
+    for key, name in lookups.get("winemakers", {}).items():
+        slug, n = _slug(name), 1
+        while slug in taken:  # namesakes
+            n += 1
+            slug = f"{_slug(name)}-{n}"
+        taken.add(slug)
+        pages.append(Page(year, "winemaker", f"{year}/winemaker/{slug}.html", winemaker_key=key))
+    return pages
+
+
+def _class_label(shard: dict, code: str) -> str:
+    """results.js formatClassSummary."""
+    index = shard.get("lookups", {}).get("classByCode", {}).get(code)
+    name = shard["classes"][index].get("name") if index is not None else None
+    return f"Class {code} — {name}" if name else f"Class {code}"
+
+
+def render_results(html: str, shard: dict, years: list[int], page: Page) -> str:
+    """The results template with one page's filters, table, summary and metadata filled in."""
+    show = shard.get("show") or {}
+    year = show.get("year") or page.year
+    lookups = shard.get("lookups", {})
+    rows = entry_rows(shard)
+    if page.class_code:
+        rows = [r for r in rows if r["classNo"] == page.class_code]
+    if page.winemaker_key:
+        rows = [r for r in rows if r["winemakerKey"] == page.winemaker_key]
+    rows.sort(key=_sort_key)
+
+    winemaker = lookups.get("winemakers", {}).get(page.winemaker_key, "")
+    class_segment = _class_label(shard, page.class_code) if page.class_code else "all classes"
+    winemaker_segment = f" for winemaker {winemaker}" if winemaker else ""
+    summary = f"{len(rows)} {'entry' if len(rows) == 1 else 'entries'} from {year} in {class_segment}{winemaker_segment}."
+
+    heading = f"SAWC Show Results — {edition_label(show, year)} {year}"
+    focus = _class_label(shard, page.class_code) if page.class_code else winemaker
+    title = f"{focus} · SAWC Show Results {year}" if focus else heading
+    description = f"{CLUB} show results: {summary}"
+    html = fill(html, "head", [
+        f"<title>{_esc(title)}</title>",
+        f'<meta name="description" content="{_esc(description)}" />',
+        f'<link rel="canonical" href="{page.url}" />',
+        f'<link rel="alternate" hreflang="en-AU" href="{page.url}" />',
+        f'<meta property="og:title" content="{_esc(title)}" />',
+        f'<meta property="og:description" content="{_esc(description)}" />',
+        f'<meta property="og:url" content="{page.url}" />',
+        f'<meta name="twitter:title" content="{_esc(title)}" />',
+        f'<meta name="twitter:description" content="{_esc(description)}" />',
+    ])
+    html = fill(html, "subtitle", f"<span data-show-number>{_esc(edition_display(show, year))}</span> "
+                                  f"Annual Wineshow — <span data-year-label>{year}</span>")
+
+    html = fill(html, "years", [f'<option value="{y}"{" selected" if y == page.year else ""}>{y}</option>'
+                                for y in years])
+    classes = sorted(shard.get("classes", []), key=lambda c: (
+        c["sort_order"] if _number(c.get("sort_order")) else float("inf"), _natural(str(c.get("code") or ""))))
+    options = ['<option value="">All classes</option>']
+    for cls in classes:
+        code = "" if cls.get("code") is None else str(cls["code"])
+        name = f" — {_esc(cls['name'])}" if cls.get("name") else ""
+        selected = " selected" if code == page.class_code else ""
+        options.append(f'<option value="{_esc(code)}"{selected}>{_esc(code)}{name}</option>')
+    html = fill(html, "classes", options)
+    options = ['<option value="">All winemakers</option>']
+    for key, name in sorted(lookups.get("winemakers", {}).items(), key=lambda kv: fold(kv[1])):
+        selected = " selected" if key == page.winemaker_key else ""
+        options.append(f'<option value="{_esc(key)}"{selected}>{_esc(name)}</option>')
+    html = fill(html, "winemakers", options)
+
+    html = fill(html, "summary", _esc(summary))
+    html = fill(html, "entries", [render_row(r) for r in rows] or [
+        '<tr><td colspan="6">No results match your filters yet. Try a different class or search term.</td></tr>'])
+
+    dates = show.get("date_range") or {}
+    organizer = {"@type": "Organization", "name": (show.get("organizer") or {}).get("name") or CLUB}
+    if (show.get("organizer") or {}).get("website"):
+        organizer["url"] = show["organizer"]["website"]
+    event = {
+        "@context": "https://schema.org",
+        "@type": "Event",
+        "name": f"{show.get('name') or CLUB} — {edition_label(show, year)} {year}",
+        "eventStatus": "https://schema.org/EventCompleted",
+        "location": {"@type": "Place", "name": show.get("location") or "Club Rivers, Riverwood NSW"},
+        "startDate": dates.get("start") or f"{year}-09-01",
+        "endDate": dates.get("end") or dates.get("start") or f"{year}-09-30",
+        "url": page.url,
+        "organizer": organizer,
+    }
+    crumbs = [("Home", f"{SITE}/"), (f"Show Results {year}", f"{SITE}/results/{page.year}/")]
+    if focus:
+        crumbs.append((focus, page.url))
+    breadcrumbs = {
+        "@context": "https://schema.org",
+        "@type": "BreadcrumbList",
+        "itemListElement": [{"@type": "ListItem", "position": i, "name": name, "item": url}
+                            for i, (name, url) in enumerate(crumbs, 1)],
+    }
+    return fill(html, "jsonld", [f'<script id="resultsJsonLd" type="application/ld+json">{_json_ld(event, 2)}</script>',
+                                 f'<script type="application/ld+json">{_json_ld(breadcrumbs, 2)}</script>'])
+
+
+# ---- sitemap ----
+
+_URL = re.compile(r"<url>(.*?)</url>", re.S)
+_FIELD = re.compile(r"<(loc|lastmod|changefreq|priority)>(.*?)</\1>", re.S)
+
+
+def read_sitemap(text: str) -> tuple[str, list[dict[str, str]]]:
+    """(everything before the first <url>, the entries' fields in file order)."""
+    first = text.find("<url>")
+    head = text[:first] if first >= 0 else text[:text.rfind("</urlset>")]
+    entries = [{k: v.strip() for k, v in _FIELD.findall(block)} for block in _URL.findall(text)]
+    return head.rstrip() + "\n\n", entries
+
+
+def render_sitemap(head: str, entries: list[dict[str, str]]) -> str:
+    blocks = []
+    for entry in entries:
+        fields = "".join(f"    <{k}>{xml_escape(entry[k])}</{k}>\n" for k in ("loc", "lastmod", "changefreq", "priority")
+                         if entry.get(k))
+        blocks.append(f"  <url>\n{fields}  </url>\n")
+    return head + "\n".join(blocks) + "\n</urlset>\n"
+
+
+def update_sitemap(text: str, pages: dict[str, tuple[str, bool]], today: date) -> str:
+    """The sitemap with an entry per page: {url: (kind, changed)}.
+
+    Entries of changed pages (and new ones) get today's lastmod; results
+    entries for pages that no longer exist are dropped.
+    """
+    head, entries = read_sitemap(text)
+    kept = []
+    for entry in entries:
+        loc = entry.get("loc", "")
+        if loc in pages:
+            kind, changed = pages.pop(loc)
+            if changed or not entry.get("lastmod"):
+                entry["lastmod"] = today.isoformat()
+        elif loc.startswith(f"{SITE}/results/"):
+            continue
+        kept.append(entry)
+    for loc, (kind, _) in pages.items():
+        changefreq, priority = SITEMAP_DEFAULTS.get(kind, ("monthly", "0.5"))
+        kept.append({"loc": loc, "lastmod": today.isoformat(), "changefreq": changefreq, "priority": priority})
+    return render_sitemap(head, kept)
+
+
+# ---- build ----
+
+def _changed(out: Output, path: Path, text: str) -> bool:
+    before = len(out.changed)
+    out.put(path, text.encode("utf-8"))
+    return len(out.changed) > before
+
+
+def build_pages(root: str | Path, events_path: str | Path, results_dir: str | Path, now: datetime,
+                check: bool = False) -> list[str]:
+    """Prerender index.html, results.html and the results permalinks, and update sitemap.xml.
+
+    Returns the files written or removed (with check=True, those that would be).
+    """
+    root, results_dir = Path(root), Path(results_dir)
+    out = Output(check)
+    pages: dict[str, tuple[str, bool]] = {}
+
+    index_path = root / "index.html"
+    events = json.loads(Path(events_path).read_text(encoding="utf-8"))
+    html = render_index(index_path.read_text(encoding="utf-8"), events, now)
+    pages[f"{SITE}/"] = ("home", _changed(out, index_path, html))
+
+    template_path = root / "results.html"
+    template = template_path.read_text(encoding="utf-8")
+    manifest = json.loads((results_dir / "index.json").read_text(encoding="utf-8"))
+    years = sorted((int(info["year"]) for info in manifest.get("years", [])), reverse=True)
+    written = set()
+    for info in sorted(manifest.get("years", []), key=lambda info: -int(info["year"])):
+        year = int(info["year"])
+        shard = json.loads((results_dir / info["file"]).read_text(encoding="utf-8"))
+        for page in results_pages(year, shard):
+            text = render_results(template, shard, years, page)
+            pages[page.url] = (page.kind, _changed(out, root / "results" / page.path, text))
+            written.add(page.path)
+            if page.kind == "year" and year == years[0]:
+                # results.html shows the newest year; its canonical URL is that year's page
+                _changed(out, template_path, text)
+
+    pages_dir = root / "results"
+    if pages_dir.is_dir():
+        for stale in sorted(pages_dir.rglob("*.html")):
+            rel = stale.relative_to(pages_dir).as_posix()
+            if _PAGE_PATH.match(rel) and rel not in written:
+                out.remove(stale)
+
+    sitemap_path = root / "sitemap.xml"
+    sitemap = update_sitemap(sitemap_path.read_text(encoding="utf-8"), pages, now.date())
+    out.put(sitemap_path, sitemap.encode("utf-8"))
+    return out.changed
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Prerender events, results and JSON-LD into the static pages")
+    ap.add_argument("--root", default=".", help="The site root (index.html, results.html, sitemap.xml)")
+    ap.add_argument("--events", help="events.json (default: <root>/assets/events.json)")
+    ap.add_argument("--results-dir", help="Results shards and index.json (default: <root>/assets/data/results)")
+    ap.add_argument("--now", help="Render as of this ISO timestamp (default: now)")
+    ap.add_argument("--check", action="store_true", help="Write nothing; exit 1 if any page is stale")
+    args = ap.parse_args(argv)
+
+    root = Path(args.root)
+    try:
+        now = datetime.fromisoformat(args.now) if args.now else datetime.now(timezone.utc)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=get_zoneinfo(TZ))
+        changed = build_pages(root, args.events or root / "assets" / "events.json",
+                              args.results_dir or root / "assets" / "data" / "results", now, check=args.check)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    if args.check:
+        if changed:
+            print("Stale: " + ", ".join(changed), file=sys.stderr)
+            return 1
+        print("Prerendered pages and sitemap.xml are up to date.")
+        return 0
+    print(f"Updated {', '.join(changed)}" if changed else "Pages unchanged")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
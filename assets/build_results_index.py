@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+build_results_index.py — Validate results.json and shard it per show year
+
+Usage:
+  python assets/build_results_index.py
+  python assets/build_results_index.py --in assets/data/results.json --out-dir assets/data/results
+  python assets/build_results_index.py --check        # validate only, write nothing
+
+results.html used to download every show year in one document and rebuild
+its lookup maps on each page load. This build step writes instead:
+
+  results/index.json    {"version": 1, "years": [{"year": 2025, "file": "2025.json",
+                         "hash": "...", "entries": 125,
+                         "search": {"file": "2025.search.json", "hash": "..."}}, ...]},
+                        newest year first
+  results/<year>.json   that year's payload (show, classes, judges, entrants,
+                        entries, awards, version) plus precomputed "lookups":
+                          classById, entrantById   id -> index into classes/entrants
+                          classByCode              class code -> index into classes
+                          entriesByClass           class code -> entry indexes
+                          entriesByEntrant         entrant id -> entry indexes
+                          winemakers               winemaker key -> display name
+                          winemakerKeys            lower-cased display name -> key
+  results/<year>.search.json   the search box's inverted index (sawc_search.py),
+                               fetched on the first keystroke
+
+so the page fetches the small manifest and then only the selected year,
+joining entries through the tables instead of re-indexing. "hash" is a
+content hash of the file; the page requests <file>?v=<hash>, so shards can
+be cached until they change. Unchanged files are not rewritten, and shards of
+years no longer in results.json are removed.
+
+The input is validated first and nothing is written if any check fails;
+every problem is listed. Exit status: 0 ok, 2 invalid input.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+import sawc_search
+from sawc_manifest import write_if_changed
+
+INDEX_VERSION = 1
+HASH_CHARS = 12
+_SHARD_NAME = re.compile(r"^\d{4}(\.search)?\.json$")
+_SECTIONS = ("classes", "judges", "entrants", "entries", "awards")
+
+# Judging rules, shared with ingest_results.py
+MAX_SCORE = 20
+MEDAL_CUTOFFS = (  # lowest Score for each medal, best first
+    ("Gold", 18.5),
+    ("Silver", 17.0),
+    ("Bronze", 15.5),
+    ("Highly Commended", 14.5),
+)
+NO_AWARD = "No Award"
+SCORE100_TOLERANCE = 0.05  # Score100 may be rounded to one decimal
+
+
+class ResultsError(ValueError):
+    """results.json failed validation; args[0] lists every problem."""
+
+
+def _unique_ids(items: list, what: str, problems: list[str]) -> dict[str, int]:
+    """id -> index for items, reporting missing and repeated ids."""
+    index = {}
+    for i, item in enumerate(items):
+        item_id = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(item_id, str) or not item_id:
+            problems.append(f"{what}[{i}] has no id")
+        elif item_id in index:
+            problems.append(f"{what}[{i}] repeats id {item_id!r}")
+        else:
+            index[item_id] = i
+    return index
+
+
+def medal_for(score: float) -> str:
+    """The medal MEDAL_CUTOFFS give a Score."""
+    for name, cutoff in MEDAL_CUTOFFS:
+        if score >= cutoff:
+            return name
+    return NO_AWARD
+
+
+def _number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_judging(where: str, entry: dict, judging: dict, problems: list[str]) -> None:
+    """Score within 0-MAX_SCORE, Score100 and Medal agreeing with it."""
+    score, score100, medal = judging.get("Score"), judging.get("Score100"), judging.get("Medal")
+    if score is None:
+        if score100 is not None:
+            problems.append(f"{where}: judging.Score100 is {score100!r} without a Score")
+        if medal is not None:
+            problems.append(f"{where}: judging.Medal is {medal!r} without a Score")
+        return
+    if not _number(score):
+        return
+    if not 0 <= score <= MAX_SCORE:
+        problems.append(f"{where}: judging.Score {score!r} is outside 0-{MAX_SCORE}")
+    if _number(score100) and abs(score100 - score * 100 / MAX_SCORE) > SCORE100_TOLERANCE:
+        problems.append(f"{where}: judging.Score100 {score100!r} does not match Score {score!r} "
+                        f"(expected {score * 100 / MAX_SCORE:g})")
+    audit = entry.get("audit")
+    expected = NO_AWARD if isinstance(audit, dict) and audit.get("disqualified") else medal_for(score)
+    if medal != expected:
+        problems.append(f"{where}: judging.Medal {medal!r} does not match Score {score!r} (expected {expected!r})")
+
+
+def validate_year(key: str, payload, problems: list[str]) -> None:
+    """Append every problem with one show year's payload to problems."""
+    if not re.fullmatch(r"\d{4}", key):
+        problems.append(f"{key!r}: top-level keys must be four-digit show years")
+        return
+    if not isinstance(payload, dict):
+        problems.append(f"{key}: expected an object")
+        return
+    show = payload.get("show")
+    if not isinstance(show, dict):
+        problems.append(f"{key}: missing 'show' object")
+    elif show.get("year") is not None and show["year"] != int(key):
+        problems.append(f"{key}: show.year is {show['year']!r}")
+    for section in _SECTIONS:
+        if not isinstance(payload.get(section, []), list):
+            problems.append(f"{key}: '{section}' must be a list")
+            return
+
+    where = f"{key}."
+    classes = _unique_ids(payload.get("classes", []), where + "classes", problems)
+    entrants = _unique_ids(payload.get("entrants", []), where + "entrants", problems)
+    entries = _unique_ids(payload.get("entries", []), where + "entries", problems)
+    _unique_ids(payload.get("awards", []), where + "awards", problems)
+
+    codes = set()
+    for i, cls in enumerate(payload.get("classes", [])):
+        code = cls.get("code") if isinstance(cls, dict) else None
+        if code is None:
+            problems.append(f"{key}.classes[{i}] has no code")
+        elif str(code) in codes:
+            problems.append(f"{key}.classes[{i}] repeats code {code!r}")
+        codes.add(str(code))
+
+    exhibits: dict[str, int] = {}
+    for i, entry in enumerate(payload.get("entries", [])):
+        if not isinstance(entry, dict):
+            continue
+        number = entry.get("exhibit_number")
+        if number is not None:
+            if str(number) in exhibits:
+                problems.append(f"{key}.entries[{i}] ({entry.get('id')}): repeats exhibit_number {number!r} "
+                                f"of entries[{exhibits[str(number)]}]")
+            else:
+                exhibits[str(number)] = i
+        if entry.get("class_id") not in classes:
+            problems.append(f"{key}.entries[{i}] ({entry.get('id')}): unknown class_id {entry.get('class_id')!r}")
+        if entry.get("entrant_id") is None:
+            problems.append(f"{key}.entries[{i}] ({entry.get('id')}): missing entrant_id")
+        elif entry["entrant_id"] not in entrants:
+            problems.append(f"{key}.entries[{i}] ({entry.get('id')}): unknown entrant_id {entry['entrant_id']!r}")
+        judging = entry.get("judging") or {}
+        if not isinstance(judging, dict):
+            problems.append(f"{key}.entries[{i}] ({entry.get('id')}): 'judging' must be an object")
+            continue
+        for field in ("Score", "Score100"):
+            value = judging.get(field)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                problems.append(f"{key}.entries[{i}] ({entry.get('id')}): judging.{field} is not a number: {value!r}")
+        _check_judging(f"{key}.entries[{i}] ({entry.get('id')})", entry, judging, problems)
+
+    for i, award in enumerate(payload.get("awards", [])):
+        winner = award.get("winner_entry_id") if isinstance(award, dict) else None
+        if winner is not None and winner not in entries:
+            problems.append(f"{key}.awards[{i}]: unknown winner_entry_id {winner!r}")
+
+
+def validate(results) -> None:
+    """Raise ResultsError listing every problem in a parsed results.json."""
+    if not isinstance(results, dict):
+        raise ResultsError("Root of results.json must be an object keyed by show year")
+    problems: list[str] = []
+    for key, payload in results.items():
+        validate_year(key, payload, problems)
+    if problems:
+        raise ResultsError("\n".join(problems))
+
+
+def _winemaker(entrant: dict) -> str:
+    return entrant.get("display_name") or entrant.get("name") or "Unnamed entrant"
+
+
+def build_lookups(payload: dict) -> dict:
+    """Lookup tables for one (validated) show year; see the module docstring."""
+    classes = payload.get("classes", [])
+    entrants = payload.get("entrants", [])
+    class_by_id = {c["id"]: i for i, c in enumerate(classes)}
+    entrant_by_id = {e["id"]: i for i, e in enumerate(entrants)}
+
+    # Class codes in page order, so the tables read like the class dropdown
+    order = sorted(range(len(classes)), key=lambda i: (
+        classes[i].get("sort_order") if isinstance(classes[i].get("sort_order"), (int, float)) else float("inf"),
+        str(classes[i]["code"])))
+    entries_by_class: dict[str, list[int]] = {str(classes[i]["code"]): [] for i in order}
+    entries_by_entrant: dict[str, list[int]] = {}
+    winemakers: dict[str, str] = {}
+    for i, entry in enumerate(payload.get("entries", [])):
+        entries_by_class[str(classes[class_by_id[entry["class_id"]]]["code"])].append(i)
+        entrant_id = entry.get("entrant_id")
+        if entrant_id is not None:
+            entries_by_entrant.setdefault(entrant_id, []).append(i)
+            winemakers[f"id:{entrant_id}"] = _winemaker(entrants[entrant_by_id[entrant_id]])
+
+    return {
+        "classById": class_by_id,
+        "classByCode": {str(c["code"]): i for i, c in enumerate(classes)},
+        "entrantById": entrant_by_id,
+        "entriesByClass": entries_by_class,
+        "entriesByEntrant": entries_by_entrant,
+        "winemakers": winemakers,
+        "winemakerKeys": {name.lower(): key for key, name in winemakers.items()},
+    }
+
+
+def render_shard(payload: dict) -> str:
+    """One year's shard: the payload plus its lookups, as compact JSON."""
+    shard = {**payload, "lookups": build_lookups(payload)}
+    return json.dumps(shard, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def render_search_index(payload: dict) -> str:
+    """One year's search index (see sawc_search.py), as compact JSON."""
+    entrants = {e["id"]: e for e in payload.get("entrants", [])}
+    texts = [sawc_search.fold(sawc_search.entry_text(entry, entrants.get(entry.get("entrant_id"))))
+             for entry in payload.get("entries", [])]
+    return json.dumps(sawc_search.build_index(texts), ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:HASH_CHARS]
+
+
+def build_index(results: dict, out_dir: str | Path) -> list[str]:
+    """Write every shard, search index and index.json into out_dir; returns the files written or removed."""
+    out_dir = Path(out_dir)
+    changed = []
+    years = []
+    for key in sorted(results, reverse=True):
+        shard = render_shard(results[key])
+        search = render_search_index(results[key])
+        for name, text in ((f"{key}.json", shard), (f"{key}.search.json", search)):
+            if write_if_changed(out_dir / name, text, newline=""):
+                changed.append(str(out_dir / name))
+        years.append({
+            "year": int(key),
+            "file": f"{key}.json",
+            "hash": _content_hash(shard),
+            "entries": len(results[key].get("entries", [])),
+            "search": {"file": f"{key}.search.json", "hash": _content_hash(search)},
+        })
+
+    index = {"version": INDEX_VERSION, "years": years}
+    if write_if_changed(out_dir / "index.json", json.dumps(index, indent=2) + "\n", newline=""):
+        changed.append(str(out_dir / "index.json"))
+
+    keep = {y["file"] for y in years} | {y["search"]["file"] for y in years}
+    for stale in sorted(out_dir.iterdir()):
+        if _SHARD_NAME.match(stale.name) and stale.name not in keep:
+            stale.unlink()
+            changed.append(f"{stale} (removed)")
+    return changed
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Validate results.json and write per-year shards + lookup tables")
+    ap.add_argument("--in", dest="in_path", default="./assets/data/results.json", help="Path to results.json")
+    ap.add_argument("--out-dir", default="./assets/data/results", help="Directory for index.json and <year>.json")
+    ap.add_argument("--check", action="store_true", help="Only validate the input")
+    args = ap.parse_args(argv)
+
+    in_path = Path(args.in_path)
+    try:
+        results = json.loads(in_path.read_text(encoding="utf-8"))
+        validate(results)
+    except (OSError, ValueError) as e:
+        # json.JSONDecodeError and ResultsError are ValueErrors
+        print(f"ERROR: {in_path} is not valid:\n{e}", file=sys.stderr)
+        return 2
+
+    years = ", ".join(sorted(results, reverse=True)) or "none"
+    if args.check:
+        print(f"{in_path} is valid (years: {years}).")
+        return 0
+    changed = build_index(results, args.out_dir)
+    print(f"Indexed {in_path} (years: {years}); "
+          + (f"updated {', '.join(changed)}" if changed else "shards unchanged"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+build_results_stats.py — Cross-year leaderboard and statistics for the results data
+
+Usage:
+  python assets/build_results_stats.py
+  python assets/build_results_stats.py --in assets/data/results.json --out assets/data/results/stats.json
+
+Every show year's entries, classes and entrants are loaded once into
+columnar pandas frames (load_frames), with categorical codes for the ids,
+and every aggregate is a vectorized group-by over them:
+
+  years       per show year: entries, entrants, classes, mean Score100, medals
+  entrants    per entrant id across years: name (latest year), years entered,
+              entries, medals, mean/best Score100, best-in-class wins,
+              champion (best in show) wins; ordered like a medal table
+  classes     per class code across years: name (latest year), entries,
+              medals, mean Score100, best-in-class history (one winner per
+              year) and colour/aroma/taste distributions
+  components  colour/aroma/taste distributions over all entries
+
+Conventions follow results.js: Score100 falls back to Score * 5, and
+trophies containing "best in class" / "best in show" mark those awards. A
+class year without a best-in-class trophy is won by its top Score100 (ties go
+to the earlier entry). Disqualified entries (audit.disqualified) are left out.
+Distributions give mean, std, min, p25, median, p75 and max; floats are
+rounded to ROUND places.
+
+The input is validated with build_results_index.validate first. The output
+is only rewritten when it changes. Exit status: 0 ok, 2 invalid input.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from build_results_index import validate
+from sawc_manifest import write_if_changed
+
+STATS_VERSION = 1
+ROUND = 2
+MEDALS = ("Gold", "Silver", "Bronze", "Highly Commended", "No Award")  # medal-table order
+COMPONENTS = ("colour", "aroma", "taste")
+_QUANTILES = {"min": 0.0, "p25": 0.25, "median": 0.5, "p75": 0.75, "max": 1.0}
+
+
+class ResultsFrames(NamedTuple):
+    entries: pd.DataFrame   # one row per entry: year, entry/class/entrant ids, class code, scores, flags
+    classes: pd.DataFrame   # year, class_id, code, name, sort_order
+    entrants: pd.DataFrame  # year, entrant_id, name
+
+
+def _floats(values: list) -> np.ndarray:
+    """float64 column with None as NaN; any other non-number also becomes NaN."""
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array([v if type(v) in (int, float) else None for v in values], dtype=np.float64)
+
+
+def load_frames(results: dict) -> ResultsFrames:
+    """Flatten a (validated) results.json into columnar frames.
+
+    Each column is built with one comprehension over the raw records, which
+    is what keeps decades of shows loading in a fraction of a second.
+    """
+    years, raw_classes, raw_entrants, raw_entries = [], [], [], []
+    for key, payload in results.items():
+        year = int(key)
+        for section, rows in (("classes", raw_classes), ("entrants", raw_entrants), ("entries", raw_entries)):
+            batch = payload.get(section, [])
+            rows.extend(batch)
+            years.append((section, year, len(batch)))
+
+    def year_column(section: str) -> np.ndarray:
+        counts = [(y, n) for s, y, n in years if s == section]
+        return np.repeat(np.array([y for y, _ in counts], dtype=np.int16), [n for _, n in counts])
+
+    classes = pd.DataFrame({
+        "year": year_column("classes"),
+        "class_id": [c["id"] for c in raw_classes],
+        "code": pd.Categorical([str(c["code"]) for c in raw_classes]),
+        "name": [c.get("name") or "" for c in raw_classes],
+        "sort_order": _floats([c.get("sort_order") for c in raw_classes]),
+    })
+    entrants = pd.DataFrame({
+        "year": year_column("entrants"),
+        "entrant_id": pd.Categorical([e["id"] for e in raw_entrants]),
+        "name": [e.get("display_name") or e.get("name") or "Unnamed entrant" for e in raw_entrants],
+    })
+
+    judging = [e.get("judging") or {} for e in raw_entries]
+    components = [e.get("components") or {} for e in raw_entries]
+    trophies = [" | ".join(t.lower() for t in j["trophies"] if isinstance(t, str)) if j.get("trophies") else ""
+                for j in judging]
+    entry_years = year_column("entries")
+    class_ids = [e["class_id"] for e in raw_entries]
+    entries = pd.DataFrame({
+        "year": entry_years,
+        "entry_id": [e["id"] for e in raw_entries],
+        "class_id": pd.Categorical(class_ids),
+        "entrant_id": pd.Categorical([e.get("entrant_id") for e in raw_entries]),
+        "medal": pd.Categorical([j.get("Medal") for j in judging]),
+        "score": _floats([j.get("Score") for j in judging]),
+        "score100": _floats([j.get("Score100") for j in judging]),
+        **{name: _floats([c.get(name) for c in components]) for name in COMPONENTS},
+        "trophy_bic": np.array(["best in class" in t for t in trophies], dtype=bool),
+        "trophy_bis": np.array(["best in show" in t for t in trophies], dtype=bool),
+        "disqualified": np.array([bool((e.get("audit") or {}).get("disqualified")) for e in raw_entries], dtype=bool),
+    })
+    entries["score100"] = entries["score100"].fillna(entries["score"] * 5)
+    # Class ids are per year; the code is what identifies a class across years
+    position = pd.MultiIndex.from_arrays([classes["year"], classes["class_id"]]) \
+        .get_indexer(pd.MultiIndex.from_arrays([entry_years, class_ids]))
+    entries["class_code"] = pd.Categorical.from_codes(classes["code"].cat.codes.to_numpy()[position],
+                                                      categories=classes["code"].cat.categories)
+    entries = entries[~entries["disqualified"]].reset_index(drop=True)
+    return ResultsFrames(entries, classes, entrants)
+
+
+def best_in_class(entries: pd.DataFrame) -> pd.DataFrame:
+    """One winning entry per (year, class code): trophy holders first, then top Score100."""
+    ranked = entries[entries["trophy_bic"] | entries["score100"].notna()]
+    ranked = ranked.assign(_order=np.arange(len(ranked)))
+    ranked = ranked.sort_values(["trophy_bic", "score100", "_order"], ascending=[False, False, True], kind="stable")
+    return ranked.drop_duplicates(["year", "class_code"]).sort_values(["class_code", "year"]).drop(columns="_order")
+
+
+def _distributions(frame: pd.DataFrame, by: str | None = None) -> pd.DataFrame:
+    """mean/std/quantiles of each component, one row per group (or one row overall)."""
+    grouped = frame.groupby(by, observed=True)[list(COMPONENTS)] if by else frame[list(COMPONENTS)]
+    parts = {"mean": grouped.mean(), "std": grouped.std()}
+    for name, q in _QUANTILES.items():
+        parts[name] = grouped.quantile(q)
+    if by is None:
+        return pd.DataFrame(parts).T.stack().to_frame().T  # one row, (stat, component) columns
+    return pd.concat(parts, axis=1)  # (stat, component) columns
+
+
+def _num(value) -> float | None:
+    return None if pd.isna(value) else round(float(value), ROUND)
+
+
+def _components(row: pd.Series) -> dict:
+    stats = ("mean", "std", *_QUANTILES)
+    return {c: {s: _num(row[(s, c)]) for s in stats} for c in COMPONENTS}
+
+
+def _medal_table(entries: pd.DataFrame, by: str) -> dict:
+    """{group: {medal: count}} with medals in MEDALS order and zero counts left out."""
+    counts = entries.groupby([by, "medal"], observed=True).size().unstack("medal", fill_value=0)
+    medals = [m for m in MEDALS if m in counts.columns] + sorted(c for c in counts.columns if c not in MEDALS)
+    keys = counts.index.tolist() if by == "year" else counts.index.astype(str).tolist()
+    return {key: {m: n for m, n in zip(medals, row) if n} for key, row in zip(keys, counts[medals].to_numpy().tolist())}
+
+
+def _latest(frame: pd.DataFrame, key: str) -> pd.DataFrame:
+    """The most recent year's row for every key (entrant id / class code), indexed by key as str."""
+    latest = frame.sort_values("year", kind="stable").drop_duplicates(key, keep="last")
+    return latest.set_index(latest[key].astype(str))
+
+
+def compute_stats(frames: ResultsFrames) -> dict:
+    """Every aggregate in the stats JSON (see the module docstring)."""
+    entries, classes, entrants = frames
+    entrant_names = _latest(entrants, "entrant_id")["name"].to_dict()
+    class_info = _latest(classes, "code")
+
+    bic = best_in_class(entries)
+    bic_wins = bic.groupby("entrant_id", observed=True).size()
+    bic_wins = dict(zip(bic_wins.index.astype(str), bic_wins.tolist()))
+    bis_wins = entries[entries["trophy_bis"]].groupby("entrant_id", observed=True).size()
+    bis_wins = dict(zip(bis_wins.index.astype(str), bis_wins.tolist()))
+
+    # Per year, newest first
+    by_year = entries.groupby("year").agg(entries=("entry_id", "size"), entrants=("entrant_id", "nunique"),
+                                          classes=("class_code", "nunique"), mean_score=("score100", "mean"))
+    year_medals = _medal_table(entries, "year")
+    years = {
+        str(year): {"entries": n, "entrants": people, "classes": n_classes, "meanScore100": _num(mean),
+                    "medals": year_medals.get(year, {})}
+        for year, n, people, n_classes, mean in zip(by_year.index.tolist()[::-1], *(
+            by_year[c].tolist()[::-1] for c in ("entries", "entrants", "classes", "mean_score")))
+    }
+
+    # Per entrant, ordered like a medal table (gold, silver, bronze, then mean score)
+    by_entrant = entries.groupby("entrant_id", observed=True).agg(
+        entries=("entry_id", "size"), mean_score=("score100", "mean"), best_score=("score100", "max"))
+    by_entrant.index = by_entrant.index.astype(str)
+    entrant_medals = _medal_table(entries, "entrant_id")
+    for medal in MEDALS[:3]:
+        by_entrant[medal] = [entrant_medals.get(eid, {}).get(medal, 0) for eid in by_entrant.index]
+    by_entrant = by_entrant.sort_values([*MEDALS[:3], "mean_score"], ascending=False, kind="stable")
+    entrant_years: dict[str, list[int]] = {}
+    active = entries[["entrant_id", "year"]].drop_duplicates().sort_values("year", kind="stable")
+    for eid, year in zip(active["entrant_id"].astype(str).tolist(), active["year"].tolist()):
+        entrant_years.setdefault(eid, []).append(year)
+    entrant_rows = [
+        {"id": eid, "name": entrant_names.get(eid, "Unnamed entrant"), "years": entrant_years.get(eid, []),
+         "entries": n, "medals": entrant_medals.get(eid, {}), "meanScore100": _num(mean),
+         "bestScore100": _num(best), "bestInClass": bic_wins.get(eid, 0), "champion": bis_wins.get(eid, 0)}
+        for eid, n, mean, best in zip(by_entrant.index, by_entrant["entries"].tolist(),
+                                      by_entrant["mean_score"].tolist(), by_entrant["best_score"].tolist())
+    ]
+
+    # Per class code, in class sort order
+    by_class = entries.groupby("class_code", observed=True).agg(entries=("entry_id", "size"),
+                                                                mean_score=("score100", "mean"))
+    by_class.index = by_class.index.astype(str)
+    class_medals = _medal_table(entries, "class_code")
+    class_components = _distributions(entries, "class_code")
+    class_components.index = class_components.index.astype(str)
+    history: dict[str, list[dict]] = {}
+    for code, year, entry_id, entrant_id, score in zip(
+            bic["class_code"].astype(str).tolist(), bic["year"].tolist(), bic["entry_id"].tolist(),
+            bic["entrant_id"].astype(object).tolist(), bic["score100"].tolist()):
+        history.setdefault(code, []).append({
+            "year": year, "entryId": entry_id, "entrantId": None if pd.isna(entrant_id) else entrant_id,
+            "name": entrant_names.get(entrant_id, "Unnamed entrant"), "score100": _num(score)})
+    order = class_info.reindex(by_class.index)[["sort_order"]].assign(code=by_class.index) \
+        .sort_values(["sort_order", "code"], na_position="last").index
+    class_rows = [
+        {"code": code, "name": class_info.at[code, "name"] if code in class_info.index else "",
+         "entries": int(by_class.at[code, "entries"]), "medals": class_medals.get(code, {}),
+         "meanScore100": _num(by_class.at[code, "mean_score"]), "bestInClass": history.get(code, []),
+         "components": _components(class_components.loc[code])}
+        for code in order
+    ]
+
+    return {
+        "version": STATS_VERSION,
+        "years": years,
+        "entrants": entrant_rows,
+        "classes": class_rows,
+        "components": _components(_distributions(entries).iloc[0]),
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Build cross-year leaderboard/statistics JSON from results.json")
+    ap.add_argument("--in", dest="in_path", default="./assets/data/results.json", help="Path to results.json")
+    ap.add_argument("--out", dest="out_path", default="./assets/data/results/stats.json", help="Stats JSON to write")
+    args = ap.parse_args(argv)
+
+    in_path = Path(args.in_path)
+    try:
+        results = json.loads(in_path.read_text(encoding="utf-8"))
+        validate(results)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {in_path} is not valid:\n{e}", file=sys.stderr)
+        return 2
+
+    stats = compute_stats(load_frames(results))
+    text = json.dumps(stats, ensure_ascii=False, indent=2) + "\n"
+    written = write_if_changed(args.out_path, text, newline="")
+    print(f"{'Wrote' if written else 'Unchanged:'} {args.out_path} ({len(stats['years'])} years, "
+          f"{len(stats['entrants'])} entrants, {len(stats['classes'])} classes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,29 @@
+// Shared by events.js and nextevent.js (load this first): the events.json
+// lookup, so both pages resolve the fingerprinted copy the same way.
+(() => {
+    const EVENTS_JSON_URL = '/assets/events.json';
+    const ASSET_MANIFEST_URL = '/assets/asset-manifest.json';
+
+    // build_assets.py publishes a content-hashed copy of events.json listed in
+    // asset-manifest.json: revalidate the small manifest, fetch the hashed file
+    // (cacheable until it changes), and fall back to the plain file.
+    const fetchEvents = async () => {
+      try {
+        const manifestRes = await fetch(ASSET_MANIFEST_URL, { cache: 'no-cache' });
+        if (manifestRes.ok) {
+          const manifest = await manifestRes.json();
+          const path = manifest?.assets?.['events.json']?.fingerprint?.path;
+          if (path) {
+            const res = await fetch(`/assets/${path}`);
+            if (res.ok) return await res.json();
+          }
+        }
+      } catch (err) {
+        console.warn('asset manifest unavailable, loading events.json directly', err);
+      }
+      const res = await fetch(EVENTS_JSON_URL, { cache: 'no-store' });
+      return res.json();
+    };
+
+    window.SAWCEventFeed = { fetchEvents };
+  })();
@@ -1,5 +1,5 @@
 (() => {
-    const EVENTS_JSON_URL = '/assets/events.json';
+    const FUTURE_JSON_URL = '/assets/events-future.json';
     const ICS_URL = '/assets/sawc-events.ics';
     const TZ = 'Australia/Sydney';
   
@@ -151,6 +151,40 @@
       return end;
     };
   
+    // ---------- Data loading ----------
+    // eventfeed.js: the fingerprinted events.json via asset-manifest.json
+    const { fetchEvents } = window.SAWCEventFeed;
+
+    // events-future.json (the json:future slice) holds only the events that
+    // hadn't ended at build time, so the list renders without the history.
+    const fetchUpcoming = async () => {
+      try {
+        const res = await fetch(FUTURE_JSON_URL, { cache: 'no-cache' });
+        if (res.ok) return await res.json();
+      } catch (err) {
+        console.warn('events-future.json unavailable, loading every event', err);
+      }
+      return null;
+    };
+
+    const byStart = (a, b) => new Date(a.start) - new Date(b.start);
+
+    // assets/build_pages.py prerenders the upcoming events into index.html.
+    // Keep them, dropping any that have ended since the build; false when
+    // none are left (or none were prerendered), so the feed is loaded instead.
+    const hydrateUpcoming = (container) => {
+      const items = container.querySelectorAll('article[data-event-end]');
+      if (!items.length) return false;
+      const now = new Date();
+      items.forEach((art) => {
+        if (new Date(art.dataset.eventEnd) < now) art.remove();
+      });
+      container.querySelectorAll('.event-month').forEach((block) => {
+        if (!block.querySelector('article')) block.remove();
+      });
+      return container.querySelector('article') !== null;
+    };
+  
     // ---------- Boot ----------
     const init = async () => {
       const listEl = document.getElementById('events-list');
@@ -158,23 +192,42 @@
       const pastWrap = document.getElementById('past-wrapper');
       if (!listEl) return;
   
-      try {
-        const res = await fetch(EVENTS_JSON_URL, { cache: 'no-store' });
-        const all = await res.json();
-  
-        // sort ascending by start
-        all.sort((a, b) => new Date(a.start) - new Date(b.start));
-  
+      // Past events need the full events.json: load it only when the
+      // "past events" section is opened (or when the slice is missing).
+      let all = null;
+      const loadAll = async () => {
+        if (!all) all = ((await fetchEvents()) || []).sort(byStart);
+        return all;
+      };
+      const showPast = async () => {
         const now = new Date();
-        const upcoming = all.filter(e => effectiveEnd(e) >= now);
-        const past     = all.filter(e => effectiveEnd(e) <  now).reverse();
-  
-        renderUpcoming(listEl, upcoming);
-        if (pastEl && pastWrap) renderPast(pastEl, pastWrap, past);
+        const past = (await loadAll()).filter(e => effectiveEnd(e) < now).reverse();
+        renderPast(pastEl, pastWrap, past);
+      };
+
+      try {
+        if (!hydrateUpcoming(listEl)) {
+          const future = (await fetchUpcoming()) || (await loadAll());
+          const now = new Date();
+          const upcoming = future.filter(e => effectiveEnd(e) >= now).sort(byStart);
+          renderUpcoming(listEl, upcoming);
+        }
       } catch (err) {
         console.error(err);
         listEl.textContent = 'Sorry, we couldn’t load events right now.';
       }
+
+      if (!pastEl || !pastWrap) return;
+      const onToggle = () => {
+        if (!pastWrap.open) return;
+        pastWrap.removeEventListener('toggle', onToggle);
+        showPast().catch((err) => {
+          console.error(err);
+          pastEl.textContent = 'Sorry, we couldn’t load past events right now.';
+        });
+      };
+      pastWrap.addEventListener('toggle', onToggle);
+      if (pastWrap.open) onToggle();
     };
   
     // If loaded with `defer`, DOM is ready; otherwise wait.
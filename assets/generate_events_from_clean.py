@@ -12,7 +12,63 @@ Key behavior
 - Builds timezone-aware datetimes in Australia/Sydney (configurable)
 - If Start/End missing/blank, defaults to 7:30 PM – 9:30 PM on the event date
 - Outputs stable JSON array; IDs can be UUID (default) or deterministic
+  (YYYYMMDD-slug; two events sharing one get -HHMM, -2, ... via sawc_merge.py)
 - Optional: also emit an .ics feed via --ics
+- Plain CSVs are converted with the stdlib csv/zoneinfo modules, without
+  importing pandas (--engine auto); XLSX, big CSVs and anything the stdlib
+  reader can't match exactly use the columnar pandas engine (--engine rows
+  keeps the per-row loop)
+- --incremental reuses a content-hash manifest (events.json.manifest.json) so
+  only edited rows are re-parsed, ids survive in uuid mode, and unchanged
+  outputs are not rewritten
+- --feed also writes the site's sawc-events.ics (generate_ics.py format) from
+  the same in-memory events, so no second script has to re-read events.json
+- Every output is a stage of the sawc_pipeline publish pipeline, rendered
+  concurrently from one parsed event list; --out STAGE=PATH adds any other
+  stage (e.g. --out vtimezone-ics=assets/sawc-events-vtz.ics for the
+  generate_ics_refactored.py format)
+- --next-event writes next-event.json, the next few events only, for the
+  homepage callout; --out STAGE:SLICE=PATH publishes a time window of any
+  stage (sawc_slices.py), e.g. the upcoming months or one file per year
+
+  python generate_events_from_clean.py calendar.csv --json assets/events.json \
+      --feed assets/sawc-events.ics --next-event assets/next-event.json \
+      --out json:future=assets/events-future.json \
+      --out tzid-ics:upcoming=assets/sawc-events-upcoming.ics
+
+- --watch stays running and rebuilds every output in-process each time the
+  sheet is saved (inotify on Linux, mtime/size polling elsewhere; saves are
+  debounced), keeping imports and row caches warm between saves
+
+  # Editors' machine: republish on every save
+  python generate_events_from_clean.py calendar.xlsx --json assets/events.json \
+      --feed assets/sawc-events.ics --watch
+
+- --stream converts the sheet in chunks with an external merge sort, so memory
+  stays bounded for archive-sized exports
+
+  # Huge archive export, 50k rows per chunk
+  python generate_events_from_clean.py archive.csv --json events.json --stream
+
+- Several input sheets (activities, venue bookings, special events) are
+  converted separately and merged into one events.json (sawc_merge.py):
+  the same event listed twice becomes one, taking its fields from the
+  first sheet (or the --precedence order) and filling blanks from the rest;
+  near-duplicates and clashing bookings are found with a (day, title) index
+  and a sweep by start time
+
+  python generate_events_from_clean.py calendar.csv bookings.xlsx specials.csv \
+      --json assets/events.json --id-mode deterministic \
+      --precedence specials,calendar,bookings --merge-report merge.json
+
+- --binary-cache also writes events.json.bin (sawc_events.py): fixed-size
+  records with epoch-second times and a table of the distinct strings,
+  which generate_ics.py, generate_ics_refactored.py and serve_feeds.py
+  memory-map instead of parsing events.json while it is up to date
+
+- --timings [FILE] prints per-stage time and peak memory (load, columns,
+  convert, sort, each output stage, vevent, fold, write) and saves them as
+  JSON to FILE; --profile FILE dumps cProfile stats (sawc_timings.py)
 
 Examples
   python generate_events_from_clean.py "SAWC 2025 Activities Calendar_Clean.csv" \
@@ -27,16 +83,62 @@ Examples
       --json events.json --id-mode deterministic
 """
 
+from __future__ import annotations
+
 import argparse
+import contextlib
+import csv
+import heapq
+import importlib.util
+import itertools
 import json
 import re
+import sys
+import tempfile
+import time
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from json.encoder import encode_basestring
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import generate_ics  # registers the tzid-ics output stage
+import generate_ics_refactored  # registers the vtimezone-ics output stage
+import sawc_calendar
+from sawc_events import cache_path, write_cache
+from sawc_io import open_output
+from sawc_manifest import content_key, event_keys, load_manifest, manifest_path, occurrence_keys, save_manifest
+from sawc_merge import DEFAULT_SIMILARITY, Source, merge_events, unique_ids
+from sawc_pipeline import STAGES, expand_targets, load_caches, parse_target, publish, save_caches, stage
+from sawc_sheets import find_col
+from sawc_slices import UPCOMING_MONTHS
+from sawc_time import (UTC, get_tz, get_zoneinfo, iso_to_ics_utc, local_isoformat, midnight_offset,
+                       offset_suffix, zoneinfo_isoformat)
+from sawc_timings import TIMINGS, add_timing_arguments, session
+from sawc_watch import DEBOUNCE, FileWatcher
 
-import pandas as pd
-from dateutil import tz
+
+def _lazy_import(name: str):
+    """Module whose code only runs on first attribute access (importlib's LazyLoader).
+
+    Returns None if the module is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# NumPy/pandas dominate start-up time; the stdlib CSV engine never touches them
+np = _lazy_import("numpy")
+pd = _lazy_import("pandas")
 
 # ---------------------------------------------------------------------------
 # Config
@@ -44,6 +146,15 @@ from dateutil import tz
 DEFAULT_TZ = "Australia/Sydney"
 DEFAULT_START_HM = (19, 30)  # 7:30 PM
 DEFAULT_END_HM   = (21, 30)  # 9:30 PM
+DEFAULT_CHUNKSIZE = 50_000    # rows per chunk in --stream mode
+STDLIB_MAX_BYTES = 4_000_000  # bigger CSVs amortize the pandas import (--engine auto)
+NEXT_EVENT_COUNT = 3          # events in next-event.json
+
+# Field order of each record in events.json
+EVENT_FIELDS = (
+    "id", "title", "start", "end", "location", "description",
+    "meetingActivity", "miniCompetition", "comments",
+)
 
 # Column aliases (lowercased comparison)
 ALIASES = {
@@ -62,15 +173,6 @@ ALIASES = {
 # Helpers
 # ---------------------------------------------------------------------------
 
-def find_col(df: pd.DataFrame, key: str) -> Optional[str]:
-    """Find a column name in df matching ALIASES[key] (case-insensitive)."""
-    lowers = {c: str(c).strip().lower() for c in df.columns}
-    for col, low in lowers.items():
-        if low in ALIASES.get(key, set()):
-            return col
-    return None
-
-
 def parse_time_to_hm(val) -> Optional[Tuple[int, int]]:
     """Return (hour, minute) from diverse time inputs (string, excel fraction, datetime)."""
     if val is None or (isinstance(val, float) and pd.isna(val)) or (isinstance(val, str) and val.strip() == ""):
@@ -106,15 +208,15 @@ def build_dt(date_val, hm: Optional[Tuple[int, int]], tzname: str) -> Optional[d
         hour, minute = DEFAULT_START_HM
     else:
         hour, minute = int(hm[0]), int(hm[1])
-    return datetime(d.year, d.month, d.day, hour, minute, tzinfo=tz.gettz(tzname))
+    return datetime(d.year, d.month, d.day, hour, minute, tzinfo=get_tz(tzname))
 
 
 def ensure_end(start_dt: datetime, end_hm: Optional[Tuple[int, int]], tzname: str) -> datetime:
     if end_hm is None:
         # Default end = 21:30 same day in tz
-        return datetime(start_dt.year, start_dt.month, start_dt.day, DEFAULT_END_HM[0], DEFAULT_END_HM[1], tzinfo=tz.gettz(tzname))
+        return datetime(start_dt.year, start_dt.month, start_dt.day, DEFAULT_END_HM[0], DEFAULT_END_HM[1], tzinfo=get_tz(tzname))
     eh, em = int(end_hm[0]), int(end_hm[1])
-    end_dt = datetime(start_dt.year, start_dt.month, start_dt.day, eh, em, tzinfo=tz.gettz(tzname))
+    end_dt = datetime(start_dt.year, start_dt.month, start_dt.day, eh, em, tzinfo=get_tz(tzname))
     # If somehow before start, bump by +1 day
     if end_dt <= start_dt:
         end_dt = end_dt + timedelta(days=1)
@@ -141,54 +243,74 @@ def escape_ics(text):
 
 
 def to_ics_utc(dt: datetime) -> str:
-    return dt.astimezone(tz.gettz("UTC")).strftime("%Y%m%dT%H%M%SZ")
+    return dt.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
 
 # ---------------------------------------------------------------------------
-# Main
+# Loading
 # ---------------------------------------------------------------------------
 
-def main():
-    ap = argparse.ArgumentParser(description="Generate events.json (and optional .ics) from a cleaned SAWC calendar.")
-    ap.add_argument("input_path", help="Path to CSV or XLSX")
-    ap.add_argument("--json", required=True, help="Output events.json path")
-    ap.add_argument("--ics", help="Optional output calendar.ics path")
-    ap.add_argument("--tz", default=DEFAULT_TZ, help=f"Timezone name (default: {DEFAULT_TZ})")
-    ap.add_argument("--id-mode", choices=["uuid","deterministic"], default="uuid")
-    args = ap.parse_args()
+def load_frame(p: Path) -> pd.DataFrame:
+    """Read a CSV or Excel sheet into a DataFrame (by file extension)."""
+    if p.suffix.lower() in {".csv"}:
+        return pd.read_csv(p)
+    return pd.read_excel(p)
 
-    p = Path(args.input_path)
-    if not p.exists():
-        raise SystemExit(f"Input not found: {p}")
 
-    # Load data
+def iter_chunks(p: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yield the sheet as DataFrames of at most chunksize rows.
+
+    CSV uses pandas' chunked reader; XLSX walks openpyxl's read-only row
+    iterator, so neither holds the whole sheet in memory.
+    """
     if p.suffix.lower() in {".csv"}:
-        df = pd.read_csv(p)
-    else:
-        df = pd.read_excel(p)
-    if df.empty:
-        raise SystemExit("No rows found in the input sheet.")
+        yield from pd.read_csv(p, chunksize=chunksize)
+        return
 
-    # Resolve columns (case-insensitive)
-    col_date  = find_col(df, "date")
-    col_start = find_col(df, "start")
-    col_end   = find_col(df, "end")
-    col_title = find_col(df, "title") or find_col(df, "meetingActivity")
-    col_loc   = find_col(df, "location")
-    col_desc  = find_col(df, "description")
-    col_act   = find_col(df, "meetingActivity")
-    col_mini  = find_col(df, "miniCompetition")
-    col_comm  = find_col(df, "comments")
-
-    missing = [k for k,v in {"date":col_date, "title":col_title}.items() if v is None]
-    if missing:
-        raise SystemExit(f"Missing required columns: {missing}. Columns present: {list(df.columns)}")
+    from openpyxl import load_workbook
+
+    wb = load_workbook(p, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        while True:
+            block = list(itertools.islice(rows, chunksize))
+            if not block:
+                break
+            # Same cell coercion as pandas' openpyxl reader: whole floats become ints
+            block = [[int(v) if isinstance(v, float) and v.is_integer() else v for v in r] for r in block]
+            yield pd.DataFrame(block, columns=list(header))
+    finally:
+        wb.close()
+
+
+def resolve_columns(df: pd.DataFrame) -> Dict[str, Optional[str]]:
+    """Map each event field (and date/start/end) to its sheet column, if any."""
+    return {
+        "date": find_col(df, ALIASES, "date"),
+        "start": find_col(df, ALIASES, "start"),
+        "end": find_col(df, ALIASES, "end"),
+        "title": find_col(df, ALIASES, "title") or find_col(df, ALIASES, "meetingActivity"),
+        "location": find_col(df, ALIASES, "location"),
+        "description": find_col(df, ALIASES, "description"),
+        "meetingActivity": find_col(df, ALIASES, "meetingActivity"),
+        "miniCompetition": find_col(df, ALIASES, "miniCompetition"),
+        "comments": find_col(df, ALIASES, "comments"),
+    }
+
+# ---------------------------------------------------------------------------
+# Per-row engine (reference implementation)
+# ---------------------------------------------------------------------------
 
+def events_from_rows(df: pd.DataFrame, cols: Dict[str, Optional[str]], tzname: str, id_mode: str) -> List[dict]:
+    """Convert the sheet one row at a time; returns events sorted by start."""
+    col_date, col_start, col_end = cols["date"], cols["start"], cols["end"]
     events = []
-    tzname = args.tz
 
     for i, row in df.iterrows():
         # Title
-        title_raw = row[col_title]
+        title_raw = row[cols["title"]]
         title = "" if pd.isna(title_raw) else str(title_raw).strip()
         if not title:
             continue
@@ -209,53 +331,944 @@ def main():
             return "" if pd.isna(val) else str(val).strip()
 
         evt = {
-            "id": make_id(title, start_dt, args.id_mode),
+            "id": make_id(title, start_dt, id_mode),
             "title": title,
-            "start": start_dt.isoformat(),
-            "end": end_dt.isoformat(),
-            "location": get(col_loc),
-            "description": get(col_desc),
-            "meetingActivity": get(col_act),
-            "miniCompetition": get(col_mini),
-            "comments": get(col_comm),
+            "start": local_isoformat(start_dt, tzname),
+            "end": local_isoformat(end_dt, tzname),
+            "location": get(cols["location"]),
+            "description": get(cols["description"]),
+            "meetingActivity": get(cols["meetingActivity"]),
+            "miniCompetition": get(cols["miniCompetition"]),
+            "comments": get(cols["comments"]),
         }
         events.append(evt)
 
     # Sort chronologically
-    events.sort(key=lambda e: e["start"])
+    with TIMINGS.stage("sort"):
+        events.sort(key=lambda e: e["start"])
+    return events
+
+# ---------------------------------------------------------------------------
+# Columnar engine
+#
+# Each column is factorized once and only its *distinct* values go through the
+# scalar parsers above, so results match the per-row engine exactly (including
+# its quirks) while the per-row work is plain NumPy indexing. Wall-clock times
+# are carried as int64 minutes since 1970-01-01 and localized per distinct value.
+# ---------------------------------------------------------------------------
+
+_EPOCH = datetime(1970, 1, 1)
+_DMY_RE = r"^(\d{1,2})/(\d{1,2})/(\d{4})$"
+
+
+def _map_distinct(series: pd.Series, func) -> Tuple[np.ndarray, list]:
+    """Factorize series and apply func to each distinct value.
+
+    Returns (codes, results) where codes is -1 for missing values.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    return codes, [func(v) for v in uniques]
+
+
+def _text_column(df: pd.DataFrame, colname: Optional[str]) -> np.ndarray:
+    """Column as stripped strings ('' for missing), like the per-row get()."""
+    if not colname:
+        return np.full(len(df), "", dtype=object)
+    codes, values = _map_distinct(df[colname], lambda v: str(v).strip())
+    table = np.array(values + [""], dtype=object)
+    return table[codes]
+
+
+def _date_days(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Date column as (int64 days since epoch, parsed-ok mask), like build_dt()."""
+    if pd.api.types.is_datetime64_dtype(series.dtype):
+        values = series.to_numpy(dtype="datetime64[ns]")
+        valid = ~np.isnat(values)
+        days = np.where(valid, values.astype("datetime64[D]").astype(np.int64), 0)
+        return days, valid
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    uniques = pd.Series(np.asarray(uniques, dtype=object))
+    days_u = np.zeros(len(uniques) + 1, dtype=np.int64)
+    valid_u = np.zeros(len(uniques) + 1, dtype=bool)
+    pending = np.ones(len(uniques), dtype=bool)
+
+    # D/M/YYYY strings (the usual export) parse exactly as dayfirst=True does
+    is_str = uniques.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+    parts = uniques[is_str].str.extract(_DMY_RE).dropna().astype(np.int64)
+    if len(parts):
+        dmy = pd.to_datetime({"year": parts[2], "month": parts[1], "day": parts[0]}, errors="coerce")
+        ok = dmy.notna().to_numpy()
+        idx = parts.index.to_numpy()[ok]
+        days_u[idx] = dmy.to_numpy(dtype="datetime64[ns]")[ok].astype("datetime64[D]").astype(np.int64)
+        valid_u[idx] = True
+        pending[idx] = False
+
+    # Anything else goes through the scalar parser of build_dt()
+    for i in np.flatnonzero(pending):
+        v = uniques.iat[i]
+        if isinstance(v, (pd.Timestamp, datetime)):
+            d = pd.to_datetime(v).date()
+        else:
+            d_parsed = pd.to_datetime(str(v), dayfirst=True, errors="coerce")
+            if pd.isna(d_parsed):
+                continue
+            d = d_parsed.date()
+        days_u[i] = (d - _EPOCH.date()).days
+        valid_u[i] = True
+    return days_u[codes], valid_u[codes]
+
+
+def _time_hm(series: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Time column as (hour, minute, present) int/bool arrays."""
+    n = len(series)
+    if pd.api.types.is_datetime64_dtype(series.dtype):
+        present = series.notna().to_numpy()
+        hour = series.dt.hour.fillna(0).to_numpy(dtype=np.int64)
+        minute = series.dt.minute.fillna(0).to_numpy(dtype=np.int64)
+        return hour, minute, present
+
+    hour = np.zeros(n, dtype=np.int64)
+    minute = np.zeros(n, dtype=np.int64)
+    present = np.zeros(n, dtype=bool)
+    rest = np.ones(n, dtype=bool)
+
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        # Excel day fractions, same rounding as parse_time_to_hm
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        frac = (values >= 0) & (values < 2)
+        total = np.rint(values[frac] * 24 * 60).astype(np.int64)
+        hour[frac], minute[frac] = total // 60, total % 60
+        present[frac] = True
+        rest = ~frac & ~np.isnan(values)
+        if not rest.any():
+            return hour, minute, present
+
+    # Everything else (strings, datetimes, odd numbers): parse distinct values once
+    codes, values = _map_distinct(series[rest], parse_time_to_hm)
+    ok_u = np.array([v is not None for v in values] + [False], dtype=bool)
+    h_u = np.array([v[0] if v else 0 for v in values] + [0], dtype=np.int64)
+    m_u = np.array([v[1] if v else 0 for v in values] + [0], dtype=np.int64)
+    hour[rest], minute[rest], present[rest] = h_u[codes], m_u[codes], ok_u[codes]
+    return hour, minute, present
+
+
+def _check_hm(hour: np.ndarray, minute: np.ndarray) -> None:
+    """Raise like datetime() would for out-of-range clock values."""
+    if (hour > 23).any():
+        raise ValueError("hour must be in 0..23")
+    if (minute > 59).any():
+        raise ValueError("minute must be in 0..59")
+
+
+def _steady_days(days: np.ndarray, tzname: str) -> np.ndarray:
+    """Mask of epoch days with no UTC offset change from the day before to the
+    day after, within the years where pandas and dateutil read the same rules."""
+    steady = np.zeros(len(days), dtype=bool)
+    for i, d in enumerate(days):
+        ordinal = _EPOCH.toordinal() + int(d)
+        if 1902 <= date.fromordinal(ordinal).year <= 2036:
+            steady[i] = len({midnight_offset(tzname, o) for o in range(ordinal - 1, ordinal + 3)}) == 1
+    return steady
+
+
+def _localize_iso(walls: np.ndarray, tzname: str) -> np.ndarray:
+    """ISO-8601 strings for wall-clock minutes, localized in bulk.
+
+    pandas and dateutil disagree on some wall times around transitions (skipped
+    hours, negative DST) and after 2036, where dateutil stops extending the
+    zone's rules; those few are resolved through dateutil directly.
+    """
+    tzinfo = get_tz(tzname)
+    distinct, inverse = np.unique(walls, return_inverse=True)
+    naive = pd.DatetimeIndex(distinct.astype("datetime64[m]").astype("datetime64[ns]"))
+    clock = np.datetime_as_string(distinct.astype("datetime64[m]"), unit="s").astype(object)
+    if tzinfo is None:
+        return clock[inverse.reshape(-1)]
+
+    local = naive.tz_localize(tzinfo, ambiguous=np.ones(len(naive), dtype=bool), nonexistent="NaT")
+    offsets = (naive.asi8 - local.asi8) // 1_000_000_000
+    day_u, day_codes = np.unique(distinct // 1440, return_inverse=True)
+    exact = local.isna() | ~_steady_days(day_u, tzname)[day_codes.reshape(-1)]
+    for i in np.flatnonzero(exact):
+        offsets[i] = int(naive[i].to_pydatetime().replace(tzinfo=tzinfo).utcoffset().total_seconds())
+    codes, distinct_offsets = pd.factorize(offsets)
+    suffix = np.array([offset_suffix(timedelta(seconds=int(o))) for o in distinct_offsets], dtype=object)
+    return (clock + suffix[codes])[inverse.reshape(-1)]
+
+
+def frame_records(df: pd.DataFrame, cols: Dict[str, Optional[str]], tzname: str,
+                  id_mode: str) -> Tuple[np.ndarray, List[dict]]:
+    """Columnar conversion; returns (row positions, events) sorted by start.
+
+    Rows without a title or a parseable date produce no event, so positions
+    (into df) tell which row each event came from.
+    """
+    titles = _text_column(df, cols["title"])
+    keep = titles != ""
+
+    days, has_date = _date_days(df[cols["date"]][keep])
+    titles = titles[keep][has_date]
+    days = days[has_date]
+    rows = np.flatnonzero(keep)[has_date]
+    frame = df.iloc[rows]
+
+    # Start: explicit time or default, on the event date
+    if cols["start"]:
+        sh, sm, has_start = _time_hm(frame[cols["start"]])
+    else:
+        sh = sm = np.zeros(len(rows), dtype=np.int64)
+        has_start = np.zeros(len(rows), dtype=bool)
+    sh = np.where(has_start, sh, DEFAULT_START_HM[0])
+    sm = np.where(has_start, sm, DEFAULT_START_HM[1])
+    _check_hm(sh, sm)
+
+    # End: explicit time bumped a day when not after start, else default
+    if cols["end"]:
+        eh, em, has_end = _time_hm(frame[cols["end"]])
+    else:
+        eh = em = np.zeros(len(rows), dtype=np.int64)
+        has_end = np.zeros(len(rows), dtype=bool)
+    eh = np.where(has_end, eh, DEFAULT_END_HM[0])
+    em = np.where(has_end, em, DEFAULT_END_HM[1])
+    _check_hm(eh, em)
+
+    start_wall = days * 1440 + sh * 60 + sm
+    end_wall = days * 1440 + eh * 60 + em
+    # Same tzinfo on both sides, so aware comparison is a wall-clock comparison
+    end_wall = np.where(has_end & (end_wall <= start_wall), end_wall + 1440, end_wall)
+
+    starts = _localize_iso(start_wall, tzname)
+    ends = _localize_iso(end_wall, tzname)
+
+    if id_mode == "uuid":
+        ids = [str(uuid.uuid4()) for _ in range(len(rows))]
+    else:
+        day_codes, day_u = pd.factorize(days)
+        stamps = np.array([(_EPOCH + timedelta(days=int(d))).strftime("%Y%m%d") for d in day_u], dtype=object)
+        title_codes, title_u = pd.factorize(titles)
+        slugs = np.array([slugify(t)[:60] for t in title_u], dtype=object)
+        ids = stamps[day_codes] + "-" + slugs[title_codes]
+
+    columns = [
+        ids, titles, starts, ends,
+        _text_column(frame, cols["location"]),
+        _text_column(frame, cols["description"]),
+        _text_column(frame, cols["meetingActivity"]),
+        _text_column(frame, cols["miniCompetition"]),
+        _text_column(frame, cols["comments"]),
+    ]
+
+    # Stable sort on the ISO start string, as list.sort does in the row engine
+    with TIMINGS.stage("sort"):
+        order = np.argsort(starts, kind="stable")
+    events = [dict(zip(EVENT_FIELDS, values)) for values in zip(*(np.asarray(c, dtype=object)[order] for c in columns))]
+    return rows[order], events
+
+
+def events_from_frame(df: pd.DataFrame, cols: Dict[str, Optional[str]], tzname: str, id_mode: str) -> List[dict]:
+    """Columnar equivalent of events_from_rows(); returns events sorted by start."""
+    return frame_records(df, cols, tzname, id_mode)[1]
+
+# ---------------------------------------------------------------------------
+# Stdlib CSV engine
+#
+# Reads the sheet with the csv module and localizes with zoneinfo, so a plain
+# CSV export converts without importing pandas, NumPy or dateutil. It only
+# accepts cells it reads exactly as pandas.read_csv + the per-row engine do;
+# anything else raises Unsupported and the caller falls back to pandas.
+# ---------------------------------------------------------------------------
+
+# Cells pandas.read_csv turns into NaN by default
+CSV_NA_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+_CSV_BOOLS = frozenset({"True", "False", "TRUE", "FALSE", "true", "false"})
+_CSV_DMY = re.compile(_DMY_RE)
+_CSV_HM = re.compile(r"^\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\s*(?:([AaPp])[Mm])?\s*$")
+_CSV_YEARS = (1700, 2200)  # well inside the Timestamp range pandas can parse
+
+
+class Unsupported(ValueError):
+    """The sheet needs pandas to be converted exactly."""
+
+
+class CsvSheet(NamedTuple):
+    """A CSV as read by the csv module: header names and rows of str/None cells."""
+    columns: List[str]
+    rows: List[List[Optional[str]]]
+
+    @property
+    def empty(self) -> bool:
+        return not self.rows
+
+
+def read_csv_sheet(p: Path) -> CsvSheet:
+    """Read a CSV like pandas.read_csv would (NA strings become None, BOM dropped)."""
+    try:
+        with open(p, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                raise Unsupported("no header row")
+            if len(set(header)) != len(header):
+                raise Unsupported("duplicate column names")
+            width = len(header)
+            rows = []
+            for r in reader:
+                if not r or (len(r) == 1 and not r[0].strip()):
+                    continue  # blank line
+                if len(r) > width:
+                    raise Unsupported("row wider than the header")
+                rows.append([None if v in CSV_NA_VALUES else v for v in r] + [None] * (width - len(r)))
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise Unsupported(str(e)) from None
+    return CsvSheet(header, rows)
+
+
+def _csv_check_column(sheet: CsvSheet, i: int) -> None:
+    """Reject columns pandas would infer as numeric or boolean."""
+    values = [r[i] for r in sheet.rows if r[i] is not None]
+    if not values:
+        return
+    if all(v in _CSV_BOOLS for v in values):
+        raise Unsupported(f"boolean column {sheet.columns[i]!r}")
+    for v in values:
+        try:
+            float(v)
+        except ValueError:
+            return
+    raise Unsupported(f"numeric column {sheet.columns[i]!r}")
+
+
+def _csv_date(val: str) -> date:
+    """D/M/YYYY cell as a date, like build_dt()'s dayfirst parse."""
+    m = _CSV_DMY.match(val)
+    if not m:
+        raise Unsupported(f"date {val!r}")
+    try:
+        d = date(int(m.group(3)), int(m.group(2)), int(m.group(1)))
+    except ValueError:
+        raise Unsupported(f"date {val!r}") from None
+    if not _CSV_YEARS[0] <= d.year <= _CSV_YEARS[1]:
+        raise Unsupported(f"date {val!r} outside {_CSV_YEARS[0]}-{_CSV_YEARS[1]}")
+    return d
+
+
+def _csv_time(val: Optional[str]) -> Optional[Tuple[int, int]]:
+    """H:MM[:SS] [AM|PM] cell as (hour, minute), like parse_time_to_hm()."""
+    if val is None or not val.strip():
+        return None
+    m = _CSV_HM.match(val)
+    if not m:
+        raise Unsupported(f"time {val!r}")
+    hour, minute = int(m.group(1)), int(m.group(2))
+    ampm = m.group(4)
+    if minute > 59 or (m.group(3) and int(m.group(3)) > 59) or not (1 <= hour <= 12 if ampm else hour <= 23):
+        raise Unsupported(f"time {val!r}")
+    if ampm:
+        hour = hour % 12 + (12 if ampm in "Pp" else 0)
+    return hour, minute
+
+
+def events_from_sheet(sheet: CsvSheet, cols: Dict[str, Optional[str]], tzname: str, id_mode: str) -> List[dict]:
+    """Stdlib equivalent of events_from_rows(); raises Unsupported when it can't match it."""
+    try:
+        get_zoneinfo(tzname)
+    except Exception:
+        raise Unsupported(f"timezone {tzname!r}") from None
+    if sheet.empty or cols["date"] is None or cols["title"] is None:
+        raise Unsupported("empty sheet or missing required columns")
+
+    index = {k: (sheet.columns.index(c) if c else None) for k, c in cols.items()}
+    for i in set(index.values()) - {None}:
+        _csv_check_column(sheet, i)
+    i_title, i_date, i_start, i_end = index["title"], index["date"], index["start"], index["end"]
+    text_fields = [(k, index[k]) for k in EVENT_FIELDS[4:]]
+
+    # Sheets repeat the same dates, times and titles, so parse each distinct value once
+    parse_date, parse_time = lru_cache(maxsize=None)(_csv_date), lru_cache(maxsize=None)(_csv_time)
+    isos: Dict[datetime, str] = {}
+    slugs: Dict[str, str] = {}
+
+    def iso(wall: datetime) -> str:
+        text = isos.get(wall)
+        if text is None:
+            text = isos[wall] = zoneinfo_isoformat(wall, tzname)
+        return text
+
+    events = []
+    for row in sheet.rows:
+        title = (row[i_title] or "").strip()
+        if not title or row[i_date] is None:
+            continue
+        d = parse_date(row[i_date])
+        start_hm = (parse_time(row[i_start]) if i_start is not None else None) or DEFAULT_START_HM
+        end_hm = parse_time(row[i_end]) if i_end is not None else None
+
+        start = datetime(d.year, d.month, d.day, *start_hm)
+        end = datetime(d.year, d.month, d.day, *(end_hm or DEFAULT_END_HM))
+        if end_hm and end <= start:
+            end += timedelta(days=1)
+
+        if id_mode == "uuid":
+            event_id = str(uuid.uuid4())
+        else:
+            slug = slugs.get(title)
+            if slug is None:
+                slug = slugs[title] = slugify(title)[:60]
+            event_id = f"{d.year:04d}{d.month:02d}{d.day:02d}-{slug}"
+
+        evt = {"id": event_id, "title": title, "start": iso(start), "end": iso(end)}
+        for key, i in text_fields:
+            evt[key] = "" if i is None or row[i] is None else row[i].strip()
+        events.append(evt)
+
+    with TIMINGS.stage("sort"):
+        events.sort(key=lambda e: e["start"])
+    return events
+
+
+def events_from_csv(p: Path, tzname: str, id_mode: str) -> List[dict]:
+    """Read and convert a CSV with the stdlib engine (raises Unsupported)."""
+    with TIMINGS.stage("load"):
+        sheet = read_csv_sheet(p)
+    with TIMINGS.stage("columns"):
+        cols = resolve_columns(sheet)
+    with TIMINGS.stage("convert"):
+        return events_from_sheet(sheet, cols, tzname, id_mode)
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def _json_record(evt: dict, keys: dict) -> str:
+    """One events.json array item, indented as json.dump(indent=2) would."""
+    body = ",\n".join([
+        (keys.get(k) or keys.setdefault(k, f"    {encode_basestring(k)}: ")) + encode_basestring(v)
+        for k, v in evt.items()
+    ])
+    return "  {\n" + body + "\n  }"
+
+
+def _ics_header() -> str:
+    return "\n".join([
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Sydney AWC//Events//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+    ])
+
+
+def _ics_vevent(e: dict, stamp: str) -> str:
+    return "\n".join([
+        "BEGIN:VEVENT",
+        f"UID:{e['id']}@sydneyawc.com",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART:{iso_to_ics_utc(e['start'])}",
+        f"DTEND:{iso_to_ics_utc(e['end'])}",
+        f"SUMMARY:{escape_ics(e['title'])}",
+        f"LOCATION:{escape_ics(e.get('location',''))}",
+        f"DESCRIPTION:{escape_ics(e.get('description',''))}",
+        "END:VEVENT",
+    ])
+
+
+def write_outputs(events: Iterable[dict], json_f, ics_f=None) -> int:
+    """Write events to events.json (and calendar.ics) in a single pass.
+
+    Events are written as they arrive, so a generator keeps memory flat. The
+    JSON matches json.dump(events, f, ensure_ascii=False, indent=2) byte for
+    byte; json.dump itself falls back to its pure-Python encoder when indent
+    is set, and the records are flat dicts of strings. Returns the count.
+    """
+    keys = {}
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    if ics_f:
+        ics_f.write(_ics_header())
+    n = 0
+    for evt in events:
+        json_f.write(("[\n" if n == 0 else ",\n") + _json_record(evt, keys))
+        if ics_f:
+            ics_f.write("\n" + _ics_vevent(evt, stamp))
+        n += 1
+    json_f.write("\n]" if n else "[]")
+    if ics_f:
+        ics_f.write("\nEND:VCALENDAR")
+    return n
+
+
+def write_events_json(events: Iterable[dict], f) -> None:
+    """Write events exactly as json.dump(events, f, ensure_ascii=False, indent=2)."""
+    write_outputs(events, f)
+
+
+def write_files(events: Iterable[dict], json_path: str, ics_path: Optional[str] = None) -> int:
+    """Write events.json (and the .ics, if given) in one pass; returns the event count."""
+    with contextlib.ExitStack() as stack:
+        json_f = stack.enter_context(open_output(json_path, newline=None))
+        ics_f = stack.enter_context(open_output(ics_path, newline=None)) if ics_path else None
+        return write_outputs(events, json_f, ics_f)
+
+
+@stage("json")
+def write_json_stage(events: List[dict], out, cache=None) -> None:
+    """Pipeline stage: events.json."""
+    write_outputs(events, out)
+
 
-    # Write JSON
-    with open(args.json, "w", encoding="utf-8") as f:
-        json.dump(events, f, ensure_ascii=False, indent=2)
+@stage("next-event", slice="future")
+def write_next_event_stage(events: List[dict], out, cache=None) -> None:
+    """Pipeline stage: next-event.json, the first NEXT_EVENT_COUNT events not yet ended.
 
-    # Optional ICS
+    No build time is stored, so the file only changes when an event passes
+    or the schedule is edited.
+    """
+    out.write(json.dumps({"version": 1, "events": events[:NEXT_EVENT_COUNT]}, ensure_ascii=False, indent=2))
+
+
+@stage("utc-ics", cache_params=())
+def write_utc_ics_stage(events: List[dict], out, cache: Optional[dict] = None) -> None:
+    """Pipeline stage: the --ics calendar, as write_outputs renders it.
+
+    With cache (content key -> VEVENT block) unchanged events keep their
+    block, DTSTAMP included, like sawc_calendar.iter_ics_lines.
+    """
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    keys = event_keys(events) if cache is not None else None
+    fresh = {}
+    out.write(_ics_header())
+    for i, evt in enumerate(events):
+        if keys is None:
+            block = _ics_vevent(evt, stamp)
+        else:
+            block = fresh[keys[i]] = cache.get(keys[i]) or _ics_vevent(evt, stamp)
+        out.write("\n" + block)
+    out.write("\nEND:VCALENDAR")
+    if cache is not None:
+        cache.clear()
+        cache.update(fresh)
+
+
+def write_binary_cache(events: List[dict], args: argparse.Namespace) -> List[str]:
+    """--binary-cache: events.json.bin next to --json (sawc_events.py). Returns [its path] if written."""
+    if not args.binary_cache:
+        return []
+    with TIMINGS.stage("write"):
+        try:
+            written = write_cache(events, args.json, args.tz)
+        except ValueError as e:
+            print(f"! Binary cache not written: {e}", file=sys.stderr)
+            return []
+    return [str(cache_path(args.json))] if written else []
+
+
+def output_targets(args: argparse.Namespace) -> List[Tuple[str, str]]:
+    """(stage, path) for every output requested on the command line."""
+    targets = [("json", args.json)]
     if args.ics:
-        lines = [
-            "BEGIN:VCALENDAR",
-            "VERSION:2.0",
-            "PRODID:-//Sydney AWC//Events//EN",
-            "CALSCALE:GREGORIAN",
-            "METHOD:PUBLISH",
-        ]
-        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-        for e in events:
-            lines += [
-                "BEGIN:VEVENT",
-                f"UID:{e['id']}@sydneyawc.com",
-                f"DTSTAMP:{stamp}",
-                f"DTSTART:{to_ics_utc(datetime.fromisoformat(e['start']))}",
-                f"DTEND:{to_ics_utc(datetime.fromisoformat(e['end']))}",
-                f"SUMMARY:{escape_ics(e['title'])}",
-                f"LOCATION:{escape_ics(e.get('location',''))}",
-                f"DESCRIPTION:{escape_ics(e.get('description',''))}",
-                "END:VEVENT",
-            ]
-        lines.append("END:VCALENDAR")
-        with open(args.ics, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines))
-
-    print(f"✓ Wrote {len(events)} events to {args.json}" + (f" and {args.ics}" if args.ics else ""))
+        targets.append(("utc-ics", args.ics))
+    if args.feed:
+        targets.append(("tzid-ics", args.feed))
+    if args.next_event:
+        targets.append(("next-event", args.next_event))
+    return targets + args.out
+
+
+def publish_options(args: argparse.Namespace) -> dict:
+    """Stage and slice options from the command line."""
+    return {"tzid": args.tz, "months": args.months, "rrule": args.rrule}
+
+# ---------------------------------------------------------------------------
+# Streaming (external merge sort)
+# ---------------------------------------------------------------------------
+
+def stream_events(chunks: Iterable[pd.DataFrame], convert, cols: Dict[str, Optional[str]],
+                  tzname: str, id_mode: str, spill_dir: str) -> Iterator[dict]:
+    """Convert chunk by chunk and yield all events sorted by start.
+
+    Each chunk becomes a sorted run spilled to spill_dir as JSON lines; the
+    runs are then k-way merged. heapq.merge breaks ties by run order, so the
+    result matches a stable sort of the whole sheet.
+    """
+    runs = []
+    for chunk in chunks:
+        with TIMINGS.stage("convert"):
+            events = convert(chunk, cols, tzname, id_mode)
+        if not events:
+            continue
+        path = Path(spill_dir) / f"run-{len(runs):06d}.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(e, ensure_ascii=False) + "\n" for e in events)
+        runs.append(path)
+        del events
+
+    files = [open(path, encoding="utf-8") for path in runs]
+    try:
+        yield from heapq.merge(*(map(json.loads, f) for f in files), key=lambda e: e["start"])
+    finally:
+        for f in files:
+            f.close()
+
+# ---------------------------------------------------------------------------
+# Incremental rebuild (content-hash manifest)
+# ---------------------------------------------------------------------------
+
+def row_keys(df: pd.DataFrame, cols: Dict[str, Optional[str]]) -> List[str]:
+    """Content key for every row, hashed over the mapped cells only."""
+    used = [c for c in dict.fromkeys(cols.values()) if c]
+    cells = zip(*(df[c].tolist() for c in used))
+    return occurrence_keys([content_key(*(f"{type(v).__name__}:{v}" for v in row)) for row in cells])
+
+
+def incremental_build(df: pd.DataFrame, cols: Dict[str, Optional[str]], tzname: str, id_mode: str,
+                      cached: dict) -> Tuple[List[dict], dict, int]:
+    """Rebuild events reusing cached rows; only new/edited rows are converted.
+
+    cached maps row content keys to {"event": dict | None} from the previous
+    run. Returns (events, entries, converted) with events sorted by start, the
+    entries to store for the next run, and how many rows had to be converted.
+    """
+    keys = row_keys(df, cols)
+    changed = [i for i, k in enumerate(keys) if k not in cached]
+
+    fresh = {}
+    if changed:
+        positions, records = frame_records(df.iloc[changed], cols, tzname, id_mode)
+        fresh = {changed[p]: evt for p, evt in zip(positions, records)}
+
+    entries = {k: cached.get(k) or {"event": fresh.get(i)} for i, k in enumerate(keys)}
+    with TIMINGS.stage("sort"):
+        events = sorted((e["event"] for e in entries.values() if e["event"]), key=lambda e: e["start"])
+    return events, entries, len(changed)
+
+
+def rebuild(p: Path, args: argparse.Namespace, state: dict) -> str:
+    """Convert p and publish every output target, reusing the caches in state.
+
+    state holds the row cache (see incremental_build) and the output stages'
+    VEVENT caches; with --incremental they are loaded from the manifests on
+    first use and saved back after each build. It is updated in place, so
+    repeated calls (--watch) only re-convert edited rows and only rewrite
+    changed files.
+    Returns a one-line summary; raises ValueError for an unusable sheet.
+    """
+    with TIMINGS.stage("load"):
+        df = load_frame(p)
+    if df.empty:
+        raise ValueError("No rows found in the input sheet.")
+    with TIMINGS.stage("columns"):
+        cols = resolve_columns(df)
+    missing = [k for k in ("date", "title") if cols[k] is None]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}. Columns present: {list(df.columns)}")
+
+    params = {"tz": args.tz, "idMode": args.id_mode, "columns": cols}
+    if state.get("params") != params:  # first build, or the sheet's columns changed
+        state["params"] = params
+        with TIMINGS.stage("manifest"):
+            state["rows"] = load_manifest(manifest_path(args.json), params) if args.incremental else {}
+    with TIMINGS.stage("convert"):
+        events, state["rows"], converted = incremental_build(df, cols, args.tz, args.id_mode, state["rows"])
+        events = with_unique_ids(events, args.id_mode)  # copies: the row cache keeps the plain ids
+    del df
+
+    targets = expand_targets(output_targets(args), events)
+    options = publish_options(args)
+    caches = state.setdefault("caches", {})
+    if args.incremental:
+        with TIMINGS.stage("manifest"):
+            load_caches(targets, options, caches)
+    written = publish(events, targets, options, caches) + write_binary_cache(events, args)
+
+    if args.incremental:
+        with TIMINGS.stage("manifest"):
+            save_manifest(manifest_path(args.json), params, state["rows"])
+            save_caches(targets, options, caches)
+    return (f"{len(events)} events, {converted} rows converted; "
+            + (f"updated {', '.join(written)}" if written else "outputs unchanged"))
+
+# ---------------------------------------------------------------------------
+# Watch mode
+#
+# One long-lived process: pandas is imported once, the row and VEVENT caches
+# stay in memory between saves, and every output comes from the in-memory
+# events (nothing is re-read from disk but the sheet).
+# ---------------------------------------------------------------------------
+
+def watch(p: Path, args: argparse.Namespace) -> None:
+    """Rebuild the outputs now and after every settled change to p, until Ctrl-C."""
+    state: dict = {}
+    with FileWatcher(p, debounce=args.debounce) as watcher:
+        print(f"Watching {p} ({watcher.backend}); Ctrl-C to stop")
+        try:
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    summary = rebuild(p, args, state)
+                except Exception as e:
+                    # A half-saved or broken sheet must not stop the daemon
+                    print(f"✗ {type(e).__name__}: {e}", file=sys.stderr, flush=True)
+                else:
+                    print(f"✓ {summary} ({(time.perf_counter() - t0) * 1000:.0f} ms)", flush=True)
+                watcher.wait()
+        except KeyboardInterrupt:
+            pass
+
+# ---------------------------------------------------------------------------
+# Multiple inputs
+#
+# Each sheet is converted on its own (with the engine build() would pick),
+# then sawc_merge combines them into one list before anything is published.
+# ---------------------------------------------------------------------------
+
+def source_names(paths: List[Path]) -> List[str]:
+    """--precedence names for the inputs: the file stem, or the path if stems clash."""
+    stems = [p.stem for p in paths]
+    return [p.stem if stems.count(p.stem) == 1 else str(p) for p in paths]
+
+
+def precedence_order(names: List[str], precedence: Optional[str]) -> List[int]:
+    """Input positions, highest precedence first: the --precedence names, then the rest in argument order."""
+    order = []
+    for name in filter(None, (n.strip() for n in (precedence or "").split(","))):
+        if name not in names:
+            raise ValueError(f"--precedence: no input named {name!r} (inputs: {', '.join(names)})")
+        if names.index(name) not in order:
+            order.append(names.index(name))
+    return order + [i for i in range(len(names)) if i not in order]
+
+
+def load_events(p: Path, args: argparse.Namespace) -> List[dict]:
+    """Convert one sheet to events sorted by start."""
+    if args.engine in ("auto", "stdlib") and p.suffix.lower() == ".csv" \
+            and (args.engine == "stdlib" or p.stat().st_size <= STDLIB_MAX_BYTES):
+        try:
+            return events_from_csv(p, args.tz, args.id_mode)
+        except Unsupported as e:
+            if args.engine == "stdlib":
+                raise ValueError(f"The stdlib engine cannot convert {p} exactly ({e}); use --engine vectorized")
+    with TIMINGS.stage("load"):
+        df = load_frame(p)
+    if df.empty:
+        raise ValueError(f"No rows found in {p}.")
+    with TIMINGS.stage("columns"):
+        cols = resolve_columns(df)
+    missing = [k for k in ("date", "title") if cols[k] is None]
+    if missing:
+        raise ValueError(f"{p}: missing required columns: {missing}. Columns present: {list(df.columns)}")
+    convert = events_from_rows if args.engine == "rows" else events_from_frame
+    with TIMINGS.stage("convert"):
+        return convert(df, cols, args.tz, args.id_mode)
+
+
+def merge_report(sources: List[Source], result) -> dict:
+    """What --merge-report writes: the inputs, each merged group and the clashes kept apart."""
+    brief = lambda ev: {k: ev.get(k) for k in ("id", "title", "start", "end")}
+    return {
+        "sources": [{"name": s.name, "events": len(s.events)} for s in sources],
+        "events": len(result.events),
+        "merged": [{"into": brief(event), "members": [{"source": name} | brief(ev) for name, ev in members]}
+                   for event, members in result.groups],
+        "overlaps": [[brief(a), brief(b)] for a, b in result.overlaps],
+    }
+
+
+def build_merged(paths: List[Path], args: argparse.Namespace, status) -> None:
+    """Convert every input, merge them and publish the one event list."""
+    names = source_names(paths)
+    try:
+        sources = [Source(names[i], load_events(paths[i], args)) for i in precedence_order(names, args.precedence)]
+    except ValueError as e:
+        raise SystemExit(str(e))
+    with TIMINGS.stage("merge"):
+        result = merge_events(sources, args.similarity)
+        events = list(unique_ids(result.events))  # copies: the report's groups keep the source ids
+    renamed = sum(ev is not merged for ev, merged in zip(events, result.events))
+    written = publish(events, output_targets(args), publish_options(args))
+    written += write_binary_cache(events, args)
+    if args.merge_report:
+        with open_output(args.merge_report) as f:
+            json.dump(merge_report(sources, result), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+    rows = sum(len(s.events) for s in sources)
+    print(f"✓ Merged {rows} events from {len(sources)} inputs: {len(result.groups)} duplicate groups, "
+          f"{len(result.overlaps)} overlaps kept, {renamed} ids disambiguated", file=status)
+    print(f"✓ Wrote {len(events)} events to " + " and ".join(written), file=status)
+
+
+def with_unique_ids(events: List[dict], id_mode: str) -> List[dict]:
+    """events with deterministic ids made collision-free (sawc_merge.unique_ids); uuids already are."""
+    return list(unique_ids(events)) if id_mode == "deterministic" else events
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Generate events.json (and optional .ics) from a cleaned SAWC calendar.")
+    ap.add_argument("input_paths", nargs="+", metavar="input_path",
+                    help="Path to CSV or XLSX; several are merged into one event list")
+    ap.add_argument("--json", required=True, help="Output events.json path")
+    ap.add_argument("--ics", help="Optional output calendar.ics path")
+    ap.add_argument("--tz", default=DEFAULT_TZ, help=f"Timezone name (default: {DEFAULT_TZ})")
+    ap.add_argument("--id-mode", choices=["uuid","deterministic"], default="uuid")
+    ap.add_argument("--engine", choices=["auto","stdlib","vectorized","rows"], default="auto",
+                    help="Conversion engine (default: auto = stdlib for CSV when it can match pandas exactly, "
+                         "else vectorized; 'rows' is the original per-row loop)")
+    ap.add_argument("--stream", action="store_true",
+                    help="Convert in chunks and merge-sort via temp files to bound memory on huge sheets")
+    ap.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                    help=f"Rows per chunk with --stream (default: {DEFAULT_CHUNKSIZE})")
+    ap.add_argument("--incremental", action="store_true",
+                    help="Only re-convert rows changed since the last run (manifest stored next to --json)")
+    ap.add_argument("--feed", help="Also write the site's iCalendar feed (generate_ics.py format, "
+                                   "e.g. assets/sawc-events.ics) from the converted events")
+    ap.add_argument("--next-event", help="Also write next-event.json (the next few events) for the homepage")
+    ap.add_argument("--out", action="append", default=[], metavar="STAGE[:SLICE]=PATH",
+                    help="Also write PATH through an output stage (repeatable; stages: "
+                         f"{', '.join(STAGES)}); all outputs render from the same parsed events. "
+                         "SLICE limits it to upcoming, future, a year (YYYY), FROM..TO dates, "
+                         "or year with a {year} path for one file per year")
+    ap.add_argument("--months", type=int, default=UPCOMING_MONTHS,
+                    help=f"Months ahead in the upcoming slice (default: {UPCOMING_MONTHS}; 0 = no limit)")
+    ap.add_argument("--rrule", action="store_true",
+                    help="Fold regular monthly meetings into RRULE series in the --feed and ICS --out outputs")
+    ap.add_argument("--watch", action="store_true",
+                    help="Keep running and rebuild all outputs whenever the input file changes")
+    ap.add_argument("--debounce", type=float, default=DEBOUNCE,
+                    help=f"Seconds a burst of saves must settle before --watch rebuilds (default: {DEBOUNCE})")
+    ap.add_argument("--binary-cache", action="store_true",
+                    help="Also write events.json.bin next to --json, which generate_ics*.py and serve_feeds.py "
+                         "load instead of parsing the JSON (sawc_events.py)")
+    ap.add_argument("--precedence", metavar="NAME,...",
+                    help="With several inputs: which wins a duplicate, by file stem, highest first "
+                         "(default: argument order)")
+    ap.add_argument("--similarity", type=float, default=DEFAULT_SIMILARITY,
+                    help="With several inputs: share of title words overlapping events from different "
+                         f"inputs must have in common to merge (default: {DEFAULT_SIMILARITY})")
+    ap.add_argument("--merge-report", metavar="PATH",
+                    help="With several inputs: write the merged groups and kept overlaps as JSON")
+    add_timing_arguments(ap)
+    args = ap.parse_args(argv)
+    try:
+        args.out = [parse_target(spec) for spec in args.out]
+    except ValueError as e:
+        ap.error(str(e))
+    paths = [path for _, path in output_targets(args)]
+    if len(set(paths)) < len(paths):
+        ap.error("each output needs its own path")
+    if "-" in paths and (args.incremental or args.watch):
+        ap.error("--incremental and --watch need file outputs, not '-'")
+    status = sys.stderr if "-" in paths else sys.stdout
+    if args.stream and (args.incremental or args.watch or args.feed or args.next_event or args.out):
+        ap.error("--stream cannot be combined with --incremental, --watch, --feed, --next-event or --out")
+    if args.engine == "stdlib" and (args.incremental or args.stream or args.watch):
+        ap.error("--engine stdlib cannot be combined with --incremental, --stream or --watch")
+    if args.watch and (args.timings or args.profile):
+        ap.error("--timings and --profile time a single build, not --watch")
+    if args.binary_cache and (args.stream or args.json == "-" or args.json.endswith(".gz")):
+        ap.error("--binary-cache needs a plain --json file and cannot be combined with --stream")
+    if len(args.input_paths) > 1 and (args.incremental or args.stream or args.watch):
+        ap.error("several inputs cannot be combined with --incremental, --stream or --watch")
+    if len(args.input_paths) == 1 and (args.precedence or args.merge_report):
+        ap.error("--precedence and --merge-report need several inputs")
+    if not 0 < args.similarity <= 1:
+        ap.error("--similarity must be in (0, 1]")
+
+    inputs = [Path(path) for path in args.input_paths]
+    for p in inputs:
+        if not p.exists():
+            raise SystemExit(f"Input not found: {p}")
+    p = inputs[0]
+
+    if args.watch:
+        watch(p, args)
+        return
+
+    module = sys.modules[__name__]
+    instrument = [(module, "_ics_vevent", "vevent"), (sawc_calendar, "to_vevent", "vevent"),
+                  (sawc_calendar, "fold", "fold")]
+    with session(args, "generate_events_from_clean.py", instrument):
+        if len(inputs) > 1:
+            build_merged(inputs, args, status)
+        else:
+            build(p, args, status)
+
+
+def build(p: Path, args: argparse.Namespace, status) -> None:
+    """One conversion of p to every output (everything main() does but --watch)."""
+    engine = args.engine
+    if engine == "auto":
+        use_stdlib = p.suffix.lower() == ".csv" and not (args.incremental or args.stream) \
+            and p.stat().st_size <= STDLIB_MAX_BYTES
+        engine = "stdlib" if use_stdlib else "vectorized"
+
+    # Plain CSVs convert without importing pandas at all
+    if engine == "stdlib":
+        try:
+            events = with_unique_ids(events_from_csv(p, args.tz, args.id_mode), args.id_mode)
+        except Unsupported as e:
+            if args.engine == "stdlib":
+                raise SystemExit(f"The stdlib engine cannot convert {p} exactly ({e}); use --engine vectorized")
+        else:
+            written = publish(events, output_targets(args), publish_options(args))
+            written += write_binary_cache(events, args)
+            print(f"✓ Wrote {len(events)} events to " + " and ".join(written), file=status)
+            return
+        engine = "vectorized"
+
+    convert = events_from_rows if engine == "rows" else events_from_frame
+
+    if args.incremental:
+        try:
+            print(f"✓ {rebuild(p, args, {})}")
+        except ValueError as e:
+            raise SystemExit(str(e))
+        return
+
+    # Load data
+    with TIMINGS.stage("load"):
+        if args.stream:
+            chunks = iter_chunks(p, args.chunksize)
+            df = next(chunks, None)
+        else:
+            df = load_frame(p)
+    if df is None or df.empty:
+        raise SystemExit("No rows found in the input sheet.")
+
+    # Resolve columns (case-insensitive)
+    with TIMINGS.stage("columns"):
+        cols = resolve_columns(df)
+
+    missing = [k for k in ("date", "title") if cols[k] is None]
+    if missing:
+        raise SystemExit(f"Missing required columns: {missing}. Columns present: {list(df.columns)}")
+
+    with contextlib.ExitStack() as stack:
+        if args.stream:
+            spill_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="sawc-runs-"))
+            events = stream_events(itertools.chain([df], chunks), convert, cols, args.tz, args.id_mode, spill_dir)
+            if args.id_mode == "deterministic":
+                events = unique_ids(events)  # holds one day of the sorted stream at a time
+        else:
+            with TIMINGS.stage("convert"):
+                events = with_unique_ids(convert(df, cols, args.tz, args.id_mode), args.id_mode)
+        del df
+
+        if args.stream:
+            # One pass over the merged runs; --stream only allows --json/--ics
+            with TIMINGS.stage("write"):
+                count = write_files(events, args.json, args.ics)
+            paths = [path for _, path in output_targets(args)]
+        else:
+            paths = publish(events, output_targets(args), publish_options(args))
+            paths += write_binary_cache(events, args)
+            count = len(events)
 
+    print(f"✓ Wrote {count} events to " + " and ".join(paths), file=status)
 
 if __name__ == "__main__":
     main()
@@ -19,149 +19,97 @@ Notes:
     "miniCompetition": "",
     "comments": ""
   }
-- DTSTART/DTEND are emitted as local wall-clock times using TZID=Australia/Sydney.
+- DTSTART/DTEND are emitted as local wall-clock times using TZID=Australia/Sydney,
+  defined by a VTIMEZONE block derived from the zoneinfo database for the
+  years the feed covers (sawc_vtimezone.py, cached on disk).
+- The calendar itself is rendered by sawc_calendar.py, shared with
+  generate_ics_refactored.py; this script sets its header values and CLI.
 - DTSTAMP is emitted in UTC with 'Z' (RFC5545-compliant).
 - Lines are folded to 75 octets and text is escaped per RFC5545.
+- events.json is read incrementally and lines are streamed to a buffered
+  writer (--out - for stdout, --out feed.ics.gz for gzip), so memory stays
+  flat as the number of events grows.
+- --incremental keeps rendered VEVENTs in sawc-events.ics.manifest.json and
+  only re-renders changed events; an unchanged feed is not rewritten.
+- --rrule folds regular monthly meetings into one VEVENT with an RRULE
+  (sawc_rrule.py): cancelled dates become EXDATEs and meetings with their
+  own topic RECURRENCE-ID overrides, which shrinks multi-year feeds.
+- --upcoming and --per-year also write time-window feeds (sawc_slices.py):
+  the next --months of events, and one feed per year
+
+  python generate_ics.py --upcoming ./assets/sawc-events-upcoming.ics \
+      --per-year './assets/sawc-events-{year}.ics'
+
+- A fresh events.json.bin next to events.json (written by
+  generate_events_from_clean.py --binary-cache, see sawc_events.py) is read
+  instead of the JSON: the events come straight from the memory-mapped
+  records, with no JSON or timestamp parsing; --no-binary-cache ignores it
+- --timings [FILE] reports per-stage times and peak memory (sawc_timings.py),
+  --profile FILE dumps cProfile stats
 """
 
 from __future__ import annotations
 
 import argparse
-import datetime as dt
-import json
-import sys
-from pathlib import Path
+from typing import IO
+
+import sawc_calendar
+from sawc_calendar import Calendar, build, write_ics
+from sawc_pipeline import check_target, stage
+from sawc_slices import UPCOMING_MONTHS
+from sawc_timings import add_timing_arguments, session
 
 # ---- Config ----
 TZID = "Australia/Sydney"
 CAL_NAME = "Sydney Amateur Winemakers Club"
 CAL_DESC = "Meetings and club events for the Sydney Amateur Winemakers Club"
 PRODID  = "-//Sydney AWC//sawc-events//EN"
+CALENDAR = Calendar(TZID, CAL_NAME, CAL_DESC, PRODID)
+STAGE = "tzid-ics"
 
 
-def esc(s: str | None) -> str:
-    """Escape text for ICS fields."""
-    if s is None:
-        s = ""
-    return (
-        s.replace("\\", "\\\\")
-         .replace(";", "\\;")
-         .replace(",", "\\,")
-         .replace("\r\n", "\\n")
-         .replace("\n", "\\n")
-         .replace("\r", "\\n")
-    )
-
-
-def fold(line: str) -> str:
-    """Fold long lines to 75 octets (~75 chars for ASCII)."""
-    res = []
-    s = line
-    while len(s) > 74:
-        res.append(s[:74])
-        s = " " + s[74:]
-    res.append(s)
-    return "\r\n".join(res)
-
-
-def fmt_local(iso_str: str) -> str:
-    """
-    Parse ISO-8601 with offset, then return local wall-clock time as YYYYMMDDTHHMMSS.
-    We keep the local *clock* value and pair it with TZID in the ICS property.
-    """
-    try:
-        dt_obj = dt.datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
-    except Exception as e:
-        raise ValueError(f"Invalid ISO datetime: {iso_str!r}") from e
-    return dt_obj.strftime("%Y%m%dT%H%M%S")
-
-
-def build_description(ev: dict) -> str:
-    parts = []
-    if ev.get("description"):
-        parts.append(str(ev["description"]))
-    title = ev.get("title") or ev.get("meetingActivity") or "Event"
-    if ev.get("meetingActivity") and ev["meetingActivity"] != title:
-        parts.append(f"Activity: {ev['meetingActivity']}")
-    if ev.get("miniCompetition"):
-        parts.append(f"Mini competition: {ev['miniCompetition']}")
-    if ev.get("comments"):
-        parts.append(f"Notes: {ev['comments']}")
-    return esc("\n".join([p for p in parts if str(p).strip()]))
-
-
-def to_vevent(ev: dict, dtstamp_utc: str) -> list[str]:
-    uid = f"{(ev.get('id') or '').strip() or ev.get('title','event').strip()}@sydneyawc.com"
-    title = ev.get("title") or ev.get("meetingActivity") or "Event"
-    dtstart = fmt_local(ev["start"])
-    dtend   = fmt_local(ev["end"])
-    vevent = [
-        "BEGIN:VEVENT",
-        f"UID:{uid}",
-        f"DTSTAMP:{dtstamp_utc}Z",
-        f"DTSTART;TZID={TZID}:{dtstart}",
-        f"DTEND;TZID={TZID}:{dtend}",
-        f"SUMMARY:{esc(title)}",
-    ]
-    if ev.get("location"):
-        vevent.append(f"LOCATION:{esc(ev['location'])}")
-    desc = build_description(ev)
-    if desc:
-        vevent.append(f"DESCRIPTION:{desc}")
-    vevent.append("END:VEVENT")
-    return [fold(l) for l in vevent]
-
-
-def generate_ics(events: list[dict]) -> str:
-    now_utc = dt.datetime.utcnow().strftime("%Y%m%dT%H%M%S")
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        f"PRODID:{PRODID}",
-        "CALSCALE:GREGORIAN",
-        f"X-WR-CALNAME:{esc(CAL_NAME)}",
-        f"X-WR-CALDESC:{esc(CAL_DESC)}",
-        f"X-WR-TIMEZONE:{TZID}",
-    ]
-    for ev in events:
-        for required in ("start", "end"):
-            if required not in ev or not ev[required]:
-                raise ValueError(f"Event missing required field: {required}\n{ev}")
-        lines.extend(to_vevent(ev, now_utc))
-    lines.append("END:VCALENDAR")
-    return "\r\n".join(lines) + "\r\n"
+def generate_ics(events: list[dict], cache: dict | None = None, tzid: str = TZID, rrule: bool = False) -> str:
+    """This script's calendar as one string (see sawc_calendar.iter_ics_lines)."""
+    return sawc_calendar.generate_ics(events, CALENDAR._replace(tzid=tzid), cache, rrule)
+
+
+@stage(STAGE, newline="", options={"tzid": TZID, "rrule": False}, cache_params=("tzid",))
+def write_stage(events: list[dict], out: IO[str], cache: dict | None = None, tzid: str = TZID,
+                rrule: bool = False) -> None:
+    """Pipeline stage: this script's format, from the in-memory events."""
+    write_ics(out, events, CALENDAR._replace(tzid=tzid), cache, rrule)
 
 
 def main(argv=None) -> int:
     p = argparse.ArgumentParser(description="Generate an .ics from events.json")
     p.add_argument("--in", dest="in_path", default="./assets/events.json", help="Path to events.json")
-    p.add_argument("--out", dest="out_path", default="./assets/sawc-events.ics", help="Path to write .ics")
+    p.add_argument("--out", dest="out_path", default="./assets/sawc-events.ics",
+                   help="Path to write .ics ('-' for stdout, *.gz to gzip)")
+    p.add_argument("--incremental", action="store_true", help="Re-render only changed events (manifest next to --out)")
+    p.add_argument("--upcoming", help="Also write a feed of the events in the next --months")
+    p.add_argument("--per-year", metavar="TEMPLATE",
+                   help="Also write one feed per year to TEMPLATE, which contains {year}")
+    p.add_argument("--months", type=int, default=UPCOMING_MONTHS,
+                   help=f"Months ahead in the --upcoming feed (default: {UPCOMING_MONTHS}; 0 = no limit)")
+    p.add_argument("--rrule", action="store_true",
+                   help="Fold regular monthly meetings into RRULE series (cancellations become EXDATEs)")
+    p.add_argument("--no-binary-cache", action="store_true",
+                   help="Parse events.json even if a fresh events.json.bin (sawc_events.py) is next to it")
+    add_timing_arguments(p)
     args = p.parse_args(argv)
 
-    in_path = Path(args.in_path)
-    out_path = Path(args.out_path)
-    if not in_path.exists():
-        print(f"ERROR: {in_path} not found", file=sys.stderr)
-        return 2
-
-    try:
-        events = json.loads(in_path.read_text(encoding="utf-8"))
-        if not isinstance(events, list):
-            raise ValueError("Root of JSON must be a list of events")
-    except Exception as e:
-        print(f"ERROR: Failed to read/parse {in_path}: {e}", file=sys.stderr)
-        return 3
-
+    slices = [(f"{STAGE}:{part}", path) for part, path in (("upcoming", args.upcoming), ("year", args.per_year))
+              if path]
     try:
-        ics = generate_ics(events)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(ics, encoding="utf-8", newline="")
-    except Exception as e:
-        print(f"ERROR: Failed to generate/write ICS: {e}", file=sys.stderr)
-        return 4
-
-    print(f"Wrote {out_path} with {len(events)} events.")
-    return 0
+        for name, path in slices:
+            check_target(name, path)
+    except ValueError as e:
+        p.error(str(e))
+    if args.incremental and "-" in [args.out_path, *(path for _, path in slices)]:
+        p.error("--incremental needs file outputs, not '-'")
+
+    with session(args, "generate_ics.py", [(sawc_calendar, "to_vevent", "vevent"), (sawc_calendar, "fold", "fold")]):
+        return build(args, slices, CALENDAR, STAGE)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+"""
+ingest_results.py — Build one show year of results.json from judging sheets
+
+Usage:
+  python assets/ingest_results.py 2026 "Judging 2026.xlsx"
+  python assets/ingest_results.py 2026 sheets/*.csv --start 2026-09-26 --end 2026-09-27
+  python assets/ingest_results.py 2026 judging.csv --dry-run     # check the sheets, write nothing
+
+Reads the judges' score sheets (CSV or XLSX, one row per entry; several
+sheets, e.g. one per class or per table, are concatenated) and replaces that
+year in assets/data/results.json. Columns are found by name like
+generate_events_from_clean.py does (ALIASES, sawc_sheets.find_col); only the
+class code, the entrant and either a score or the colour/aroma/taste
+components are required.
+
+The columns are processed as whole arrays:
+
+  Score        the sheet's score out of MAX_SCORE, or the sum of the
+               colour/aroma/taste components where it is blank
+  Score100     Score scaled to 100
+  Medal        from MEDAL_CUTOFFS (No Award below Highly Commended; none
+               for unjudged entries)
+  rank_in_class  1 = best score in the class (ties share a rank)
+
+Disqualified entries (a truthy disqualified/DQ column) keep their scores but
+get No Award, no rank and no derived trophies.
+
+Class codes and entrant names are resolved through hash indexes built from
+every year already in results.json, so entrant ids stay stable across years
+and a class keeps its name and sort order. A new class needs a class name
+column; a new entrant gets an "entrant-<slug>" id. Entries without an entry
+number are numbered in sheet order; exhibit numbers default to
+"<class code>-<entry number, 3 digits>".
+
+Awards: the sheet's trophy column (names separated by ";" or "|") is copied
+into judging.trophies, and every named trophy except best in class becomes an
+award. Unless the sheet already names them, Best in Show goes to the highest
+Score overall and Best in Class to the highest Score in each class with at
+least a Bronze medal (ties go to the lower entry number).
+
+A new year copies show details and classes from the latest earlier year; an
+existing year keeps its show details and judges. "version" is bumped to
+today's date only when the year's data changes. The merged file is checked
+with build_results_index.validate before anything is written; every problem
+is listed. Exit status: 0 ok, 2 invalid input.
+
+Afterwards run build_results_index.py and build_results_stats.py to refresh
+the shards and statistics the page loads.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import math
+import re
+import sys
+import time
+import unicodedata
+import uuid
+from datetime import date
+from json.encoder import encode_basestring
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from build_results_index import MAX_SCORE, MEDAL_CUTOFFS, NO_AWARD, ResultsError, validate
+from sawc_manifest import write_if_changed
+from sawc_sheets import find_col
+
+BEST_IN_CLASS_MEDALS = ("Gold", "Silver", "Bronze")
+CODE_WIDTH = 2      # numeric class codes are zero-padded: 9 -> "09"
+EXHIBIT_WIDTH = 3   # "18-031"
+MAX_PROBLEMS = 20   # per check, so a bad column doesn't bury the rest
+DEFAULT_COUNTRY = "Australia"
+SHOW_NAMESPACE = uuid.UUID("d1d9a2b6-7b1f-4f0a-9f2e-4df8a9d4e3d0")
+
+# Column aliases (lowercased comparison)
+ALIASES = {
+    "class": {"class", "class code", "class no", "class number", "class #"},
+    "className": {"class name", "class description", "category"},
+    "entrant": {"entrant", "winemaker", "exhibitor", "entrant name", "name"},
+    "club": {"club"},
+    "entry": {"entry", "entry no", "entry number", "entry #", "entry_number"},
+    "exhibit": {"exhibit", "exhibit no", "exhibit number", "exhibit #", "exhibit_number"},
+    "style": {"style", "wine style", "variety", "fruit"},
+    "wineName": {"wine", "wine name", "label"},
+    "vintage": {"vintage"},
+    "country": {"country"},
+    "region": {"region"},
+    "colour": {"colour", "color", "appearance"},
+    "aroma": {"aroma", "bouquet", "nose"},
+    "taste": {"taste", "palate", "flavour", "flavor"},
+    "score": {"score", "total", "total score", "points", "score /20"},
+    "trophies": {"trophy", "trophies", "award", "awards"},
+    "disqualified": {"disqualified", "dq"},
+}
+COMPONENTS = ("colour", "aroma", "taste")
+# Field order of each entry in results.json (nested objects list their keys)
+ENTRY_SHAPE = {
+    "id": None, "class_id": None, "entrant_id": None, "exhibit_number": None,
+    "wine": ("name", "vintage", "style", "colour", "region", "country"),
+    "judging": ("Score", "Score100", "Medal", "flight", "panel", "rank_in_class", "trophies"),
+    "components": COMPONENTS,
+    "audit": ("received_at", "checked_by", "disqualified"),
+}
+_TRUE = {"y", "yes", "true", "1", "x", "dq"}
+_TROPHY_SPLIT = re.compile(r"\s*[;|]\s*")
+
+
+# ---------------------------------------------------------------------------
+# Sheets
+# ---------------------------------------------------------------------------
+
+def read_sheet(p: Path) -> pd.DataFrame:
+    """Every cell of a CSV or Excel sheet as text ("" for blanks).
+
+    Reading as text keeps class codes like "09" intact; numbers are parsed
+    per column afterwards.
+    """
+    if p.suffix.lower() == ".csv":
+        return pd.read_csv(p, dtype=str, keep_default_na=False)
+    return pd.read_excel(p, dtype=str).fillna("")
+
+
+def load_sheets(paths: list[Path], problems: list[str]) -> pd.DataFrame:
+    """One frame with a column per ALIASES key plus the source sheet and row."""
+    frames = []
+    for p in paths:
+        df = read_sheet(p)
+        cols = {key: find_col(df, ALIASES, key) for key in ALIASES}
+        missing = [key for key in ("class", "entrant") if cols[key] is None]
+        if cols["score"] is None and None in (cols[c] for c in COMPONENTS):
+            missing.append("score (or colour, aroma and taste)")
+        if missing:
+            problems.append(f"{p.name}: no column for {', '.join(missing)} (have: {', '.join(map(str, df.columns))})")
+            continue
+        frame = pd.DataFrame({key: df[col].str.strip() if col is not None else "" for key, col in cols.items()},
+                             index=df.index)
+        frame["sheet"] = p.name
+        frame["row"] = np.arange(2, len(df) + 2)  # spreadsheet row, after the header
+        frames.append(frame.reset_index(drop=True))
+    if not frames:
+        return pd.DataFrame(columns=[*ALIASES, "sheet", "row"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _report(rows: pd.DataFrame, message: str, problems: list[str]) -> None:
+    """Append message for each flagged row (at most MAX_PROBLEMS of them)."""
+    for sheet, row, value in rows.head(MAX_PROBLEMS).itertuples(index=False):
+        problems.append(f"{sheet}:{row}: {message}: {value!r}")
+    if len(rows) > MAX_PROBLEMS:
+        problems.append(f"... and {len(rows) - MAX_PROBLEMS} more rows: {message}")
+
+
+def _numbers(sheet: pd.DataFrame, key: str, problems: list[str]) -> np.ndarray:
+    """Column key as float64, blank cells as NaN; anything else non-numeric is a problem."""
+    text = sheet[key]
+    values = pd.to_numeric(text.where(text != ""), errors="coerce")
+    bad = values.isna() & (text != "")
+    if bad.any():
+        _report(sheet.loc[bad, ["sheet", "row", key]], f"{key} is not a number", problems)
+    return values.to_numpy(dtype=np.float64)
+
+
+# ---------------------------------------------------------------------------
+# Scores and medals (vectorized)
+# ---------------------------------------------------------------------------
+
+def medals(score: np.ndarray) -> np.ndarray:
+    """Medal name for each Score (None where unjudged)."""
+    names = np.select([score >= cutoff for _, cutoff in MEDAL_CUTOFFS],
+                      [name for name, _ in MEDAL_CUTOFFS], default=NO_AWARD).astype(object)
+    names[np.isnan(score)] = None
+    return names
+
+
+def score_columns(sheet: pd.DataFrame, problems: list[str]) -> dict[str, np.ndarray]:
+    """Score, Score100, Medal, the components and the disqualified flag for every row."""
+    parts = {c: _numbers(sheet, c, problems) for c in COMPONENTS}
+    score = _numbers(sheet, "score", problems)
+    score = np.where(np.isnan(score), parts["colour"] + parts["aroma"] + parts["taste"], score)
+    out_of_range = (score < 0) | (score > MAX_SCORE)
+    if out_of_range.any():
+        _report(sheet.loc[out_of_range, ["sheet", "row", "score"]], f"score outside 0-{MAX_SCORE}", problems)
+    disqualified = sheet["disqualified"].str.lower().isin(_TRUE).to_numpy()
+    medal = medals(score)
+    medal[disqualified & ~np.isnan(score)] = NO_AWARD
+    return {
+        "Score": score,
+        "Score100": score * (100 / MAX_SCORE),
+        "Medal": medal,
+        **parts,
+        "disqualified": disqualified,
+    }
+
+
+def _class_rank(scores: dict, codes: np.ndarray) -> np.ndarray:
+    ranked = np.where(scores["disqualified"], np.nan, scores["Score"])
+    return pd.Series(ranked).groupby(codes).rank(method="min", ascending=False).to_numpy()
+
+
+# ---------------------------------------------------------------------------
+# Hash indexes over the existing years
+# ---------------------------------------------------------------------------
+
+def slugify(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
+    s = s.lower().strip()
+    s = re.sub(r"[^\w\s-]", "", s)
+    s = re.sub(r"[\s_-]+", "-", s)
+    return s.strip("-")
+
+
+def _name_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def normalize_codes(codes: pd.Series) -> pd.Series:
+    """Zero-pad numeric class codes ("9" -> "09"); others are kept as written."""
+    return codes.where(~codes.str.isdigit(), codes.str.zfill(CODE_WIDTH))
+
+
+def entrant_index(results: dict) -> dict[str, dict]:
+    """Lower-cased display name -> entrant record, latest year winning."""
+    index = {}
+    for key in sorted(results):
+        for entrant in results[key].get("entrants", []):
+            name = entrant.get("display_name") or entrant.get("name")
+            if name:
+                index[_name_key(name)] = entrant
+    return index
+
+
+def resolve_classes(sheet: pd.DataFrame, year: int, template: list[dict],
+                    problems: list[str]) -> tuple[np.ndarray, list[dict]]:
+    """Class code per row (normalized) and the year's class list.
+
+    template is the classes of this year (if already published) or of the
+    latest earlier year, kept in their order; sheet codes that aren't in it
+    are appended as new classes.
+    """
+    classes = {}
+    for cls in template:
+        code = str(cls["code"])
+        classes[code] = {**cls, "id": f"cls-{year}-{code}"}
+    codes = normalize_codes(sheet["class"])
+    positions, uniques = pd.factorize(codes)
+    names = sheet["className"].groupby(positions).first() if len(sheet) else pd.Series(dtype=str)
+    next_order = max((c["sort_order"] for c in classes.values() if isinstance(c.get("sort_order"), (int, float))),
+                     default=0) + 1
+    for i, code in enumerate(uniques):
+        if code in classes:
+            continue
+        if not code or not names.iloc[i]:
+            rows = sheet.loc[codes == code, ["sheet", "row", "class"]]
+            _report(rows, "blank class code" if not code else "unknown class code (add a class name column)", problems)
+            continue
+        classes[code] = {"id": f"cls-{year}-{code}", "code": code, "name": names.iloc[i], "description": "",
+                         "style": None, "sort_order": int(code) if code.isdigit() else next_order}
+        next_order += 1
+    return codes.to_numpy(dtype=object), list(classes.values())
+
+
+def resolve_entrants(sheet: pd.DataFrame, known: dict[str, dict],
+                     problems: list[str]) -> tuple[np.ndarray, list[dict]]:
+    """Entrant id per row and the year's entrant list, in sheet order; a blank name is a problem."""
+    positions, uniques = pd.factorize(sheet["entrant"])
+    clubs = sheet["club"].groupby(positions).first() if len(sheet) else pd.Series(dtype=str)
+    taken = {e["id"] for e in known.values()}
+    by_key: dict[str, dict] = {}
+    ids = []
+    for i, name in enumerate(uniques):
+        if not name:
+            _report(sheet.loc[sheet["entrant"] == name, ["sheet", "row", "entrant"]], "blank entrant name", problems)
+            ids.append(None)
+            continue
+        key = _name_key(name)
+        if key not in by_key:
+            entrant = known.get(key)
+            if entrant is None:
+                base = f"entrant-{slugify(name) or 'unnamed'}"
+                entrant_id, n = base, 2
+                while entrant_id in taken:
+                    entrant_id, n = f"{base}-{n}", n + 1
+                taken.add(entrant_id)
+                entrant = {"id": entrant_id, "display_name": " ".join(name.split()), "club": clubs.iloc[i] or None}
+            elif clubs.iloc[i] and clubs.iloc[i] != entrant.get("club"):
+                entrant = {**entrant, "club": clubs.iloc[i]}
+            by_key[key] = entrant
+        ids.append(by_key[key]["id"])
+    return np.array(ids, dtype=object)[positions] if len(sheet) else np.array([], dtype=object), list(by_key.values())
+
+
+def entry_numbers(sheet: pd.DataFrame, problems: list[str]) -> np.ndarray:
+    """Entry number per row: the sheet's, or 1..n in sheet order when the column is blank."""
+    numbers = _numbers(sheet, "entry", problems)
+    if np.isnan(numbers).all():
+        return np.arange(1, len(sheet) + 1)
+    bad = np.isnan(numbers) | (numbers < 1) | (numbers % 1 != 0)
+    if bad.any():
+        _report(sheet.loc[bad, ["sheet", "row", "entry"]], "entry number must be a positive whole number", problems)
+    numbers = np.nan_to_num(numbers).astype(np.int64)
+    repeated = pd.Series(numbers).duplicated(keep=False).to_numpy() & ~bad
+    if repeated.any():
+        _report(sheet.loc[repeated, ["sheet", "row", "entry"]], "entry number used more than once", problems)
+    return numbers
+
+
+# ---------------------------------------------------------------------------
+# Awards
+# ---------------------------------------------------------------------------
+
+def sheet_trophies(sheet: pd.DataFrame) -> list[list[str]]:
+    """judging.trophies per row from the trophy column."""
+    trophies = [[] for _ in range(len(sheet))]
+    for i in np.flatnonzero(sheet["trophies"].to_numpy() != ""):
+        trophies[i] = [t for t in _TROPHY_SPLIT.split(sheet["trophies"].iat[i]) if t]
+    return trophies
+
+
+def _best(order_score: np.ndarray, numbers: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Row positions of mask sorted best first: highest score, then lowest entry number."""
+    rows = np.flatnonzero(mask)
+    return rows[np.lexsort((numbers[rows], -order_score[rows]))]
+
+
+def derive_awards(year: int, entry_ids: list[str], trophies: list[list[str]], scores: dict,
+                  codes: np.ndarray, numbers: np.ndarray, problems: list[str]) -> list[dict]:
+    """Add Best in Show / Best in Class trophies where the sheet names none; return the award list."""
+    score = scores["Score"]
+    judged = ~np.isnan(score) & ~scores["disqualified"]
+    flat = [(i, t) for i, names in enumerate(trophies) for t in names]
+    has_bis = any("best in show" in t.lower() for _, t in flat)
+    if not has_bis and judged.any():
+        trophies[_best(score, numbers, judged)[0]].append("Best in Show")
+
+    bic_classes = {codes[i] for i, t in flat if "best in class" in t.lower()}
+    eligible = judged & np.isin(scores["Medal"], BEST_IN_CLASS_MEDALS) & ~np.isin(codes, list(bic_classes))
+    ranked = _best(score, numbers, eligible)
+    firsts = ranked[~pd.Series(codes[ranked]).duplicated().to_numpy()]
+    for i in firsts:
+        trophies[i].append("Best in Class")
+
+    awards: dict[str, dict] = {}
+    for i, names in enumerate(trophies):
+        for name in names:
+            if "best in class" in name.lower():
+                continue
+            award_id = f"award-{year}-{slugify(name)}"
+            if award_id in awards:
+                problems.append(f"trophy {name!r} is awarded to both {awards[award_id]['winner_entry_id']} "
+                                f"and {entry_ids[i]}")
+                continue
+            criteria = "Highest Score across all classes" if name == "Best in Show" and not has_bis else ""
+            awards[award_id] = {"id": award_id, "name": name, "criteria": criteria, "winner_entry_id": entry_ids[i]}
+    return sorted(awards.values(), key=lambda a: (a["name"] != "Best in Show", a["name"]))
+
+
+# ---------------------------------------------------------------------------
+# The year payload
+# ---------------------------------------------------------------------------
+
+def _ordinal(n: int) -> str:
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+def new_show(year: int, previous: dict | None) -> dict:
+    """Show details for a year not yet in results.json, carried over from the previous show."""
+    show = copy.deepcopy(previous or {})
+    if isinstance(show.get("edition_number"), int) and isinstance(show.get("year"), int):
+        show["edition_number"] += year - show["year"]
+        show["edition"] = f"{_ordinal(show['edition_number'])} Annual Wine Show"
+    show["id"] = str(uuid.uuid5(SHOW_NAMESPACE, str(year)))
+    show["year"] = year
+    show["date_range"] = {"start": None, "end": None}
+    return show
+
+
+def _none(values: np.ndarray, cast=float) -> list:
+    return [None if v != v else cast(v) for v in values.tolist()]
+
+
+def build_year(year: int, sheet: pd.DataFrame, results: dict, problems: list[str], *,
+               country: str = DEFAULT_COUNTRY, start: str | None = None, end: str | None = None) -> dict:
+    """The results.json payload for year from the concatenated sheets.
+
+    start/end (ISO dates) set show.date_range; problems collects every error.
+    """
+    key = str(year)
+    existing = results.get(key)
+    earlier = [k for k in sorted(results) if k < key]
+    previous = results[earlier[-1]] if earlier else (results[max(results)] if results else None)
+    template = (existing or previous or {}).get("classes", [])
+
+    codes, classes = resolve_classes(sheet, year, template, problems)
+    entrant_ids, entrants = resolve_entrants(sheet, entrant_index(results), problems)
+    numbers = entry_numbers(sheet, problems)
+    scores = score_columns(sheet, problems)
+    vintages = _numbers(sheet, "vintage", problems)
+    if problems:
+        return {}
+
+    number_text = pd.Series(numbers, dtype=str)
+    entry_ids = ("entry-" + key + "-" + number_text).tolist()
+    exhibits = sheet["exhibit"].where(sheet["exhibit"] != "",
+                                      pd.Series(codes, dtype=str) + "-" + number_text.str.zfill(EXHIBIT_WIDTH))
+    trophies = sheet_trophies(sheet)
+    awards = derive_awards(year, entry_ids, trophies, scores, codes, numbers, problems)
+    class_ids = {str(c["code"]): c["id"] for c in classes}
+
+    entries = [
+        {
+            "id": entry_id,
+            "class_id": class_ids[code],
+            "entrant_id": entrant_id,
+            "exhibit_number": exhibit,
+            "wine": {"name": name or None, "vintage": vintage, "style": style or None, "colour": None,
+                     "region": region or None, "country": wine_country or country},
+            "judging": {"Score": s, "Score100": s100, "Medal": medal, "flight": None, "panel": None,
+                        "rank_in_class": rank, "trophies": names},
+            "components": {"colour": colour, "aroma": aroma, "taste": taste},
+            "audit": {"received_at": None, "checked_by": None, "disqualified": dq},
+        }
+        for (entry_id, code, entrant_id, exhibit, name, vintage, style, region, wine_country,
+             s, s100, medal, rank, names, colour, aroma, taste, dq) in zip(
+            entry_ids, codes.tolist(), entrant_ids.tolist(), exhibits.tolist(), sheet["wineName"].tolist(),
+            _none(vintages, int), sheet["style"].tolist(), sheet["region"].tolist(), sheet["country"].tolist(),
+            _none(scores["Score"]), _none(scores["Score100"]), scores["Medal"].tolist(),
+            _none(_class_rank(scores, codes), int), trophies,
+            *(_none(scores[c]) for c in COMPONENTS), scores["disqualified"].tolist())
+    ]
+
+    show = existing["show"] if existing else new_show(year, (previous or {}).get("show"))
+    if start or end:
+        dates = show.get("date_range") or {}
+        show = {**show, "date_range": {"start": start or dates.get("start"), "end": end or dates.get("end")}}
+    payload = {
+        "show": show,
+        "classes": classes,
+        "judges": existing.get("judges", []) if existing else [],
+        "entrants": entrants,
+        "entries": entries,
+        "awards": awards,
+        "version": existing.get("version") if existing else None,
+    }
+    if payload != existing:
+        payload["version"] = date.today().strftime("%Y.%m.%d")
+    return payload
+
+
+# ---------------------------------------------------------------------------
+# Writing results.json
+# ---------------------------------------------------------------------------
+
+def _float(value: float) -> str:
+    if not math.isfinite(value):
+        raise TypeError("NaN/Infinity")  # json.dumps spells these its own way
+    return float.__repr__(value)
+
+
+_SCALARS = {str: encode_basestring, float: _float, int: int.__repr__,
+            bool: lambda v: "true" if v else "false", type(None): lambda v: "null"}
+_PAD = " " * 6  # entries sit at depth 3: year -> "entries" -> entry
+
+
+def _entry_template() -> str:
+    lines = []
+    for key, fields in ENTRY_SHAPE.items():
+        if fields is None:
+            lines.append(f"{_PAD}  {encode_basestring(key)}: {{}}")
+        else:
+            inner = ",\n".join(f"{_PAD}    {encode_basestring(f)}: {{}}" for f in fields)
+            lines.append(f"{_PAD}  {encode_basestring(key)}: {{{{\n{inner}\n{_PAD}  }}}}")
+    return f"{_PAD}{{{{\n" + ",\n".join(lines) + f"\n{_PAD}}}}}"
+
+
+ENTRY_TEMPLATE = _entry_template()
+_TOP_FIELDS = tuple(k for k, fields in ENTRY_SHAPE.items() if fields is None)
+_NESTED = tuple((k, fields) for k, fields in ENTRY_SHAPE.items() if fields)
+
+
+def _json_value(value) -> str:
+    if type(value) is list:  # judging.trophies, a list of strings
+        if not value:
+            return "[]"
+        return "[\n" + ",\n".join(f"{_PAD}      {_SCALARS[type(v)](v)}" for v in value) + f"\n{_PAD}    ]"
+    return _SCALARS[type(value)](value)
+
+
+def _entry_json(entry: dict) -> str:
+    """One entries item, indented as json.dumps(results, indent=2) would."""
+    try:
+        if tuple(entry) != tuple(ENTRY_SHAPE):
+            raise TypeError("not an ingested entry")
+        values = [_json_value(entry[k]) for k in _TOP_FIELDS]
+        for key, fields in _NESTED:
+            part = entry[key]
+            if tuple(part) != fields:
+                raise TypeError("not an ingested entry")
+            values += [_json_value(v) for v in part.values()]
+        return ENTRY_TEMPLATE.format(*values)
+    except (KeyError, TypeError):
+        # Hand-edited shape or values the template doesn't cover (nested objects, NaN)
+        return _PAD + json.dumps(entry, ensure_ascii=False, indent=2).replace("\n", "\n" + _PAD)
+
+
+def render_results(results: dict) -> str:
+    """results.json text, byte for byte json.dumps(results, ensure_ascii=False, indent=2).
+
+    json.dumps falls back to its pure-Python encoder when indent is set, which
+    takes seconds for 100k entries; the entries (nearly all of the file) are
+    filled into a fixed template instead and spliced into the dump of the rest.
+    """
+    skeleton, bodies = {}, {}
+    for key, payload in results.items():
+        entries = payload.get("entries") if isinstance(payload, dict) else None
+        if isinstance(entries, list) and entries:
+            token = f"\0entries {key}\0"
+            bodies[json.dumps(token)] = "[\n" + ",\n".join([_entry_json(e) for e in entries]) + "\n    ]"
+            payload = {**payload, "entries": token}
+        skeleton[key] = payload
+    text = json.dumps(skeleton, ensure_ascii=False, indent=2)
+    for token, body in bodies.items():
+        text = text.replace(token, body, 1)
+    return text
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Build a show year of results.json from judging CSV/XLSX sheets")
+    ap.add_argument("year", type=int, help="Show year to (re)build")
+    ap.add_argument("sheets", nargs="+", help="Judging sheets (CSV or XLSX), one row per entry")
+    ap.add_argument("--results", default="./assets/data/results.json", help="results.json to merge the year into")
+    ap.add_argument("--start", help="Show start date (YYYY-MM-DD)")
+    ap.add_argument("--end", help="Show end date (YYYY-MM-DD)")
+    ap.add_argument("--country", default=DEFAULT_COUNTRY, help="wine.country when the sheet has no country column")
+    ap.add_argument("--dry-run", action="store_true", help="Check the sheets and report, write nothing")
+    args = ap.parse_args(argv)
+
+    results_path = Path(args.results)
+    t0 = time.perf_counter()
+    try:
+        results = json.loads(results_path.read_text(encoding="utf-8")) if results_path.exists() else {}
+        validate(results)
+        for d in (args.start, args.end):
+            if d:
+                date.fromisoformat(d)
+        problems: list[str] = []
+        sheet = load_sheets([Path(p) for p in args.sheets], problems)
+        if not problems:
+            payload = build_year(args.year, sheet, results, problems,
+                                 country=args.country, start=args.start, end=args.end)
+        if problems:
+            raise ResultsError("\n".join(problems))
+        merged = {**results, str(args.year): payload}
+        merged = {k: merged[k] for k in sorted(merged, reverse=True)}
+        validate({str(args.year): payload})
+    except (OSError, ValueError) as e:
+        # json.JSONDecodeError, ResultsError and bad --start/--end dates are ValueErrors
+        print(f"ERROR: could not build {args.year}:\n{e}", file=sys.stderr)
+        return 2
+
+    entries = payload["entries"]
+    medal_counts = pd.Series([e["judging"]["Medal"] for e in entries], dtype=object).value_counts()
+    summary = (f"{args.year}: {len(entries)} entries, {len(payload['entrants'])} entrants, "
+               f"{len(payload['classes'])} classes, {len(payload['awards'])} awards; "
+               + ", ".join(f"{n} {m}" for m, n in medal_counts.items()))
+    if args.dry_run:
+        print(f"{summary} (dry run, {time.perf_counter() - t0:.2f} s)")
+        return 0
+    text = render_results(merged)
+    written = write_if_changed(results_path, text, newline="")
+    print(f"{summary}; {'updated' if written else 'unchanged'} {results_path} in {time.perf_counter() - t0:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,29 +1,61 @@
 (function () {
   const DATA_BASE_PATH = '/assets/data';
-  const RESULTS_DATA_URL = `${DATA_BASE_PATH}/results.json`;
+  const RESULTS_INDEX_URL = `${DATA_BASE_PATH}/results/index.json`;
   const STATE = {
+    yearIndex: {},
     resultsByYear: {},
+    searchIndexByYear: {},
     year: null,
     classNo: '',
     winemakerKey: '',
     search: ''
   };
+  // Resolves once the selected year's data is loaded; the filters wait for it
+  let ready = Promise.resolve();
 
   const refs = {};
+  const pendingSearchIndexes = {};
 
   document.addEventListener('DOMContentLoaded', init);
 
   async function init() {
     cacheDom();
     attachEventListeners();
-    try {
-      const resultsData = await fetchJson(RESULTS_DATA_URL);
-      STATE.resultsByYear = buildYearCache(resultsData || {});
-      initYearSelect();
-    } catch (error) {
+    const prerendered = readPrerenderedState();
+    ready = (async () => {
+      const resultsIndex = await fetchJson(RESULTS_INDEX_URL);
+      STATE.yearIndex = buildYearIndex(resultsIndex || {});
+      if (prerendered) {
+        // The table is already on the page: only load the data the filters need
+        await loadYear(STATE.year);
+        pushDataLayer('results_view', {});
+        return;
+      }
+      await initYearSelect();
+    })().catch((error) => {
       console.error('Unable to load results data', error);
       renderErrorState();
+    });
+    await ready;
+  }
+
+  // Pages written by assets/build_pages.py arrive with the selects filled in
+  // and the entries of one year (and class or winemaker) rendered. Keep that
+  // markup and take the filters from the selects, unless the URL asks for a
+  // different view, which is then rendered as usual.
+  function readPrerenderedState() {
+    const year = parseInt(refs.yearSelect?.value, 10);
+    if (Number.isNaN(year)) {
+      return false;
     }
+    const params = new URLSearchParams(window.location.search);
+    if ((params.has('year') && parseInt(params.get('year'), 10) !== year) || params.get('winemaker')) {
+      return false;
+    }
+    STATE.year = year;
+    STATE.classNo = refs.classSelect?.value || '';
+    STATE.winemakerKey = refs.winemakerSelect?.value || '';
+    return true;
   }
 
   function cacheDom() {
@@ -40,13 +72,15 @@
 
   function attachEventListeners() {
     refs.yearSelect?.addEventListener('change', onYearChange);
-    refs.classSelect?.addEventListener('change', (event) => {
+    refs.classSelect?.addEventListener('change', async (event) => {
       STATE.classNo = event.target.value;
+      await ready;
       renderEntries();
       pushDataLayer('filter_change', { classNo: STATE.classNo || null, winemaker: STATE.winemakerKey || null });
     });
-    refs.winemakerSelect?.addEventListener('change', (event) => {
+    refs.winemakerSelect?.addEventListener('change', async (event) => {
       STATE.winemakerKey = event.target.value;
+      await ready;
       renderEntries();
       updateUrlQuery();
       updateJsonLd();
@@ -55,22 +89,31 @@
     refs.searchBox?.addEventListener('input', onSearchInput);
   }
 
-  function onSearchInput(event) {
+  async function onSearchInput(event) {
     STATE.search = event.target.value.trim();
+    await ready;
+    if (STATE.search) {
+      try {
+        await loadSearchIndex(STATE.year);
+      } catch (error) {
+        // Without the index renderEntries falls back to scanning every entry
+        console.error('Unable to load the search index', error);
+      }
+    }
     renderEntries();
     pushDataLayer('search', { query: STATE.search || null });
   }
 
-  async function fetchJson(url) {
-    const response = await fetch(url, { cache: 'no-cache' });
+  async function fetchJson(url, cacheMode = 'no-cache') {
+    const response = await fetch(url, { cache: cacheMode });
     if (!response.ok) {
       throw new Error(`HTTP ${response.status} for ${url}`);
     }
     return response.json();
   }
 
-  function initYearSelect() {
-    const years = Object.keys(STATE.resultsByYear)
+  async function initYearSelect() {
+    const years = Object.keys(STATE.yearIndex)
       .map((year) => parseInt(year, 10))
       .filter((value) => !Number.isNaN(value))
       .sort((a, b) => b - a);
@@ -89,6 +132,7 @@
       .join('');
 
     STATE.year = defaultYear;
+    await loadYear(defaultYear);
     const winemakerParam = params.get('winemaker');
     if (winemakerParam) {
       STATE.winemakerKey = resolveWinemakerKeyFromQuery(winemakerParam, STATE.year);
@@ -97,11 +141,12 @@
     pushDataLayer('results_view', {});
   }
 
-  function onYearChange(event) {
+  async function onYearChange(event) {
     const selectedYear = parseInt(event.target.value, 10);
     if (Number.isNaN(selectedYear)) {
       return;
     }
+    await ready;
     STATE.year = selectedYear;
     STATE.classNo = '';
     refs.classSelect.value = '';
@@ -111,6 +156,16 @@
     }
     refs.searchBox.value = '';
     STATE.search = '';
+    try {
+      await loadYear(selectedYear);
+    } catch (error) {
+      console.error(`Unable to load results for ${selectedYear}`, error);
+      renderErrorState();
+      return;
+    }
+    if (STATE.year !== selectedYear) {
+      return; // another year was picked while this one loaded
+    }
     updateYearDependentUi();
     pushDataLayer('filter_change', { classNo: null, winemaker: null });
   }
@@ -209,7 +264,10 @@
 
   function renderEntries() {
     if (!refs.entriesTableBody) return;
-    const entries = getEntriesForYear(STATE.year);
+    const yearData = getYearData(STATE.year);
+    const searchHits = STATE.search ? getSearchHits(yearData, STATE.search) : null;
+    const foldedSearch = foldText(STATE.search);
+    const entries = getCandidateEntries(yearData, searchHits);
     const filtered = entries
       .filter((entry) => {
         if (!STATE.classNo) return true;
@@ -221,8 +279,8 @@
       })
       .filter((entry) => {
         if (!STATE.search) return true;
-        const haystack = `${entry.winemaker || ''} ${entry.wineType || ''} ${entry.wineName || ''}`.toLowerCase();
-        return haystack.includes(STATE.search.toLowerCase());
+        if (searchHits) return searchHits.has(entry.position);
+        return getSearchText(entry).includes(foldedSearch);
       })
       .sort((a, b) => {
         const scoreA = typeof a.score === 'number' ? a.score : -Infinity;
@@ -369,113 +427,102 @@
     return 'th';
   }
 
-  function buildYearCache(rawData) {
-    const cache = {};
-    if (!rawData || typeof rawData !== 'object') {
-      return cache;
-    }
-
-    Object.keys(rawData).forEach((yearKey) => {
-      const yearNumber = parseInt(yearKey, 10);
-      if (Number.isNaN(yearNumber)) {
-        return;
+  function buildYearIndex(resultsIndex) {
+    const yearIndex = {};
+    const years = Array.isArray(resultsIndex?.years) ? resultsIndex.years : [];
+    years.forEach((info) => {
+      const yearNumber = parseInt(info?.year, 10);
+      if (!Number.isNaN(yearNumber) && info?.file) {
+        yearIndex[yearNumber] = info;
       }
-      const yearPayload = rawData[yearKey] || {};
-      const classes = Array.isArray(yearPayload.classes) ? yearPayload.classes.slice() : [];
-      const entrants = Array.isArray(yearPayload.entrants) ? yearPayload.entrants.slice() : [];
-      const entrantsById = entrants.reduce((accumulator, entrant) => {
-        if (entrant?.id) {
-          accumulator[entrant.id] = entrant;
-        }
-        return accumulator;
-      }, {});
-      const classesById = {};
-      const classesByCode = {};
-      classes.forEach((classInfo) => {
-        if (classInfo?.id) {
-          classesById[classInfo.id] = classInfo;
-        }
-        if (classInfo?.code != null) {
-          classesByCode[String(classInfo.code)] = classInfo;
-        }
-      });
-      const entriesRaw = Array.isArray(yearPayload.entries) ? yearPayload.entries : [];
-      const winemakersByKey = {};
-      const entries = entriesRaw.map((entry) => {
-        const classInfo = classesById[entry?.class_id] || {};
-        const entrantInfo = entrantsById[entry?.entrant_id] || {};
-        const numericScore = typeof entry?.judging?.Score === 'number'
-          ? entry.judging.Score
-          : Number(entry?.judging?.Score);
-        const score = Number.isNaN(numericScore) ? null : numericScore;
-        const trophies = Array.isArray(entry?.judging?.trophies) ? entry.judging.trophies : [];
-        const bestInClass = trophies.some((trophy) => typeof trophy === 'string' && trophy.toLowerCase().includes('best in class'));
-        const champion = trophies.some((trophy) => typeof trophy === 'string' && trophy.toLowerCase().includes('best in show'));
-        const components = entry?.components || {};
-        const score100 = typeof entry?.judging?.Score100 === 'number'
-          ? entry.judging.Score100
-          : score != null
-            ? score * 5
-            : null;
-        const winemakerId = entry?.entrant_id ?? null;
-        const winemakerName = entrantInfo?.display_name || entrantInfo?.name || 'Unnamed entrant';
-        const hasWinemakerName = Boolean(winemakerName && winemakerName !== 'Unnamed entrant');
-        const winemakerKey = winemakerId != null
-          ? `id:${winemakerId}`
-          : hasWinemakerName
-            ? `name:${winemakerName.toLowerCase()}`
-            : '';
-        if (winemakerKey) {
-          winemakersByKey[winemakerKey] = winemakerName;
-        }
-        return {
-          id: entry?.id || null,
-          year: yearNumber,
-          classId: entry?.class_id || null,
-          classNo: classInfo?.code != null ? String(classInfo.code) : '',
-          className: classInfo?.name || '',
-          classSortOrder: typeof classInfo?.sort_order === 'number' ? classInfo.sort_order : Number.MAX_SAFE_INTEGER,
-          entryNo: entry?.exhibit_number || entry?.entry_number || '',
-          winemaker: winemakerName,
-          winemakerId,
-          winemakerKey,
-          entrantClub: entrantInfo?.club || null,
-          wineName: entry?.wine?.name || '',
-          wineType: entry?.wine?.style || entry?.wine?.name || '',
-          wineVintage: entry?.wine?.vintage ?? null,
-          wineColour: entry?.wine?.colour || '',
-          wineRegion: entry?.wine?.region || '',
-          wineCountry: entry?.wine?.country || '',
-          score,
-          score100,
-          medal: entry?.judging?.Medal || null,
-          aroma: components?.aroma ?? null,
-          colour: components?.colour ?? null,
-          taste: components?.taste ?? null,
-          bestInClass,
-          champFlag: champion,
-          trophies,
-          rankInClass: entry?.judging?.rank_in_class ?? null,
-          panel: entry?.judging?.panel || null,
-          flight: entry?.judging?.flight || null,
-          raw: entry
-        };
-      });
-      const validEntries = entries.filter((entry) => entry);
-
-      cache[yearNumber] = {
-        raw: yearPayload,
-        classes,
-        classesById,
-        classesByCode,
-        entrants,
-        entrantsById,
-        entries: validEntries,
-        winemakersByKey
+    });
+    return yearIndex;
+  }
+
+  async function loadYear(year) {
+    if (STATE.resultsByYear[year]) {
+      return;
+    }
+    const info = STATE.yearIndex[year];
+    if (!info) {
+      throw new Error(`No results shard for ${year}`);
+    }
+    // Shard URLs carry a content hash, so the browser cache can keep them
+    const shardUrl = `${DATA_BASE_PATH}/results/${info.file}?v=${encodeURIComponent(info.hash || '')}`;
+    const shard = await fetchJson(shardUrl, 'default');
+    STATE.resultsByYear[year] = buildYearData(shard || {}, year);
+  }
+
+  // Shards come from assets/build_results_index.py with their lookup tables
+  // precomputed, so entries are joined to classes and entrants by index.
+  function buildYearData(yearPayload, yearNumber) {
+    const lookups = yearPayload.lookups || {};
+    const classes = Array.isArray(yearPayload.classes) ? yearPayload.classes : [];
+    const entrants = Array.isArray(yearPayload.entrants) ? yearPayload.entrants : [];
+    const classById = lookups.classById || {};
+    const entrantById = lookups.entrantById || {};
+    const entriesRaw = Array.isArray(yearPayload.entries) ? yearPayload.entries : [];
+    const entries = entriesRaw.map((entry, position) => {
+      const classInfo = classes[classById[entry?.class_id]] || {};
+      const entrantInfo = entrants[entrantById[entry?.entrant_id]] || {};
+      const numericScore = typeof entry?.judging?.Score === 'number'
+        ? entry.judging.Score
+        : Number(entry?.judging?.Score);
+      const score = Number.isNaN(numericScore) ? null : numericScore;
+      const trophies = Array.isArray(entry?.judging?.trophies) ? entry.judging.trophies : [];
+      const bestInClass = trophies.some((trophy) => typeof trophy === 'string' && trophy.toLowerCase().includes('best in class'));
+      const champion = trophies.some((trophy) => typeof trophy === 'string' && trophy.toLowerCase().includes('best in show'));
+      const components = entry?.components || {};
+      const score100 = typeof entry?.judging?.Score100 === 'number'
+        ? entry.judging.Score100
+        : score != null
+          ? score * 5
+          : null;
+      const winemakerId = entry?.entrant_id ?? null;
+      const winemakerName = entrantInfo?.display_name || entrantInfo?.name || 'Unnamed entrant';
+      return {
+        id: entry?.id || null,
+        position,
+        year: yearNumber,
+        classId: entry?.class_id || null,
+        classNo: classInfo?.code != null ? String(classInfo.code) : '',
+        className: classInfo?.name || '',
+        classSortOrder: typeof classInfo?.sort_order === 'number' ? classInfo.sort_order : Number.MAX_SAFE_INTEGER,
+        entryNo: entry?.exhibit_number || entry?.entry_number || '',
+        winemaker: winemakerName,
+        winemakerId,
+        winemakerKey: winemakerId != null ? `id:${winemakerId}` : '',
+        entrantClub: entrantInfo?.club || null,
+        wineName: entry?.wine?.name || '',
+        wineType: entry?.wine?.style || entry?.wine?.name || '',
+        wineVintage: entry?.wine?.vintage ?? null,
+        wineColour: entry?.wine?.colour || '',
+        wineRegion: entry?.wine?.region || '',
+        wineCountry: entry?.wine?.country || '',
+        score,
+        score100,
+        medal: entry?.judging?.Medal || null,
+        aroma: components?.aroma ?? null,
+        colour: components?.colour ?? null,
+        taste: components?.taste ?? null,
+        bestInClass,
+        champFlag: champion,
+        trophies,
+        rankInClass: entry?.judging?.rank_in_class ?? null,
+        panel: entry?.judging?.panel || null,
+        flight: entry?.judging?.flight || null,
+        raw: entry
       };
     });
 
-    return cache;
+    return {
+      raw: yearPayload,
+      classes,
+      entrants,
+      entries,
+      lookups,
+      winemakersByKey: lookups.winemakers || {}
+    };
   }
 
   function getYearData(year) {
@@ -483,16 +530,106 @@
     return STATE.resultsByYear[year] || null;
   }
 
-  function getEntriesForYear(year) {
-    const yearData = getYearData(year);
-    return Array.isArray(yearData?.entries) ? yearData.entries : [];
+  function getCandidateEntries(yearData, searchHits) {
+    const entries = Array.isArray(yearData?.entries) ? yearData.entries : [];
+    const lookups = yearData?.lookups || {};
+    // Start from the shortest precomputed list; renderEntries still applies every filter
+    const lists = [];
+    if (STATE.classNo) {
+      lists.push(lookups.entriesByClass?.[STATE.classNo] || []);
+    }
+    if (STATE.winemakerKey.startsWith('id:')) {
+      lists.push(lookups.entriesByEntrant?.[STATE.winemakerKey.slice(3)] || []);
+    }
+    if (searchHits) {
+      lists.push(Array.from(searchHits));
+    }
+    if (!lists.length) {
+      return entries;
+    }
+    const shortest = lists.reduce((best, list) => (list.length < best.length ? list : best));
+    return shortest.map((index) => entries[index]).filter(Boolean);
+  }
+
+  // Search text and folding must match assets/sawc_search.py, which builds
+  // the <year>.search.json indexes: NFKD, U+0300-U+036F dropped, lower case.
+  function foldText(value) {
+    return String(value || '').normalize('NFKD').replace(/[\u0300-\u036f]/g, '').toLowerCase();
+  }
+
+  function getSearchText(entry) {
+    if (entry.searchText == null) {
+      entry.searchText = foldText(`${entry.winemaker || ''} ${entry.wineType || ''} ${entry.wineName || ''}`);
+    }
+    return entry.searchText;
+  }
+
+  function loadSearchIndex(year) {
+    const info = STATE.yearIndex[year]?.search;
+    if (!info) {
+      return Promise.resolve(null);
+    }
+    if (STATE.searchIndexByYear[year]) {
+      return Promise.resolve(STATE.searchIndexByYear[year]);
+    }
+    if (!pendingSearchIndexes[year]) {
+      // Keystrokes made while the index downloads share one request; a failed
+      // download is retried on the next keystroke
+      const url = `${DATA_BASE_PATH}/results/${info.file}?v=${encodeURIComponent(info.hash || '')}`;
+      pendingSearchIndexes[year] = fetchJson(url, 'default')
+        .then((index) => {
+          STATE.searchIndexByYear[year] = { ...index, decoded: {} };
+          return STATE.searchIndexByYear[year];
+        })
+        .finally(() => {
+          delete pendingSearchIndexes[year];
+        });
+    }
+    return pendingSearchIndexes[year];
+  }
+
+  function decodePostings(index, table, key) {
+    const cacheKey = `${table}:${key}`;
+    if (!index.decoded[cacheKey]) {
+      const gaps = index[table]?.[key] || [];
+      let position = 0;
+      index.decoded[cacheKey] = gaps.map((gap) => (position += gap));
+    }
+    return index.decoded[cacheKey];
+  }
+
+  // Set of matching entry positions, or null when the index is not loaded
+  // (the caller then scans). Trigram hits are confirmed with a substring
+  // test; one- or two-letter queries match the start of a word.
+  function getSearchHits(yearData, query) {
+    const index = STATE.searchIndexByYear[STATE.year];
+    if (!index || !yearData) {
+      return null;
+    }
+    const folded = foldText(query);
+    if (folded.length < 3) {
+      return new Set(decodePostings(index, 'prefixes', folded));
+    }
+    const grams = new Set();
+    for (let i = 0; i + 3 <= folded.length; i += 1) {
+      grams.add(folded.slice(i, i + 3));
+    }
+    const lists = Array.from(grams, (gram) => decodePostings(index, 'grams', gram)).sort((a, b) => a.length - b.length);
+    let hits = lists[0];
+    for (const list of lists.slice(1)) {
+      if (!hits.length) break;
+      const members = new Set(list);
+      hits = hits.filter((position) => members.has(position));
+    }
+    return new Set(hits.filter((position) => getSearchText(yearData.entries[position]).includes(folded)));
   }
 
   function formatClassSummary(yearData, classCode) {
     if (!classCode) {
       return 'the selected class';
     }
-    const classInfo = yearData?.classesByCode?.[String(classCode)] || null;
+    const classIndex = yearData?.lookups?.classByCode?.[String(classCode)];
+    const classInfo = classIndex != null ? yearData.classes[classIndex] || null : null;
     if (!classInfo) {
       return `Class ${classCode}`;
     }
@@ -535,9 +672,7 @@
     if (winemakersByKey[trimmed]) {
       return trimmed;
     }
-    const normalized = trimmed.toLowerCase();
-    const match = Object.entries(winemakersByKey).find(([, label]) => label.toLowerCase() === normalized);
-    return match ? match[0] : '';
+    return yearData.lookups?.winemakerKeys?.[trimmed.toLowerCase()] || '';
   }
 
   function getEditionDisplay(show, fallbackYear) {
@@ -1,5 +1,5 @@
 (() => {
-    const EVENTS_JSON_URL = '/assets/events.json';
+    const NEXT_EVENT_URL = '/assets/next-event.json';
     const TZ = 'Australia/Sydney';
   
     // --- formatting helpers (Sydney-aware for display) ---
@@ -197,15 +197,39 @@
       removeStructuredData();
     };
   
+    // --- data loading ---
+    // eventfeed.js: the fingerprinted events.json via asset-manifest.json
+    const { fetchEvents } = window.SAWCEventFeed;
+
+    // next-event.json (generate_events_from_clean.py --next-event) lists only
+    // the next few events as of the last build. Use it unless every one of
+    // them has passed since, i.e. the site wasn't rebuilt: then load them all.
+    const loadNextEvent = async () => {
+      try {
+        const res = await fetch(NEXT_EVENT_URL, { cache: 'no-cache' });
+        if (res.ok) {
+          const { events = [] } = await res.json();
+          const next = findNextEvent(events);
+          if (next || !events.length) return next;
+        }
+      } catch (err) {
+        console.warn('next-event.json unavailable, loading every event', err);
+      }
+      return findNextEvent((await fetchEvents()) || []);
+    };
+  
     // --- boot ---
     const init = async () => {
       const section = document.querySelector('section.meeting-info');
       if (!section) return;
+
+      // assets/build_pages.py prerenders the meeting and its JSON-LD: they
+      // stand until that meeting is over, then the feeds are consulted again
+      const prerendered = section.querySelector('[data-event-end]');
+      if (prerendered && new Date(prerendered.dataset.eventEnd) >= new Date()) return;
   
       try {
-        const res = await fetch(EVENTS_JSON_URL, { cache: 'no-store' });
-        const data = await res.json();
-        const next = findNextEvent(data || []);
+        const next = await loadNextEvent();
         if (next) renderIntoSection(section, next);
         else renderNoUpcoming(section);
       } catch (err) {
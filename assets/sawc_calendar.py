@@ -0,0 +1,283 @@
+"""
+sawc_calendar.py — The iCalendar feed shared by generate_ics.py and generate_ics_refactored.py
+
+Both generators write the same calendar: a VCALENDAR header, the VTIMEZONE
+for the feed's years (sawc_vtimezone.py), one VEVENT per event (or RRULE
+series, sawc_rrule.py) and the footer. They differ only in their header
+values and CLI, so each script keeps its options and a Calendar, and the
+rendering, writing and build steps live here:
+
+- Calendar                     TZID, name, description, PRODID, LOCATION
+                               fallback and optional METHOD of a feed
+- to_vevent(ev, stamp, tzid)   one event's folded VEVENT lines
+- iter_ics_lines(events, cal)  the whole feed one folded line at a time
+- generate_ics / write_ics     the feed as a string / streamed to a writer
+- build(args, slices, cal, stage)
+                               a generator's main() after argument parsing:
+                               streaming, --incremental and the sliced feeds
+
+sawc_ics.py keeps fold(), which sawc_rrule.py and sawc_vtimezone.py use too,
+so this module can import them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import sys
+from pathlib import Path
+from typing import IO, Iterable, Iterator, NamedTuple, Sequence
+
+from sawc_events import open_cache
+from sawc_ics import fold
+from sawc_io import JSONStreamError, iter_json_array, open_output
+from sawc_manifest import content_key, event_keys, load_manifest, manifest_path, save_manifest, write_if_changed
+from sawc_pipeline import STAGES, publish, publish_incremental
+from sawc_rrule import Series, compress, series_lines
+from sawc_time import iso_to_ics_local
+from sawc_timings import TIMINGS
+from sawc_vtimezone import event_years, file_years, vtimezone_lines
+
+
+class Calendar(NamedTuple):
+    tzid: str
+    name: str
+    desc: str
+    prodid: str
+    default_location: str | None = None  # None: LOCATION as given; else stripped, this when blank
+    method: str | None = None            # METHOD header, e.g. "PUBLISH"
+
+
+def esc(s: str | None) -> str:
+    """Escape text for ICS fields."""
+    if s is None:
+        s = ""
+    return (
+        s.replace("\\", "\\\\")
+         .replace(";", "\\;")
+         .replace(",", "\\,")
+         .replace("\r\n", "\\n")
+         .replace("\n", "\\n")
+         .replace("\r", "\\n")
+    )
+
+
+def fmt_local(iso_str: str) -> str:
+    """
+    Parse ISO-8601 with offset, then return local wall-clock time as YYYYMMDDTHHMMSS.
+    We keep the local *clock* value and pair it with TZID in the ICS property.
+    """
+    try:
+        return iso_to_ics_local(iso_str)
+    except Exception as e:
+        raise ValueError(f"Invalid ISO datetime: {iso_str!r}") from e
+
+
+def build_description(ev: dict) -> str:
+    parts = []
+    if ev.get("description"):
+        parts.append(str(ev["description"]))
+    title = ev.get("title") or ev.get("meetingActivity") or "Event"
+    if ev.get("meetingActivity") and ev["meetingActivity"] != title:
+        parts.append(f"Activity: {ev['meetingActivity']}")
+    if ev.get("miniCompetition"):
+        parts.append(f"Mini competition: {ev['miniCompetition']}")
+    if ev.get("comments"):
+        parts.append(f"Notes: {ev['comments']}")
+    return esc("\n".join([p for p in parts if str(p).strip()]))
+
+
+def to_vevent(ev: dict, dtstamp_utc: str, tzid: str, default_location: str | None = None) -> list[str]:
+    uid = f"{(ev.get('id') or '').strip() or ev.get('title','event').strip()}@sydneyawc.com"
+    title = ev.get("title") or ev.get("meetingActivity") or "Event"
+    dtstart = fmt_local(ev["start"])
+    dtend   = fmt_local(ev["end"])
+    vevent = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{dtstamp_utc}Z",
+        f"DTSTART;TZID={tzid}:{dtstart}",
+        f"DTEND;TZID={tzid}:{dtend}",
+        f"SUMMARY:{esc(title)}",
+    ]
+    loc = ev.get("location") if default_location is None else \
+        (ev.get("location") or "").strip() or default_location
+    if loc:
+        vevent.append(f"LOCATION:{esc(loc)}")
+    desc = build_description(ev)
+    if desc:
+        vevent.append(f"DESCRIPTION:{desc}")
+    vevent.append("END:VEVENT")
+    return [fold(l) for l in vevent]
+
+
+def iter_ics_lines(events: Iterable[dict], cal: Calendar, cache: dict | None = None, rrule: bool = False,
+                   years: tuple[int, int] | None = None) -> Iterator[str]:
+    """
+    Yield the calendar one folded line at a time (without the CRLF), pulling
+    events lazily. If cache is given (content key -> VEVENT block from a
+    previous run; events must then be a list), unchanged events reuse their
+    block, DTSTAMP included, and cache is replaced in place with the blocks
+    used by this build. rrule=True folds regular monthly meetings into RRULE
+    series (sawc_rrule.compress), which reads every event first.
+
+    The VTIMEZONE covers years, the (first, last) local years of the events; pass
+    it (e.g. from file_years()) to stream an iterator, which is otherwise
+    read into a list to find them.
+    """
+    if years is None:
+        if rrule or not isinstance(events, Sequence):
+            events = list(events)
+        years = event_years(events)
+    elif rrule:
+        events = list(events)
+    tzid = cal.tzid
+    keys = event_keys(events) if cache is not None else None
+    fresh = {}
+    now_utc = dt.datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    vevent = lambda ev: to_vevent(ev, now_utc, tzid, cal.default_location)
+    yield from [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{cal.prodid}",
+        "CALSCALE:GREGORIAN",
+        *([f"METHOD:{cal.method}"] if cal.method else []),
+        fold(f"X-WR-CALNAME:{esc(cal.name)}"),
+        fold(f"X-WR-CALDESC:{esc(cal.desc)}"),
+        f"X-WR-TIMEZONE:{tzid}",
+        *vtimezone_lines(tzid, years),
+    ]
+    for i, ev in enumerate(events):
+        for required in ("start", "end"):
+            if required not in ev or not ev[required]:
+                raise ValueError(f"Event missing required field: {required}\n{ev}")
+        if rrule:
+            continue
+        if keys is None:
+            yield from vevent(ev)
+            continue
+        block = cache.get(keys[i]) or "\r\n".join(vevent(ev))
+        fresh[keys[i]] = block
+        yield block
+    for item in compress(events) if rrule else ():
+        if isinstance(item, Series):
+            key = keys and content_key("rrule", item.rule, *(keys[m] for m in item.members))
+            render = lambda s=item: series_lines(s, vevent, tzid)
+        else:
+            key = keys and keys[item]
+            render = lambda ev=events[item]: vevent(ev)
+        if keys is None:
+            yield from render()
+            continue
+        block = cache.get(key) or "\r\n".join(render())
+        fresh[key] = block
+        yield block
+    yield "END:VCALENDAR"
+    if cache is not None:
+        cache.clear()
+        cache.update(fresh)
+
+
+def generate_ics(events: list[dict], cal: Calendar, cache: dict | None = None, rrule: bool = False) -> str:
+    """Render the whole calendar as one string (see iter_ics_lines)."""
+    return "\r\n".join(iter_ics_lines(events, cal, cache, rrule)) + "\r\n"
+
+
+def write_ics(out: IO[str], events: Iterable[dict], cal: Calendar, cache: dict | None = None,
+              rrule: bool = False, years: tuple[int, int] | None = None) -> int:
+    """Stream the calendar to out line by line; returns the number of events."""
+    if isinstance(events, Sequence):
+        count = len(events)
+        lines = iter_ics_lines(events, cal, cache, rrule, years)
+    else:
+        count = 0
+
+        def counted():
+            nonlocal count
+            for ev in events:
+                count += 1
+                yield ev
+
+        lines = iter_ics_lines(counted(), cal, cache, rrule, years)
+    for line in lines:
+        out.write(line)
+        out.write("\r\n")
+    return count
+
+
+def build(args: argparse.Namespace, slices: list[tuple[str, str]], cal: Calendar, stage: str) -> int:
+    """Write the feed of args.in_path to args.out_path, plus the slices, as the stage renders it.
+
+    args holds the generators' shared options (in_path, out_path, incremental,
+    months, rrule, no_binary_cache). The --incremental manifest is keyed by
+    the stage's cache_params.
+    """
+    in_path = Path(args.in_path)
+    out_path = Path(args.out_path)
+    status = sys.stderr if args.out_path == "-" else sys.stdout
+    if not in_path.exists():
+        print(f"ERROR: {in_path} not found", file=sys.stderr)
+        return 2
+
+    events = None
+    if not args.no_binary_cache:
+        with TIMINGS.stage("load"):
+            events = open_cache(in_path)  # None unless events.json.bin matches events.json
+    if events is None and (args.incremental or slices or args.rrule):  # these need every event in memory
+        try:
+            with TIMINGS.stage("load"):
+                events = json.loads(in_path.read_text(encoding="utf-8"))
+            if not isinstance(events, list):
+                raise ValueError("Root of JSON must be a list of events")
+        except Exception as e:
+            print(f"ERROR: Failed to read/parse {in_path}: {e}", file=sys.stderr)
+            return 3
+
+    options = {"tzid": cal.tzid, "calName": cal.name, "calDesc": cal.desc, "prodid": cal.prodid,
+               "months": args.months, "rrule": args.rrule}
+    if cal.default_location is not None:
+        options["defaultLocation"] = cal.default_location
+    written = True
+    if args.incremental:
+        params = {name: options[name] for name in STAGES[stage].cache_params}
+        cache = load_manifest(manifest_path(out_path), params)
+        try:
+            with TIMINGS.stage(stage):
+                ics = generate_ics(events, cal, cache, args.rrule)
+            with TIMINGS.stage("write"):
+                written = write_if_changed(out_path, ics, newline="")
+            save_manifest(manifest_path(out_path), params, cache)
+        except Exception as e:
+            print(f"ERROR: Failed to generate/write ICS: {e}", file=sys.stderr)
+            return 4
+        count = len(events)
+    else:
+        # Stream: events.json -> VEVENTs -> buffered writer, one event in memory at a time
+        try:
+            with open(in_path, encoding="utf-8") as fp, TIMINGS.stage("write"), open_output(args.out_path) as out:
+                with TIMINGS.stage(stage):
+                    source = TIMINGS.iterate("load", iter_json_array(fp)) if events is None else events
+                    years = file_years(in_path) if events is None else None  # the VTIMEZONE precedes the events
+                    count = write_ics(TIMINGS.writer("write", out), source, cal, rrule=args.rrule, years=years)
+        except JSONStreamError as e:
+            print(f"ERROR: Failed to read/parse {in_path}: {e}", file=sys.stderr)
+            return 3
+        except Exception as e:
+            print(f"ERROR: Failed to generate/write ICS: {e}", file=sys.stderr)
+            return 4
+
+    if written:
+        print(f"Wrote {out_path} with {count} events.", file=status)
+    else:
+        print(f"{out_path} is up to date ({count} events).", file=status)
+    if slices:
+        try:
+            sliced = publish_incremental(events, slices, options) if args.incremental \
+                else publish(events, slices, options)
+        except Exception as e:
+            print(f"ERROR: Failed to generate/write ICS: {e}", file=sys.stderr)
+            return 4
+        if sliced:
+            print(f"Wrote {', '.join(sliced)}.", file=status)
+    return 0
@@ -0,0 +1,288 @@
+"""
+sawc_events.py — Compact event records and the binary events.json cache
+
+Every script used to hand events around as plain dicts of nine strings, and
+the ICS generators re-parsed events.json (and every timestamp in it) on each
+run. This module gives them a shared, smaller representation:
+
+- Event                 one event with __slots__: start/end as epoch seconds
+                        plus their UTC offset and the tz id, text fields
+                        interned. It is a read-only Mapping, so ev["start"],
+                        ev.get("location") and dict(ev) give exactly what the
+                        events.json record holds and renderers take either form
+- write_cache(events, json_path, tz)
+                        events.json.bin next to events.json (only if every
+                        event round-trips exactly)
+- open_cache(json_path) an EventCache over the memory-mapped file, or None if
+                        it is missing, damaged or not for this events.json
+- read_events(path)     the cache if fresh, else json.loads(events.json)
+
+Cache layout (little-endian):
+
+  header    magic "SAWCEVTS", version, event count, string count, string
+            bytes, events.json size and BLAKE2b-128 digest
+  records   one 56-byte struct per event: start and end (int64 epoch
+            seconds), their UTC offsets (int32 seconds), then string-table
+            indexes (uint32) of id, title, location, description,
+            meetingActivity, miniCompetition, comments and tz
+  offsets   string count + 1 uint32 offsets into the string bytes
+  strings   the distinct strings, UTF-8, each stored once
+
+Records are unpacked straight from the mapping as they are read and each
+distinct string is decoded once, so loading costs one digest of events.json
+and no JSON or timestamp parsing. The digest (not the mtime) decides
+freshness, so a checkout or a rewrite with the same content keeps the
+cache valid and any edit to events.json makes readers fall back to JSON.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+from sawc_manifest import write_if_changed
+from sawc_time import offset_suffix
+
+FIELDS = ("id", "title", "start", "end", "location", "description", "meetingActivity", "miniCompetition",
+          "comments")
+TEXT_FIELDS = ("id", "title", "location", "description", "meetingActivity", "miniCompetition", "comments")
+
+MAGIC = b"SAWCEVTS"
+CACHE_VERSION = 1
+HEADER = struct.Struct("<8sIIIIQ16s")
+RECORD = struct.Struct("<qqii8I")
+_KEYS = frozenset(FIELDS)
+_EPOCH = datetime(1970, 1, 1)
+_MAX_U32 = 0xFFFFFFFF
+
+
+def cache_path(json_path: str | Path) -> Path:
+    """Binary cache location for an events.json."""
+    json_path = Path(json_path)
+    return json_path.with_name(json_path.name + ".bin")
+
+
+@lru_cache(maxsize=64)
+def _suffix(offset: int) -> str:
+    return offset_suffix(timedelta(seconds=offset))
+
+
+def format_iso(ts: int, offset: int) -> str:
+    """Epoch seconds at a UTC offset (seconds) as events.json writes it."""
+    return (_EPOCH + timedelta(seconds=ts + offset)).isoformat() + _suffix(offset)
+
+
+def parse_iso(iso: str) -> tuple[int, int]:
+    """(epoch seconds, offset seconds) of an ISO timestamp that format_iso() reproduces exactly."""
+    moment = datetime.fromisoformat(iso)
+    offset = moment.utcoffset()
+    if offset is None:
+        raise ValueError(f"timestamp without a UTC offset: {iso!r}")
+    wall = moment.replace(tzinfo=None) - _EPOCH
+    result = (int((wall - offset).total_seconds()), int(offset.total_seconds()))
+    if format_iso(*result) != iso:
+        raise ValueError(f"timestamp not in canonical form: {iso!r}")
+    return result
+
+
+class Event(Mapping):
+    """One event; reads like its events.json record (a Mapping of the nine FIELDS).
+
+    The fields are attributes too; start/end are the ISO strings, formatted
+    from start_ts/end_ts and the offsets on first use.
+    """
+
+    __slots__ = ("id", "title", "start_ts", "end_ts", "start_offset", "end_offset", "tz", "location",
+                 "description", "meetingActivity", "miniCompetition", "comments", "_start", "_end")
+
+    def __init__(self, id: str, title: str, start_ts: int, end_ts: int, start_offset: int, end_offset: int,
+                 tz: str = "", location: str = "", description: str = "", meetingActivity: str = "",
+                 miniCompetition: str = "", comments: str = ""):
+        self.id, self.title, self.tz = id, title, tz
+        self.start_ts, self.end_ts, self.start_offset, self.end_offset = start_ts, end_ts, start_offset, end_offset
+        self.location, self.description, self.comments = location, description, comments
+        self.meetingActivity, self.miniCompetition = meetingActivity, miniCompetition
+        self._start = self._end = None
+
+    @property
+    def start(self) -> str:
+        if self._start is None:
+            self._start = format_iso(self.start_ts, self.start_offset)
+        return self._start
+
+    @property
+    def end(self) -> str:
+        if self._end is None:
+            self._end = format_iso(self.end_ts, self.end_offset)
+        return self._end
+
+    @classmethod
+    def from_dict(cls, record: Mapping, tz: str = "") -> Event:
+        """Event for an events.json record; ValueError unless it round-trips exactly."""
+        if set(record) != set(FIELDS):
+            raise ValueError(f"fields {sorted(record)} are not the events.json fields")
+        text = {}
+        for field in TEXT_FIELDS:
+            if not isinstance(record[field], str):
+                raise ValueError(f"{field} is not a string: {record[field]!r}")
+            text[field] = sys.intern(record[field])
+        start_ts, start_offset = parse_iso(record["start"])
+        end_ts, end_offset = parse_iso(record["end"])
+        return cls(start_ts=start_ts, end_ts=end_ts, start_offset=start_offset, end_offset=end_offset,
+                   tz=sys.intern(tz), **text)
+
+    # The renderers call these per field, so skip Mapping's generic versions
+    def __getitem__(self, key: str) -> str:
+        if key in _KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in _KEYS else default
+
+    def __contains__(self, key) -> bool:
+        return key in _KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def __repr__(self) -> str:
+        return f"Event({dict(self)!r})"
+
+
+def _digest(path: Path) -> tuple[int, bytes]:
+    """(size, BLAKE2b-128) of a file."""
+    h = hashlib.blake2b(digest_size=16)
+    size = 0
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            h.update(block)
+            size += len(block)
+    return size, h.digest()
+
+
+def pack_events(events: list[Mapping], source: tuple[int, bytes], tz: str = "") -> bytes:
+    """The cache file for events (raises ValueError if one cannot be stored exactly)."""
+    table: dict[str, int] = {}
+    records = []
+    for record in events:
+        ev = record if isinstance(record, Event) else Event.from_dict(record, tz)
+        refs = [table.setdefault(getattr(ev, field), len(table)) for field in TEXT_FIELDS]
+        refs.append(table.setdefault(ev.tz, len(table)))
+        records.append(RECORD.pack(ev.start_ts, ev.end_ts, ev.start_offset, ev.end_offset, *refs))
+    encoded = [s.encode("utf-8") for s in table]
+    offsets, pos = [0], 0
+    for data in encoded:
+        pos += len(data)
+        offsets.append(pos)
+    if pos > _MAX_U32 or len(records) > _MAX_U32:
+        raise ValueError("too many events for the binary cache")
+    header = HEADER.pack(MAGIC, CACHE_VERSION, len(records), len(encoded), pos, *source)
+    return b"".join([header, *records, struct.pack(f"<{len(offsets)}I", *offsets), *encoded])
+
+
+def write_cache(events: list[Mapping], json_path: str | Path, tz: str = "") -> bool:
+    """Write events.json.bin for the events just written to json_path.
+
+    Raises ValueError if an event cannot be stored exactly (extra or non-string
+    fields, timestamps events.json would not print the same way). The file is
+    replaced atomically, so open mappings keep reading the old one, and left
+    alone if unchanged. Returns True if it was written.
+    """
+    return write_if_changed(cache_path(json_path), pack_events(events, _digest(Path(json_path)), tz))
+
+
+class EventCache(Sequence):
+    """The events of a memory-mapped cache file, unpacked on access."""
+
+    def __init__(self, mm: mmap.mmap, count: int, strings: int, blob_size: int):
+        self._mm = mm
+        self._count = count
+        self._offsets = HEADER.size + count * RECORD.size
+        self._blob = self._offsets + (strings + 1) * 4
+        if len(mm) != self._blob + blob_size:
+            raise ValueError("truncated binary cache")
+        # Each distinct string becomes one str object, shared by every event using it
+        offsets = struct.unpack_from(f"<{strings + 1}I", mm, self._offsets)
+        with memoryview(mm) as view:
+            self._strings = [str(view[self._blob + a:self._blob + b], "utf-8")
+                             for a, b in zip(offsets, offsets[1:])]
+
+    def _event(self, f: tuple) -> Event:
+        s = self._strings
+        return Event(s[f[4]], s[f[5]], f[0], f[1], f[2], f[3], s[f[11]], s[f[6]], s[f[7]], s[f[8]], s[f[9]],
+                     s[f[10]])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("event index out of range")
+        return self._event(RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size))
+
+    def __iter__(self) -> Iterator[Event]:
+        with memoryview(self._mm) as view, view[HEADER.size:self._offsets] as records:
+            for fields in RECORD.iter_unpack(records):
+                yield self._event(fields)
+
+    def local_range(self) -> tuple[int, int] | None:
+        """(earliest start, latest end) as epoch seconds shifted by their UTC offsets; None if empty."""
+        if not self._count:
+            return None
+        with memoryview(self._mm) as view, view[HEADER.size:self._offsets] as records:
+            fields = list(RECORD.iter_unpack(records))
+        return min(f[0] + f[2] for f in fields), max(f[1] + f[3] for f in fields)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> EventCache:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_cache(json_path: str | Path) -> EventCache | None:
+    """The binary cache of json_path, or None if missing, damaged or stale."""
+    path = cache_path(json_path)
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # missing, unreadable or empty
+        return None
+    try:
+        magic, version, count, strings, blob_size, size, digest = HEADER.unpack_from(mm)
+        if magic != MAGIC or version != CACHE_VERSION or (size, digest) != _digest(Path(json_path)):
+            raise ValueError("stale binary cache")
+        return EventCache(mm, count, strings, blob_size)
+    except (OSError, ValueError, struct.error):
+        mm.close()
+        return None
+
+
+def read_events(path: str | Path) -> Sequence[Mapping]:
+    """The events of events.json, from its binary cache when that is fresh."""
+    cached = open_cache(path)
+    if cached is not None:
+        return cached
+    events = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(events, list):
+        raise ValueError("Root of JSON must be a list of events")
+    return events
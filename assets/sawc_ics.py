@@ -0,0 +1,43 @@
+"""
+sawc_ics.py — iCalendar helpers shared by generate_ics.py and generate_ics_refactored.py
+
+- fold(line)   RFC 5545 line folding on UTF-8 octets
+"""
+
+from __future__ import annotations
+
+# Octets per physical line, leading space of continuation lines included.
+# RFC 5545 allows 75; 74 keeps ASCII output identical to the original fold().
+FOLD_OCTETS = 74
+
+
+def fold(line: str, width: int = FOLD_OCTETS) -> str:
+    """Fold a content line so no physical line exceeds width UTF-8 octets.
+
+    Works on the encoded bytes through a memoryview (no intermediate string
+    copies, linear in the line length) and only breaks before a UTF-8 lead
+    byte, so multibyte characters such as "é" are never split.
+    """
+    if line.isascii():
+        # One octet per character: slice the str directly
+        if len(line) <= width:
+            return line
+        step = width - 1
+        return "\r\n ".join([line[:width]] + [line[i:i + step] for i in range(width, len(line), step)])
+
+    data = line.encode("utf-8")
+    n = len(data)
+    if n <= width:
+        return line
+
+    view = memoryview(data)
+    parts = []
+    start, room = 0, width
+    while n - start > room:
+        end = start + room
+        while data[end] & 0xC0 == 0x80:  # continuation byte: back up to the lead byte
+            end -= 1
+        parts.append(view[start:end])
+        start, room = end, width - 1
+    parts.append(view[start:])
+    return b"\r\n ".join(parts).decode("utf-8")
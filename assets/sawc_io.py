@@ -0,0 +1,142 @@
+"""
+sawc_io.py — Streaming input/output helpers for the feed generators
+
+- iter_json_array(fp)   yield the items of a top-level JSON array one at a time,
+                        reading the file in blocks instead of json.loads()-ing it
+- open_output(path)     buffered text (or binary=True: bytes) writer for a file,
+                        "-" (stdout) or *.gz; files are written to a temp
+                        sibling and renamed on success, so a failed run never
+                        leaves a half-written feed
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gzip
+import io
+import json
+import os
+import secrets
+import sys
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+READ_BLOCK = 1 << 16
+WRITE_BUFFER = 1 << 16
+
+_decoder = json.JSONDecoder()
+_WS = " \t\r\n"
+
+
+class JSONStreamError(ValueError):
+    """The input is not a well-formed JSON array."""
+
+
+def iter_json_array(fp: IO[str], block_size: int = READ_BLOCK) -> Iterator[Any]:
+    """Yield each element of the JSON array in fp without loading it all.
+
+    Only the current element (plus one read block) is held in memory.
+    Raises JSONStreamError if the root is not an array or the text is invalid.
+    """
+    buf, pos, eof = "", 0, False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = fp.read(block_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_ws() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            if pos < len(buf) or not fill():
+                return buf[pos:pos + 1]
+
+    if skip_ws() != "[":
+        raise JSONStreamError("Root JSON must be a list of events")
+    pos += 1
+    if skip_ws() == "]":
+        pos += 1
+    else:
+        while True:
+            while True:
+                try:
+                    item, end = _decoder.raw_decode(buf, pos)
+                    # A value ending exactly at the buffer edge may continue (e.g. a number)
+                    if end < len(buf) or eof:
+                        break
+                except json.JSONDecodeError as e:
+                    if eof:
+                        raise JSONStreamError(f"Invalid JSON: {e}") from None
+                fill()
+            pos = end
+            yield item
+            sep = skip_ws()
+            pos += 1
+            if sep == "]":
+                break
+            if sep != ",":
+                raise JSONStreamError(f"Expected ',' or ']' in array, got {sep!r}")
+            skip_ws()
+    if skip_ws():
+        raise JSONStreamError("Extra data after the JSON array")
+
+
+@contextlib.contextmanager
+def open_output(path: str | Path, newline: str | None = "", binary: bool = False) -> Iterator[IO]:
+    """Text writer (UTF-8, no newline translation by default) for path.
+
+    newline is passed to io.TextIOWrapper; None translates "\\n" to os.linesep
+    like open(..., "w"); binary=True yields a bytes stream instead. "-" writes to stdout; a ".gz" suffix
+    gzips the stream (mtime 0, so equal content gives equal bytes). Regular files appear atomically on success.
+    """
+    if str(path) == "-":
+        if binary:
+            yield sys.stdout.buffer
+            sys.stdout.buffer.flush()
+            return
+        out = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline=newline, write_through=False)
+        try:
+            yield out
+            out.flush()
+        finally:
+            out.detach()
+        return
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = _temp_sibling(path)
+    try:
+        with open(fd, "wb", buffering=WRITE_BUFFER) as raw:
+            stream = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) if path.suffix == ".gz" else raw
+            if binary:
+                with stream:  # closing the GzipFile writes its trailer
+                    yield stream
+            else:
+                with io.TextIOWrapper(stream, encoding="utf-8", newline=newline) as out:
+                    yield out
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def _temp_sibling(path: Path) -> tuple[int, Path]:
+    """Create a new hidden file next to path for writing; returns (fd, its path).
+
+    Unlike tempfile.mkstemp (0600) it is created with mode 0666, so the umask
+    gives published files their usual mode without changing process state.
+    """
+    while True:
+        tmp = path.with_name(f".{path.name}.{secrets.token_hex(4)}")
+        try:
+            return os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666), tmp
+        except FileExistsError:
+            continue
@@ -0,0 +1,119 @@
+"""
+sawc_manifest.py — Content-hash manifests for incremental feed rebuilds
+
+Shared by generate_events_from_clean.py, generate_ics.py and
+generate_ics_refactored.py (--incremental). Each output gets a sidecar
+manifest next to it, e.g. events.json -> events.json.manifest.json:
+
+  {
+    "version": 1,
+    "params": {"tz": "Australia/Sydney", ...},   # anything that changes rendering
+    "entries": {"<content key>": {...}, ...}     # cached per-row/per-event output
+  }
+
+A content key is a hash of one input row (or event); repeats of identical
+content get "#2", "#3", ... so every key is unique. If the params differ from
+the previous run the cache is discarded and everything is re-rendered.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from sawc_io import open_output
+
+MANIFEST_VERSION = 1
+
+
+def manifest_path(out_path: str | Path) -> Path:
+    """Sidecar manifest location for an output file."""
+    out_path = Path(out_path)
+    return out_path.with_name(out_path.name + ".manifest.json")
+
+
+def content_key(*parts: str) -> str:
+    """Stable 128-bit hex digest of the given text parts."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def occurrence_keys(digests: list[str]) -> list[str]:
+    """Make digests unique by numbering repeats ("abc", "abc#2", ...)."""
+    seen: dict[str, int] = {}
+    keys = []
+    for d in digests:
+        n = seen.get(d, 0) + 1
+        seen[d] = n
+        keys.append(d if n == 1 else f"{d}#{n}")
+    return keys
+
+
+def load_manifest(path: str | Path, params: dict) -> dict:
+    """Return cached entries from path, or {} if missing, unreadable or stale."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION or data.get("params") != params:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_manifest(path: str | Path, params: dict, entries: dict) -> bool:
+    """Write the manifest (only if its content changed). Returns True if written."""
+    text = json.dumps({"version": MANIFEST_VERSION, "params": params, "entries": entries},
+                      ensure_ascii=False, separators=(",", ":"))
+    return write_if_changed(path, text)
+
+
+def write_if_changed(path: str | Path, text: str | bytes, newline: str | None = None) -> bool:
+    """Write text to path unless the file already holds exactly these bytes.
+
+    Leaving identical files alone keeps their mtime, so static hosts, CDNs and
+    calendar clients see nothing new. A ".gz" path is gzipped (like open_output)
+    and compared by a digest of its decompressed content. newline="" writes text as-is (ICS CRLF);
+    None translates "\n" like open(..., "w"). bytes are written unchanged.
+    The file is replaced atomically (sawc_io.open_output), so an interrupted
+    rebuild leaves the previous version. Returns True if the file was written.
+    """
+    path = Path(path)
+    if isinstance(text, bytes):
+        data = text
+    else:
+        if newline is None:
+            # Match what open(..., "w") would produce on this platform
+            text = text.replace("\n", os.linesep)
+        data = text.encode("utf-8")
+    if _holds(path, data):
+        return False
+    with open_output(path, binary=True) as f:
+        f.write(data)
+    return True
+
+
+def _holds(path: Path, data: bytes) -> bool:
+    """Whether path's content (decompressed, for .gz) is exactly data."""
+    try:
+        if path.suffix != ".gz":
+            return path.stat().st_size == len(data) and path.read_bytes() == data
+        h = hashlib.blake2b(digest_size=16)
+        with gzip.open(path, "rb") as f:
+            while block := f.read(1 << 20):
+                h.update(block)
+    except (OSError, EOFError):  # missing, or not a complete gzip stream
+        return False
+    return h.digest() == hashlib.blake2b(data, digest_size=16).digest()
+
+
+def event_keys(events: list[dict]) -> list[str]:
+    """Content keys for events.json records or sawc_events.Event (order-independent over fields)."""
+    return occurrence_keys([content_key(json.dumps(dict(ev), sort_keys=True, ensure_ascii=False))
+                            for ev in events])
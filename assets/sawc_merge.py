@@ -0,0 +1,197 @@
+"""
+sawc_merge.py — Merge the events of several calendar sheets into one list
+
+The activities sheet, venue bookings and special-event sheets all list some
+of the same events. generate_events_from_clean.py converts each sheet on its
+own and merge_events() combines them, most trusted source first:
+
+  duplicate       same local start day and same title key (slugify of the
+                  diacritic-folded title, so "Rosé Tasting!" = "rose-tasting")
+                  in different sheets; if a sheet lists that title more than
+                  once that day (two sessions), only members overlapping in
+                  time are duplicates, which also catches a pasted row
+  near-duplicate  different sheets, overlapping in time, titles sharing at
+                  least --similarity of their words (Jaccard on the key's words)
+  overlap         any other pair overlapping in time; both are kept and the
+                  pair is reported (e.g. a booking clashing with a meeting)
+
+Exact duplicates come from a dict keyed by (day, title key); overlaps from a
+sweep over the events sorted by start that only keeps the still-running ones
+in a heap. Both are near-linear; nothing compares every pair.
+
+A duplicate group becomes one event: start, end and title of the
+highest-precedence member, every other empty field filled from the next
+source that has it. unique_ids() then makes the ids collision-free, for
+merged and single-sheet deterministic output alike: the earliest event
+keeps YYYYMMDD-slug, later ones sharing it get -HHMM (their local start
+time), then -2, -3, ... An id only changes when an event with the same id
+starts earlier the same day, and the renamed event is a copy, so the merge
+report's groups still show the source ids.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from datetime import datetime, time
+from typing import Iterable, Iterator, NamedTuple
+
+from sawc_search import fold
+
+DEFAULT_SIMILARITY = 0.6
+
+
+class Source(NamedTuple):
+    """One converted sheet; name is what --precedence refers to."""
+    name: str
+    events: list[dict]
+
+
+class MergeResult(NamedTuple):
+    events: list[dict]                 # merged, sorted by start
+    groups: list[tuple[dict, list[tuple[str, dict]]]]  # (output event, [(source, input event), ...]), winner first
+    overlaps: list[tuple[dict, dict]]  # overlapping output events that were kept apart
+
+
+def title_key(title: str) -> str:
+    """slugify() of the diacritic- and case-folded title."""
+    key = re.sub(r"[^\w\s-]", "", fold(title).strip())
+    return re.sub(r"[\s_-]+", "-", key).strip("-")
+
+
+def similarity(a: str, b: str) -> float:
+    """Jaccard similarity of two title keys' words."""
+    wa, wb = set(a.split("-")), set(b.split("-"))
+    return len(wa & wb) / len(wa | wb) if wa | wb else 1.0
+
+
+def _end(ev: dict, start: float) -> float:
+    if ev.get("end"):
+        return datetime.fromisoformat(ev["end"]).timestamp()
+    day = datetime.fromisoformat(ev["start"])
+    return max(start, datetime.combine(day.date(), time(23, 59, 59, 999000), day.tzinfo).timestamp())
+
+
+class _Groups:
+    """Union-find over input positions."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        i, j = self.find(i), self.find(j)
+        if i != j:
+            self.parent[max(i, j)] = min(i, j)  # the root stays the highest-precedence member
+
+
+def _combine(members: list[dict]) -> dict:
+    """The winner (members[0]) with empty fields filled from the others, in order."""
+    merged = dict(members[0])
+    for ev in members[1:]:
+        for field, value in ev.items():
+            if value not in (None, "") and merged.get(field) in (None, ""):
+                merged[field] = value
+    return merged
+
+
+def merge_events(sources: list[Source], min_similarity: float = DEFAULT_SIMILARITY) -> MergeResult:
+    """Merge the sources' events, sources[0] taking precedence; see the module docstring."""
+    names, rank, events = [], [], []
+    for r, source in enumerate(sources):
+        names += [source.name] * len(source.events)
+        rank += [r] * len(source.events)
+        events += source.events
+
+    keys = [title_key(ev.get("title") or "") for ev in events]
+    starts = [datetime.fromisoformat(ev["start"]).timestamp() for ev in events]
+    ends = [_end(ev, s) for ev, s in zip(events, starts)]
+    groups = _Groups(len(events))
+
+    # Same day and title key: one event listed by several sheets
+    buckets: dict[tuple[str, str], list[int]] = {}
+    for i, ev in enumerate(events):
+        buckets.setdefault((ev["start"][:10], keys[i]), []).append(i)
+    for bucket in buckets.values():
+        once = len({rank[i] for i in bucket}) == len(bucket)  # no sheet lists it twice that day
+        for a, i in enumerate(bucket):
+            for j in bucket[a + 1:]:
+                if once or (starts[j] < ends[i] and starts[i] < ends[j]):
+                    groups.union(i, j)
+
+    # Sweep by start: each event meets only the events still running
+    clashes = []
+    running: list[tuple[float, int]] = []
+    for j in sorted(range(len(events)), key=lambda i: (starts[i], i)):
+        while running and running[0][0] <= starts[j]:
+            heapq.heappop(running)
+        for _, i in running:
+            if groups.find(i) == groups.find(j):
+                continue
+            if rank[i] != rank[j] and similarity(keys[i], keys[j]) >= min_similarity:
+                groups.union(i, j)
+            else:
+                clashes.append((i, j))
+        heapq.heappush(running, (ends[j], j))
+
+    members: dict[int, list[int]] = {}
+    for i in sorted(range(len(events)), key=lambda i: (rank[i], i)):
+        members.setdefault(groups.find(i), []).append(i)
+    merged = {root: _combine([events[i] for i in group]) if len(group) > 1 else events[root]
+              for root, group in members.items()}
+
+    overlaps, seen = [], set()
+    for i, j in clashes:
+        pair = (groups.find(i), groups.find(j))
+        if pair[0] != pair[1] and pair not in seen and pair[::-1] not in seen:
+            seen.add(pair)
+            overlaps.append((merged[pair[0]], merged[pair[1]]))
+
+    order = sorted(members, key=lambda root: (starts[root], rank[root], root))
+    return MergeResult(
+        events=[merged[root] for root in order],
+        groups=[(merged[root], [(names[i], events[i]) for i in members[root]])
+                for root in order if len(members[root]) > 1],
+        overlaps=overlaps,
+    )
+
+
+def unique_ids(events: Iterable[dict]) -> Iterator[dict]:
+    """Yield events (sorted by start) with collision-free ids.
+
+    A renamed event is a copy, so the input dicts (which MergeResult.groups
+    and caches refer to) keep their source ids and unchanged events are
+    yielded as they are. Deterministic ids begin with the local start day, so
+    only events of one day can share one: each day is resolved on its own,
+    and a stream holds one day of events at a time.
+    """
+    day, batch = None, []
+    for ev in events:
+        if ev["start"][:10] != day:
+            yield from _unique_day(batch)
+            day, batch = ev["start"][:10], []
+        batch.append(ev)
+    yield from _unique_day(batch)
+
+
+def _unique_day(events: list[dict]) -> Iterator[dict]:
+    taken = {ev["id"] for ev in events}
+    seen = set()
+    for ev in events:
+        if ev["id"] not in seen:
+            seen.add(ev["id"])
+            yield ev
+            continue
+        base = f"{ev['id']}-{ev['start'][11:13]}{ev['start'][14:16]}"
+        candidate, n = base, 1
+        while candidate in taken:
+            n += 1
+            candidate = f"{base}-{n}"
+        taken.add(candidate)
+        seen.add(candidate)
+        yield {**ev, "id": candidate}
@@ -0,0 +1,204 @@
+"""
+sawc_pipeline.py — Publish every feed from one in-memory event set
+
+The sheet is parsed once into the events.json records; each published file is
+then an output stage rendering that same list:
+
+  json            events.json                       (generate_events_from_clean.py)
+  utc-ics         calendar.ics, UTC times           (generate_events_from_clean.py --ics)
+  tzid-ics        sawc-events.ics, TZID times + VTIMEZONE (generate_ics.py)
+  vtimezone-ics   TZID times + VTIMEZONE block      (generate_ics_refactored.py)
+  next-event      the next few events, "future" slice (generate_events_from_clean.py --next-event)
+
+Stages are registered by the module that owns the format, with @stage(name),
+so a new output only has to decorate its renderer:
+
+  @stage("sitemap", options={"baseUrl": "https://sydneyawc.com"})
+  def write_sitemap(events, out, cache=None, baseUrl=...): ...
+
+- publish(events, targets, options, caches)   write [(stage, path), ...]
+                                              concurrently, one thread per file
+- publish_incremental(events, targets, ...)    the same, with each target's
+                                              cache kept in its manifest
+- parse_target("tzid-ics=feed.ics")           CLI form of a target
+
+A target may name a time-window slice of the events (sawc_slices.py) after
+the stage, STAGE:SLICE, e.g. "tzid-ics:upcoming" or "json:year" with a
+{year} path (one file per year). Sliced targets share one EventIndex built
+per publish(); options "now" (datetime, default the current time) and
+"months" (default 6) set the upcoming window. A stage may declare a default
+slice, e.g. next-event renders only "future" events.
+
+A renderer gets the shared events list (it must not modify it), a text
+stream, and its own options picked from `options` by name. Stages that
+declare cache_params also get a cache (content key -> rendered block, as in
+sawc_calendar.iter_ics_lines) that publish() keeps per output path; the
+cache_params name the options that invalidate it, which are the params of
+the <path>.manifest.json sidecar (load_caches/save_caches).
+
+Rendering is pure Python, so the threads mostly overlap file writes and gzip
+compression, which release the GIL. Under --timings each render is timed as
+a stage named after it ("json", "tzid-ics", ...) and file output as "write".
+"""
+
+from __future__ import annotations
+
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Callable, NamedTuple
+
+from sawc_io import open_output
+from sawc_manifest import load_manifest, manifest_path, save_manifest, write_if_changed
+from sawc_slices import UPCOMING_MONTHS, YEAR_FIELD, EventIndex, check_slice, expand_years, select
+from sawc_timings import TIMINGS
+
+
+class Stage(NamedTuple):
+    name: str
+    render: Callable[..., None]           # render(events, out, cache=None, **options)
+    newline: str | None                   # "" = write as-is (CRLF ICS); None = like open(..., "w")
+    options: dict                         # option name -> default
+    cache_params: tuple[str, ...] | None  # None: the stage keeps no cache
+    slice: str | None = None              # default slice (sawc_slices), None = every event
+
+
+STAGES: dict[str, Stage] = {}
+
+
+def stage(name: str, *, newline: str | None = None, options: dict | None = None,
+          cache_params: tuple[str, ...] | None = None, slice: str | None = None):
+    """Register the decorated renderer as output stage `name`."""
+    def register(render):
+        if name in STAGES:
+            raise ValueError(f"Output stage registered twice: {name}")
+        STAGES[name] = Stage(name, render, newline, dict(options or {}), cache_params, slice)
+        return render
+    return register
+
+
+def split_name(name: str) -> tuple[Stage, str | None]:
+    """"STAGE[:SLICE]" -> (stage, slice or the stage's default slice)."""
+    base, _, part = name.partition(":")
+    st = STAGES[base]
+    return st, part or st.slice
+
+
+def parse_target(spec: str) -> tuple[str, str]:
+    """"STAGE[:SLICE]=PATH" -> (name, path); raises ValueError for an unknown stage or slice."""
+    name, sep, path = spec.partition("=")
+    if not sep or not path:
+        raise ValueError(f"Expected STAGE=PATH, got {spec!r}")
+    base = name.partition(":")[0]
+    if base not in STAGES:
+        raise ValueError(f"Unknown output stage {base!r} (choose from {', '.join(STAGES)})")
+    check_target(name, path)
+    return name, path
+
+
+def check_target(name: str, path: str) -> None:
+    """Raise ValueError if the target's slice is unknown or doesn't fit its path."""
+    _, part = split_name(name)
+    if part is not None:
+        check_slice(part, path)
+    elif YEAR_FIELD in path:
+        raise ValueError(f"{YEAR_FIELD} in {path!r} needs the year slice ({name}:year=PATH)")
+
+
+def expand_targets(targets: list[tuple[str, str]], events: list[dict] | EventIndex) -> list[tuple[str, str]]:
+    """Targets with every :year target replaced by one target per year in events."""
+    if not any(split_name(name)[1] == "year" for name, _ in targets):
+        return list(targets)
+    index = events if isinstance(events, EventIndex) else EventIndex(events)
+    expanded = []
+    for name, path in targets:
+        st, part = split_name(name)
+        if part is None:
+            expanded.append((name, path))
+        else:
+            expanded += [(f"{st.name}:{year}", p) for year, p in expand_years(part, path, index)]
+    return expanded
+
+
+def _stage_options(st: Stage, options: dict) -> dict:
+    return {k: options.get(k, default) for k, default in st.options.items()}
+
+
+def _cache_params(st: Stage, options: dict) -> dict:
+    kwargs = _stage_options(st, options)
+    return {k: kwargs[k] for k in st.cache_params}
+
+
+def load_caches(targets: list[tuple[str, str]], options: dict, caches: dict) -> None:
+    """Fill caches (path -> cache) from the targets' manifests, where missing."""
+    for name, path in targets:
+        st, _ = split_name(name)
+        if st.cache_params is not None and path not in caches:
+            caches[path] = load_manifest(manifest_path(path), _cache_params(st, options))
+
+
+def save_caches(targets: list[tuple[str, str]], options: dict, caches: dict) -> None:
+    """Store each target's cache in its manifest (after a publish)."""
+    for name, path in targets:
+        st, _ = split_name(name)
+        if st.cache_params is not None and path in caches:
+            save_manifest(manifest_path(path), _cache_params(st, options), caches[path])
+
+
+def publish(events: list[dict], targets: list[tuple[str, str]], options: dict | None = None,
+            caches: dict | None = None) -> list[str]:
+    """Render events through every (stage, path) target, concurrently.
+
+    Without caches each file is streamed through open_output (atomic, "-" for
+    stdout, *.gz gzipped). With caches (path -> cache dict, updated in place)
+    caching stages reuse unchanged blocks, and a file is only rewritten if
+    its content changes (sawc_manifest.write_if_changed, also atomic and gzipped). Sliced targets render only their window of the events
+    (:year targets are expanded first, see expand_targets). Returns the paths
+    written, in target order.
+    """
+    options = options or {}
+    for name, path in targets:
+        check_target(name, path)
+    index = None
+    if any(split_name(name)[1] is not None for name, _ in targets):
+        index = EventIndex(events)  # one sort for every slice
+        targets = expand_targets(targets, index)
+    paths = [path for _, path in targets]
+    dupes = sorted({p for p in paths if paths.count(p) > 1})
+    if dupes:
+        raise ValueError(f"Output path used by more than one stage: {', '.join(dupes)}")
+
+    def run(target: tuple[str, str]) -> bool:
+        name, path = target
+        st, part = split_name(name)
+        kwargs = _stage_options(st, options)
+        selected = events if part is None else \
+            select(index, part, options.get("now"), options.get("months", UPCOMING_MONTHS))
+        if caches is None:
+            with TIMINGS.stage("write"), open_output(path, newline=st.newline) as out:
+                with TIMINGS.stage(st.name):
+                    st.render(selected, TIMINGS.writer("write", out), **kwargs)
+            return True
+        cache = caches.setdefault(path, {}) if st.cache_params is not None else None
+        buf = io.StringIO()
+        with TIMINGS.stage(st.name):
+            st.render(selected, buf, cache, **kwargs)
+        with TIMINGS.stage("write"):
+            return write_if_changed(path, buf.getvalue(), st.newline)
+
+    if len(targets) == 1:
+        written = [run(targets[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            written = list(pool.map(run, targets))
+    return [path for path, w in zip(paths, written) if w]
+
+
+def publish_incremental(events: list[dict], targets: list[tuple[str, str]], options: dict | None = None) -> list[str]:
+    """publish() with every cache loaded from, and saved back to, its target's manifest."""
+    options = options or {}
+    targets = expand_targets(targets, events)
+    caches: dict = {}
+    load_caches(targets, options, caches)
+    written = publish(events, targets, options, caches)
+    save_caches(targets, options, caches)
+    return written
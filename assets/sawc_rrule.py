@@ -0,0 +1,234 @@
+"""
+sawc_rrule.py — Fold regular meetings into RRULE series for the ICS generators
+
+Most club meetings sit in a fixed monthly slot (first Thursday, 19:30–21:30).
+compress() finds those slots in the sorted events and replaces each run of
+them with one Series, which the generators render as:
+
+  master VEVENT     DTSTART of the first meeting, RRULE:FREQ=MONTHLY;
+                    BYDAY=1TH;COUNT=n, EXDATE for slots without a meeting,
+                    and the text most meetings of the run share
+  overrides         one VEVENT per meeting whose text differs, with the
+                    master's UID and RECURRENCE-ID set to its slot
+
+Cancellations ("NO MEETING", "Cancelled") in a slot become EXDATEs instead of
+events. A run is only folded when at least MIN_SHARED meetings match the
+master, so a schedule where every meeting has its own topic stays as plain
+VEVENTs. Runs split where more than MAX_MISSING slots in a row are empty.
+
+expand_calendar() is a reference reader for exactly what the generators
+emit; tests/test_rrule.py uses it to prove a compressed feed expands to
+the plain feed's events.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Callable, NamedTuple
+
+from sawc_ics import fold
+from sawc_time import iso_to_ics_local
+
+MIN_SHARED = 3   # meetings that must match the master for a run to be folded
+MAX_MISSING = 3  # empty slots in a row that end a run
+CANCELLED = re.compile(r"\s*(no meeting|cancel+ed)\b", re.IGNORECASE)
+# Fields a meeting must share with the master to need no override
+CONTENT_FIELDS = ("title", "location", "description", "meetingActivity", "miniCompetition", "comments")
+DAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+class Series(NamedTuple):
+    master: dict                       # an events.json record: the first slot, the shared text
+    rule: str                          # RRULE value
+    exdates: list[str]                 # slot start ISO strings with no meeting
+    overrides: list[dict]              # meetings whose text differs from the master
+    members: list[int]                 # indexes of the folded events (cancellations included)
+
+
+def _wall(iso: str) -> datetime:
+    return datetime.fromisoformat(iso.replace("Z", "+00:00"))
+
+
+def is_cancelled(ev: dict) -> bool:
+    return bool(CANCELLED.match(ev.get("title") or ev.get("meetingActivity") or ""))
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The n-th (1-4, or -1 for last) weekday of a month."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _slot(ev: dict) -> tuple | None:
+    """(weekday, n, clock, wall duration) of a monthly slot, or None."""
+    try:
+        start, end = _wall(ev["start"]), _wall(ev["end"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    wall = end.replace(tzinfo=None) - start.replace(tzinfo=None)
+    if wall != end - start or wall <= timedelta(0):  # spans a DST change: keep as is
+        return None
+    n = (start.day - 1) // 7 + 1
+    return start.weekday(), (-1 if n == 5 else n), start.timetz().replace(tzinfo=None), wall
+
+
+def _content(ev: dict) -> tuple:
+    return tuple(ev.get(k) or "" for k in CONTENT_FIELDS)
+
+
+def _slot_iso(ev: dict, day: date) -> str:
+    """Wall-clock ISO start of ev's slot on day (the offset is left to TZID)."""
+    start = _wall(ev["start"]).replace(tzinfo=None)
+    return datetime.combine(day, start.time()).isoformat()
+
+
+def _fold_run(events: list[dict], run: list[int], key: tuple) -> Series | None:
+    weekday, n = key[0], key[1]
+    while run and is_cancelled(events[run[0]]):  # DTSTART must be a real meeting
+        run = run[1:]
+    while run and is_cancelled(events[run[-1]]):
+        run = run[:-1]
+    if len(run) < 2:
+        return None
+    starts = {i: _wall(events[i]["start"]) for i in run}
+    months = {(starts[i].year, starts[i].month): i for i in run}
+    y, m = starts[run[0]].year, starts[run[0]].month
+    last = starts[run[-1]]
+    slots = []
+    while (y, m) <= (last.year, last.month):
+        slots.append(((y, m), nth_weekday(y, m, weekday, n)))
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+
+    held = [i for i in run if not is_cancelled(events[i])]
+    shared, count = Counter(_content(events[i]) for i in held).most_common(1)[0]
+    if count < MIN_SHARED:
+        return None
+    template = next(events[i] for i in held if _content(events[i]) == shared)
+    head = events[run[0]]
+    master = {**template, "id": head.get("id") or template.get("id"),
+              "start": head["start"], "end": head["end"]}
+    exdates = [_slot_iso(head, day) for ym, day in slots
+               if ym not in months or is_cancelled(events[months[ym]])]
+    overrides = [events[i] for i in held if _content(events[i]) != shared]
+    rule = f"FREQ=MONTHLY;BYDAY={n}{DAYS[weekday]};COUNT={len(slots)}"
+    return Series(master, rule, exdates, overrides, run)
+
+
+def compress(events: list[dict]) -> list[int | Series]:
+    """Plan a feed: event indexes and Series, in the order of the sorted events.
+
+    events must be sorted by start (as events.json is). Each event index
+    appears once, either on its own or among a Series' members.
+    """
+    groups: dict[tuple, list[int]] = {}
+    for i, ev in enumerate(events):
+        key = _slot(ev)
+        if key is not None:
+            groups.setdefault(key, []).append(i)
+
+    series: dict[int, Series] = {}  # first member -> series
+    folded: set[int] = set()
+    for key, members in groups.items():
+        weekday, n = key[0], key[1]
+        runs, prev = [], None
+        for i in members:
+            start = _wall(events[i]["start"])
+            if start.date() != nth_weekday(start.year, start.month, weekday, n):
+                continue  # e.g. a 4th Thursday that is not the last one
+            month = start.year * 12 + start.month
+            if prev is not None and month == prev:
+                continue  # second event in the same slot: stays a plain event
+            if prev is None or month - prev - 1 > MAX_MISSING:
+                runs.append([])
+            runs[-1].append(i)
+            prev = month
+        for run in runs:
+            s = _fold_run(events, run, key)
+            if s is not None:
+                series[s.members[0]] = s
+                folded.update(s.members)
+
+    plan: list[int | Series] = []
+    for i in range(len(events)):
+        if i in series:
+            plan.append(series[i])
+        elif i not in folded:
+            plan.append(i)
+    return plan
+
+
+def series_lines(s: Series, render: Callable[[dict], list[str]], tzid: str) -> list[str]:
+    """The master VEVENT plus its overrides, from a generator's VEVENT renderer."""
+    lines = render(s.master)
+    at = next(i for i, line in enumerate(lines) if line.startswith("DTEND")) + 1
+    extra = [f"RRULE:{s.rule}"]
+    if s.exdates:
+        extra.append(fold(f"EXDATE;TZID={tzid}:" + ",".join(iso_to_ics_local(d) for d in s.exdates)))
+    lines[at:at] = extra
+    for ev in s.overrides:
+        block = render({**ev, "id": s.master["id"]})
+        block.insert(2, f"RECURRENCE-ID;TZID={tzid}:{iso_to_ics_local(ev['start'])}")
+        lines += block
+    return lines
+
+
+# ---- reference expansion (for checks) ----
+
+def _unfold(text: str) -> list[str]:
+    return text.replace("\r\n ", "").split("\r\n")
+
+
+def expand_calendar(text: str) -> list[tuple[str, ...]]:
+    """Every instance in a generated feed as sorted (DTSTART, DTEND, SUMMARY,
+    LOCATION, DESCRIPTION) wall-clock tuples, with RRULE/EXDATE/RECURRENCE-ID
+    applied. Only understands the MONTHLY;BYDAY=nDD;COUNT=n rules compress()
+    writes.
+    """
+    events, current = [], None
+    for line in _unfold(text):
+        if line == "BEGIN:VEVENT":
+            current = {}
+        elif line == "END:VEVENT":
+            events.append(current)
+            current = None
+        elif current is not None:
+            name, _, value = line.partition(":")
+            current[name.split(";")[0]] = value
+
+    def fields(ev: dict, start: str, end: str) -> tuple[str, ...]:
+        return start, end, ev.get("SUMMARY", ""), ev.get("LOCATION", ""), ev.get("DESCRIPTION", "")
+
+    overrides = {(ev["UID"], ev["RECURRENCE-ID"]): ev for ev in events if "RECURRENCE-ID" in ev}
+    instances = []
+    for ev in events:
+        if "RECURRENCE-ID" in ev:
+            continue
+        if "RRULE" not in ev:
+            instances.append(fields(ev, ev["DTSTART"], ev["DTEND"]))
+            continue
+        rule = dict(part.split("=") for part in ev["RRULE"].split(";"))
+        m = re.fullmatch(r"(-?\d)([A-Z]{2})", rule["BYDAY"])
+        n, weekday = int(m.group(1)), DAYS.index(m.group(2))
+        start = datetime.strptime(ev["DTSTART"], "%Y%m%dT%H%M%S")
+        length = datetime.strptime(ev["DTEND"], "%Y%m%dT%H%M%S") - start
+        skip = set(ev.get("EXDATE", "").split(",")) - {""}
+        y, mo = start.year, start.month
+        for _ in range(int(rule["COUNT"])):
+            at = datetime.combine(nth_weekday(y, mo, weekday, n), start.time())
+            y, mo = (y + 1, 1) if mo == 12 else (y, mo + 1)
+            rid = at.strftime("%Y%m%dT%H%M%S")
+            if rid in skip:
+                continue
+            inst = overrides.pop((ev["UID"], rid), None)
+            if inst is not None:
+                instances.append(fields(inst, inst["DTSTART"], inst["DTEND"]))
+            else:
+                instances.append(fields(ev, rid, (at + length).strftime("%Y%m%dT%H%M%S")))
+    if overrides:
+        raise ValueError(f"RECURRENCE-ID without a matching instance: {sorted(overrides)[0]}")
+    return sorted(instances)
@@ -0,0 +1,113 @@
+"""
+sawc_search.py — Inverted search index for the results page's search box
+
+results.js used to lower-case and substring-match every entry on each
+keystroke. build_results_index.py now writes results/<year>.search.json
+next to each shard:
+
+  {"version": 1, "size": 125,
+   "grams":    {"kum": [3, 1, 40], ...},    # trigram -> entry positions
+   "prefixes": {"k": [...], "ku": [...]}}   # 1-2 char word prefix -> positions
+
+Positions index the shard's "entries" and are delta-encoded (first value,
+then gaps), which keeps the numbers short. The searchable text of an entry
+is the same as before, "<winemaker> <wine style> <wine name>", folded:
+NFKD, combining marks U+0300-U+036F dropped, lower-cased, so "rose" finds
+"Rosé". results.js folds the query the same way (String.normalize).
+
+- query of 3+ chars   intersect the postings of its trigrams, then confirm
+                      each candidate with a substring test; same hits as a
+                      full scan
+- 1-2 chars           entries with a word starting with the query (a scan
+                      for one letter matches nearly everything)
+
+search() is the reference implementation used by bench_search.py.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Iterable
+
+INDEX_VERSION = 1
+GRAM = 3
+
+_MARKS = re.compile("[\u0300-\u036f]")
+
+
+def fold(text: str) -> str:
+    """Diacritic- and case-folded text, as results.js computes it."""
+    return _MARKS.sub("", unicodedata.normalize("NFKD", text)).lower()
+
+
+def entry_text(entry: dict, entrant: dict | None) -> str:
+    """The searchable text results.js builds for an entry (before folding)."""
+    entrant = entrant or {}
+    wine = entry.get("wine") or {}
+    winemaker = entrant.get("display_name") or entrant.get("name") or "Unnamed entrant"
+    return f"{winemaker} {wine.get('style') or wine.get('name') or ''} {wine.get('name') or ''}"
+
+
+def grams(text: str) -> set[str]:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def prefixes(text: str) -> set[str]:
+    return {word[:n] for word in text.split() for n in range(1, GRAM)}
+
+
+def delta_encode(positions: list[int]) -> list[int]:
+    return [p - q for p, q in zip(positions, [0] + positions[:-1])]
+
+
+def delta_decode(gaps: Iterable[int]) -> list[int]:
+    out, total = [], 0
+    for gap in gaps:
+        total += gap
+        out.append(total)
+    return out
+
+
+def build_index(texts: list[str]) -> dict:
+    """Search index over already folded texts (one per entry, in shard order)."""
+    gram_postings: dict[str, list[int]] = {}
+    prefix_postings: dict[str, list[int]] = {}
+    for pos, text in enumerate(texts):
+        for gram in grams(text):
+            gram_postings.setdefault(gram, []).append(pos)
+        for prefix in prefixes(text):
+            prefix_postings.setdefault(prefix, []).append(pos)
+    return {
+        "version": INDEX_VERSION,
+        "size": len(texts),
+        "grams": {g: delta_encode(p) for g, p in sorted(gram_postings.items())},
+        "prefixes": {p: delta_encode(v) for p, v in sorted(prefix_postings.items())},
+    }
+
+
+def search(index: dict, texts: list[str], query: str, decoded: dict | None = None) -> list[int]:
+    """Positions of the entries matching query (see the module docstring).
+
+    texts are the folded entry texts used to confirm trigram candidates;
+    decoded, if given, memoizes decoded postings across queries.
+    """
+    q = fold(query.strip())
+    if not q:
+        return list(range(index["size"]))
+    decoded = {} if decoded is None else decoded
+
+    def postings(table: str, key: str) -> list[int]:
+        if (table, key) not in decoded:
+            decoded[table, key] = delta_decode(index[table].get(key, ()))
+        return decoded[table, key]
+
+    if len(q) < GRAM:
+        return postings("prefixes", q)
+    lists = sorted((postings("grams", g) for g in grams(q)), key=len)
+    hits = set(lists[0])
+    for other in lists[1:]:
+        hits.intersection_update(other)
+        if not hits:
+            break
+    return [pos for pos in sorted(hits) if q in texts[pos]]
@@ -0,0 +1,26 @@
+"""
+sawc_sheets.py — Header matching shared by the spreadsheet readers
+
+generate_events_from_clean.py (calendar sheets) and ingest_results.py
+(judging sheets) find their columns by name through an ALIASES table, so a
+sheet may say "Venue" or "Location", "Palate" or "Taste":
+
+- find_col(sheet, aliases, key)   the first column whose trimmed, lowercased
+                                  header is one of aliases[key]
+
+sheet is anything with a .columns sequence (a pandas DataFrame or the stdlib
+engine's CsvSheet), so importing this module does not import pandas.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+
+def find_col(sheet: Any, aliases: Mapping[str, set[str]], key: str) -> Any | None:
+    """The first column of sheet whose header matches aliases[key] (case-insensitive), or None."""
+    names = aliases.get(key, set())
+    for col in sheet.columns:
+        if str(col).strip().lower() in names:
+            return col
+    return None
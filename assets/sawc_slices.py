@@ -0,0 +1,132 @@
+"""
+sawc_slices.py — Time-window slices of the event list
+
+The published feeds used to carry every event ever listed; the site and most
+subscribers only want what is coming up. EventIndex keeps the events sorted
+by start with parallel start/end arrays, so a window is two bisects instead
+of a scan:
+
+  upcoming        not yet ended, starting within --months (default 6) of now
+  future          not yet ended, no limit
+  2026            events starting in that (local) year
+  year            one output per year present: the path must contain {year}
+                  (e.g. sawc-events-{year}.ics -> sawc-events-2025.ics, ...)
+  FROM..TO        events starting on FROM..TO (ISO dates, inclusive; either
+                  side may be left out: 2025-07-01.., ..2025-12-31)
+
+"Ended" matches the site scripts: an event without an end runs until
+23:59:59.999 local time on its start day. Slices are the optional second part
+of a pipeline target, STAGE:SLICE=PATH (see sawc_pipeline.parse_target).
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+
+from sawc_events import Event
+
+UPCOMING_MONTHS = 6
+YEAR_FIELD = "{year}"
+_RANGE = re.compile(r"(\d{4}-\d{2}-\d{2})?\.\.(\d{4}-\d{2}-\d{2})?$")
+
+
+def _epoch(iso: str) -> float:
+    return datetime.fromisoformat(iso).timestamp()
+
+
+def _start(ev: dict) -> float:
+    return ev.start_ts if isinstance(ev, Event) else _epoch(ev["start"])
+
+
+def _end(ev: dict) -> float:
+    if isinstance(ev, Event):
+        return ev.end_ts
+    if ev.get("end"):
+        return _epoch(ev["end"])
+    start = datetime.fromisoformat(ev["start"])
+    return datetime.combine(start.date(), time(23, 59, 59, 999000), start.tzinfo).timestamp()
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    """moment + months calendar months, clamped to the end of shorter months."""
+    month = moment.month - 1 + months
+    year, month = moment.year + month // 12, month % 12 + 1
+    first_of_next = date(year + month // 12, month % 12 + 1, 1)
+    return moment.replace(year=year, month=month, day=min(moment.day, (first_of_next - timedelta(days=1)).day))
+
+
+class EventIndex:
+    """Events sorted by start (ties keep list order) with bisectable bounds.
+
+    starts/ends are epoch seconds; longest is the longest event's duration, so
+    every event overlapping a moment t starts in [t - longest, t].
+    """
+
+    def __init__(self, events: list[dict]):
+        starts = [_start(ev) for ev in events]
+        order = sorted(range(len(events)), key=lambda i: (starts[i], i))
+        self.events = [events[i] for i in order]
+        self.starts = [starts[i] for i in order]
+        self.ends = [_end(ev) for ev in self.events]
+        self.longest = max((e - s for s, e in zip(self.starts, self.ends)), default=0.0)
+        self.days = [ev["start"][:10] for ev in self.events]  # local start dates
+        # Mixed offsets could put a local date out of epoch order; then scan
+        self._days_sorted = all(a <= b for a, b in zip(self.days, self.days[1:]))
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def overlapping(self, since: datetime, until: datetime | None = None) -> list[dict]:
+        """Events not ended by `since` that start before `until` (None: any time)."""
+        t = since.timestamp()
+        lo = bisect_left(self.starts, t - self.longest)
+        hi = len(self.starts) if until is None else bisect_left(self.starts, until.timestamp())
+        return [self.events[i] for i in range(lo, hi) if self.ends[i] > t]
+
+    def on_days(self, first: str | None = None, last: str | None = None) -> list[dict]:
+        """Events whose local start date is within first..last (ISO, inclusive)."""
+        if not self._days_sorted:
+            return [ev for ev, day in zip(self.events, self.days)
+                    if (first is None or day >= first) and (last is None or day <= last)]
+        lo = 0 if first is None else bisect_left(self.days, first)
+        hi = len(self.days) if last is None else bisect_right(self.days, last)
+        return self.events[lo:hi]
+
+    def years(self) -> list[str]:
+        return sorted({day[:4] for day in self.days})
+
+
+def check_slice(name: str, path: str) -> None:
+    """Raise ValueError unless name is a known slice that fits path."""
+    if name not in ("upcoming", "future", "year") and not re.fullmatch(r"\d{4}", name) \
+            and not _RANGE.match(name):
+        raise ValueError(f"Unknown slice {name!r} (upcoming, future, year, YYYY or FROM..TO)")
+    if name == "year" and YEAR_FIELD not in path:
+        raise ValueError(f"The year slice writes one file per year: put {YEAR_FIELD} in {path!r}")
+    if name != "year" and YEAR_FIELD in path:
+        raise ValueError(f"{YEAR_FIELD} in {path!r} needs the year slice")
+
+
+def expand_years(name: str, path: str, index: EventIndex) -> list[tuple[str, str]]:
+    """(slice, path) per year present for the year slice; otherwise unchanged."""
+    if name != "year":
+        return [(name, path)]
+    return [(year, path.replace(YEAR_FIELD, year)) for year in index.years()]
+
+
+def select(index: EventIndex, name: str, now: datetime | None = None,
+           months: int = UPCOMING_MONTHS) -> list[dict]:
+    """The events of slice `name` (not "year": expand it first), in start order."""
+    now = now or datetime.now(timezone.utc)
+    if name == "future" or (name == "upcoming" and not months):
+        return index.overlapping(now)
+    if name == "upcoming":
+        return index.overlapping(now, add_months(now, months))
+    if re.fullmatch(r"\d{4}", name):
+        return index.on_days(f"{name}-01-01", f"{name}-12-31")
+    m = _RANGE.match(name)
+    if m:
+        return index.on_days(m.group(1), m.group(2))
+    raise ValueError(f"Unknown slice {name!r}")
@@ -0,0 +1,146 @@
+"""
+sawc_time.py — Shared timezone and datetime helpers for the feed generators
+
+Used by generate_events_from_clean.py, generate_ics.py and
+generate_ics_refactored.py so the per-event hot loops neither resolve a
+timezone nor re-parse ISO strings more than they have to:
+
+- get_tz(name)            cached tz registry (dateutil zones, as before)
+- midnight_offset(...)    LRU table of the UTC offset at local midnight per date;
+                          offsets only move on the two DST transition days a year
+- local_isoformat(dt, tz) dt.isoformat() using that table instead of tz lookups
+- zoneinfo_isoformat(...) the same string from a naive wall time via the stdlib
+                          zoneinfo zone (dateutil only near transitions), for
+                          the pandas-free CSV engine
+- iso_to_ics_local(iso)   "2025-10-02T19:30:00+10:00" -> "20251002T193000"
+- iso_to_ics_utc(iso)     "2025-10-02T19:30:00+10:00" -> "20251002T093000Z"
+
+Only the events generator needs dateutil or zoneinfo, so both are imported on
+first use.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+
+UTC = timezone.utc
+
+
+@lru_cache(maxsize=None)
+def get_tz(name: str) -> tzinfo | None:
+    """Resolve a tz name once per process (dateutil semantics; None if unknown)."""
+    from dateutil import tz
+
+    return tz.gettz(name)
+
+
+@lru_cache(maxsize=None)
+def get_zoneinfo(name: str) -> tzinfo:
+    """Resolve a zoneinfo zone once per process (ZoneInfoNotFoundError/ValueError if unknown)."""
+    from zoneinfo import ZoneInfo
+
+    return ZoneInfo(name)
+
+
+@lru_cache(maxsize=65536)
+def midnight_offset(tzname: str, ordinal: int) -> timedelta | None:
+    """UTC offset of tzname at 00:00 local time on date.fromordinal(ordinal)."""
+    return datetime.fromordinal(ordinal).replace(tzinfo=get_tz(tzname)).utcoffset()
+
+
+@lru_cache(maxsize=64)
+def offset_suffix(offset: timedelta) -> str:
+    """UTC offset as datetime.isoformat() prints it ('+10:00', '+10:04:52')."""
+    return datetime(2000, 1, 1, tzinfo=timezone(offset)).isoformat()[19:]
+
+
+def local_isoformat(dt: datetime, tzname: str) -> str:
+    """Same string as dt.isoformat() for dt in get_tz(tzname), minus the tz lookup.
+
+    If the offset at midnight is the same on this date and the next one, no
+    transition happens in between and the midnight offset applies all day;
+    transition days fall back to dt.isoformat().
+    """
+    if dt.tzinfo is None:
+        return dt.isoformat()
+    ordinal = dt.toordinal()
+    offset = midnight_offset(tzname, ordinal)
+    if offset is None or offset != midnight_offset(tzname, ordinal + 1):
+        return dt.isoformat()
+    return dt.replace(tzinfo=None).isoformat() + offset_suffix(offset)
+
+
+@lru_cache(maxsize=65536)
+def _zoneinfo_midnight(tzname: str, ordinal: int) -> tuple[timedelta, timedelta]:
+    """zoneinfo's (fold=0, fold=1) UTC offsets at 00:00 on date.fromordinal(ordinal)."""
+    midnight = datetime.fromordinal(ordinal).replace(tzinfo=get_zoneinfo(tzname))
+    return midnight.utcoffset(), midnight.replace(fold=1).utcoffset()
+
+
+@lru_cache(maxsize=65536)
+def zoneinfo_day_offset(tzname: str, ordinal: int) -> timedelta | None:
+    """UTC offset zoneinfo applies all day on date.fromordinal(ordinal), or None
+    if the offset changes anywhere from the day before to the day after."""
+    offsets = {off for o in range(ordinal - 1, ordinal + 3) for off in _zoneinfo_midnight(tzname, o)}
+    return offsets.pop() if len(offsets) == 1 else None
+
+
+def zoneinfo_isoformat(wall: datetime, tzname: str) -> str:
+    """Naive wall time localized in tzname, printed exactly as get_tz(tzname) would.
+
+    zoneinfo and dateutil agree away from transitions within 1902-2036, so
+    such days use the zoneinfo offset; around transitions (where they resolve
+    skipped/repeated times differently) and outside those years dateutil is
+    loaded and used as before.
+    """
+    if 1902 <= wall.year <= 2036:
+        offset = zoneinfo_day_offset(tzname, wall.toordinal())
+        if offset is not None:
+            return wall.isoformat() + offset_suffix(offset)
+    return local_isoformat(wall.replace(tzinfo=get_tz(tzname)), tzname)
+
+
+@lru_cache(maxsize=8192)
+def _valid_date(ymd: str) -> bool:
+    """True for a valid YYYY-MM-DD (raises ValueError otherwise)."""
+    if ymd[4:5] != "-" or ymd[7:8] != "-":
+        raise ValueError(ymd)
+    date.fromisoformat(ymd)
+    return True
+
+
+@lru_cache(maxsize=1024)
+def _valid_clock(hms: str) -> bool:
+    """True for a valid HH:MM:SS (raises ValueError otherwise)."""
+    if len(hms) != 8 or hms[2] != ":" or hms[5] != ":":
+        raise ValueError(hms)
+    time.fromisoformat(hms)
+    return True
+
+
+@lru_cache(maxsize=256)
+def _valid_suffix(suffix: str) -> bool:
+    datetime.fromisoformat("2000-01-01T00:00:00" + suffix)
+    return True
+
+
+def iso_to_ics_local(iso: str) -> str:
+    """Wall-clock part of an ISO-8601 string as YYYYMMDDTHHMMSS.
+
+    "YYYY-MM-DDTHH:MM:SS..." strings are sliced directly once their date,
+    clock and offset parts (each validated once per distinct value) parse;
+    anything else goes through fromisoformat. Raises ValueError if invalid.
+    """
+    try:
+        if iso[10:11] in ("T", " ") and _valid_date(iso[:10]) and _valid_clock(iso[11:19]) \
+                and _valid_suffix(iso[19:].replace("Z", "+00:00")):
+            return iso[0:4] + iso[5:7] + iso[8:10] + "T" + iso[11:13] + iso[14:16] + iso[17:19]
+    except ValueError:
+        pass
+    return datetime.fromisoformat(iso.replace("Z", "+00:00")).strftime("%Y%m%dT%H%M%S")
+
+
+def iso_to_ics_utc(iso: str) -> str:
+    """ISO-8601 string converted to UTC as YYYYMMDDTHHMMSSZ."""
+    return datetime.fromisoformat(iso.replace("Z", "+00:00")).astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
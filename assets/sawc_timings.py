@@ -0,0 +1,269 @@
+"""
+sawc_timings.py — Per-stage timings, peak memory and cProfile for the generators
+
+The generators mark their coarse steps with TIMINGS.stage(name):
+
+  with TIMINGS.stage("load"):
+      sheet = read_csv_sheet(p)
+
+which costs one attribute check while timings are off. Per-event functions
+(VEVENT render, fold, file writes) are only wrapped when a session starts,
+via the `instrument` mapping of session(), so normal runs pay nothing.
+
+Stage times are exclusive: time spent in a nested stage (fold inside render)
+is counted once, under the inner stage, so the stages add up to the run.
+Stages on publish() worker threads are summed across threads and can exceed
+the wall time. Peak memory is tracemalloc's peak while a coarse stage was
+active (nested stages included); per-call stages report none. tracemalloc
+slows allocation-heavy code several times over, so the stage shares are the
+useful part: take wall times from runs without --timings (bench_suite.py).
+
+- add_timing_arguments(ap)          --timings [FILE] and --profile FILE
+- session(args, script, instrument) context manager around a main() body
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Iterable, Iterator
+
+RESULTS_VERSION = 1
+
+
+class _Frame:
+    __slots__ = ("name", "memory", "start", "child", "peak")
+
+    def __init__(self, name: str, memory: bool):
+        self.name, self.memory = name, memory
+        self.child = 0.0  # time in nested stages
+        self.peak = 0     # traced peak while active (memory frames only)
+        self.start = time.perf_counter()
+
+
+class _Stage:
+    __slots__ = ("timings", "name", "frame")
+
+    def __init__(self, timings: Timings, name: str):
+        self.timings, self.name = timings, name
+
+    def __enter__(self) -> None:
+        self.frame = self.timings._push(self.name, self.timings.memory)
+
+    def __exit__(self, *exc) -> None:
+        self.timings._pop(self.frame)
+
+
+class Timings:
+    """Accumulates exclusive wall time, calls and peak memory per stage name."""
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.peak = 0
+        self.stages: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def reset(self, memory: bool = True) -> None:
+        self.stages = {}
+        self.memory = memory
+        self.peak = 0
+        self.enabled = True
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _traced_peak(self) -> int:
+        """tracemalloc's peak since the last call, which starts a new interval."""
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        self.peak = max(self.peak, peak)
+        return peak
+
+    def _push(self, name: str, memory: bool) -> _Frame:
+        stack = self._stack()
+        if memory:
+            peak = self._traced_peak()
+            for frame in stack:  # the interval so far belongs to every open stage
+                frame.peak = max(frame.peak, peak)
+        frame = _Frame(name, memory)
+        stack.append(frame)
+        return frame
+
+    def _pop(self, frame: _Frame) -> None:
+        elapsed = time.perf_counter() - frame.start
+        stack = self._stack()
+        stack.pop()
+        if frame.memory:
+            peak = self._traced_peak()
+            for open_frame in stack:
+                open_frame.peak = max(open_frame.peak, peak)
+            frame.peak = max(frame.peak, peak)
+        if stack:
+            stack[-1].child += elapsed
+        with self._lock:
+            entry = self.stages.get(frame.name)
+            if entry is None:
+                entry = self.stages[frame.name] = {"seconds": 0.0, "calls": 0, "peakBytes": None}
+            entry["seconds"] += elapsed - frame.child
+            entry["calls"] += 1
+            if frame.memory:
+                entry["peakBytes"] = max(entry["peakBytes"] or 0, frame.peak)
+
+    def stage(self, name: str):
+        """Context manager timing one step (a no-op unless a session is running)."""
+        return _Stage(self, name) if self.enabled else contextlib.nullcontext()
+
+    def wrap(self, name: str, func):
+        """func, timing every call as stage name.
+
+        Per-call stages skip the memory bookkeeping; their allocations count
+        towards the enclosing stage's peak.
+        """
+        push, pop = self._push, self._pop
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            frame = push(name, False)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                pop(frame)
+        return timed
+
+    def iterate(self, name: str, items: Iterable) -> Iterable:
+        """items, timing each next() as stage name (e.g. an incremental JSON reader)."""
+        return self._iterate(name, items) if self.enabled else items
+
+    def _iterate(self, name: str, items: Iterable) -> Iterator:
+        step = self.wrap(name, iter(items).__next__)
+        while True:
+            try:
+                item = step()
+            except StopIteration:
+                return
+            yield item
+
+    def writer(self, name: str, out):
+        """out, with write() timed as stage name."""
+        return _TimedWriter(self, name, out) if self.enabled else out
+
+    def report(self) -> dict:
+        return {name: {**entry, "seconds": round(entry["seconds"], 6)} for name, entry in self.stages.items()}
+
+
+class _TimedWriter:
+    def __init__(self, timings: Timings, name: str, out):
+        self.write = timings.wrap(name, out.write)
+        self._out = out
+
+    def __getattr__(self, attr):
+        return getattr(self._out, attr)
+
+
+TIMINGS = Timings()
+
+
+def add_timing_arguments(ap) -> None:
+    ap.add_argument("--timings", nargs="?", const="-", metavar="FILE",
+                    help="Report per-stage time and peak memory on stderr; with FILE also save them as JSON")
+    ap.add_argument("--profile", metavar="FILE", help="Write cProfile stats of the run to FILE (pstats format)")
+
+
+def _max_rss_kb() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def results(script: str, options: dict, wall: float, peak: int | None) -> dict:
+    """A run's JSON record, as saved by --timings FILE and bench_suite.py."""
+    return {
+        "version": RESULTS_VERSION,
+        "script": script,
+        "options": options,
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "wallSeconds": round(wall, 6),
+        "peakBytes": peak,
+        "maxRssKb": _max_rss_kb(),
+        "stages": TIMINGS.report(),
+    }
+
+
+def format_table(record: dict) -> str:
+    lines = [f"{'stage':<16} {'seconds':>9} {'share':>6} {'calls':>8} {'peak MB':>8}"]
+    wall = record["wallSeconds"] or 1e-9
+    for name, entry in sorted(record["stages"].items(), key=lambda kv: -kv[1]["seconds"]):
+        peak = "-" if entry["peakBytes"] is None else f"{entry['peakBytes'] / 1e6:.1f}"
+        lines.append(f"{name:<16} {entry['seconds']:>9.4f} {entry['seconds'] / wall:>6.0%} "
+                     f"{entry['calls']:>8} {peak:>8}")
+    rest = record["wallSeconds"] - sum(entry["seconds"] for entry in record["stages"].values())
+    if rest > 0:  # stages on worker threads can add up to more than the wall time
+        lines.append(f"{'(other)':<16} {rest:>9.4f} {rest / wall:>6.0%}")
+    peak = "" if record["peakBytes"] is None else f"{record['peakBytes'] / 1e6:>8.1f}"
+    lines.append(f"{'total (wall)':<16} {record['wallSeconds']:>9.4f} {'':>6} {'':>8} {peak}")
+    return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def session(args, script: str, instrument: Iterable[tuple[object, str, str]] = ()) -> Iterator[None]:
+    """Run a main() body with args.timings / args.profile honoured.
+
+    instrument lists (module, function name, stage) to wrap for the session,
+    e.g. (generate_ics, "to_vevent", "render"); they are restored afterwards.
+    """
+    timings, profile = getattr(args, "timings", None), getattr(args, "profile", None)
+    if not timings and not profile:
+        yield
+        return
+
+    patched = []
+    if timings:
+        tracemalloc.start()
+        TIMINGS.reset()
+        for module, attr, name in instrument:
+            patched.append((module, attr, getattr(module, attr)))
+            setattr(module, attr, TIMINGS.wrap(name, getattr(module, attr)))
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - t0
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile)
+            print(f"cProfile stats written to {profile} (python -m pstats {profile})", file=sys.stderr)
+        if timings:
+            for module, attr, func in patched:
+                setattr(module, attr, func)
+            peak = max(TIMINGS.peak, tracemalloc.get_traced_memory()[1])
+            TIMINGS.enabled = False
+            tracemalloc.stop()
+            options = {k: v for k, v in vars(args).items() if k not in ("timings", "profile")}
+            record = results(script, options, wall, peak)
+            print(format_table(record), file=sys.stderr)
+            if timings != "-":
+                with open(timings, "w", encoding="utf-8") as f:
+                    json.dump(record, f, indent=2)
+                    f.write("\n")
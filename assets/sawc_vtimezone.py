@@ -0,0 +1,291 @@
+"""
+sawc_vtimezone.py — VTIMEZONE blocks from the zoneinfo database
+
+generate_ics_refactored.py used to carry a hand-written Australia/Sydney
+block (and nothing for any other --tzid), and generate_ics.py none at all,
+leaving clients to resolve the TZID themselves. The generators now take the
+block from here:
+
+- vtimezone_lines(tzid, years)  folded VTIMEZONE lines for a zone, covering
+                                the (first, last) local years of a feed
+- event_years(events)           that span for a list of events.json records
+                                or Events (None without events)
+- file_years(path)              the same from an events.json's bytes, for
+                                the streaming writers, without parsing JSON
+
+The block is computed from the system zoneinfo database (or the tzdata
+package): UTC offsets are sampled once a day over the span and each change is
+bisected to the second. It holds the last transition before the span (or a
+fixed observance if there is none) and every transition in it. Consecutive
+years with the same transition rule become one observance with
+RRULE:FREQ=YEARLY;BYMONTH=m;BYDAY=nDD;COUNT=k, and the remaining one-off
+transitions of an observance are listed as RDATEs, so a Sydney feed over
+2024-2026 is two observances.
+
+Blocks are cached per (tzid, first year, last year) in the process and in
+vtimezone.json under $SAWC_CACHE_DIR (default ~/.cache/sawc, or
+$XDG_CACHE_HOME/sawc), so batch builds with many zones and worker processes
+(build_calendars.py) compute each block once. An entry records a digest of
+the zone's TZif file and is recomputed after a tzdata update. The cache is
+best-effort: an unwritable cache directory only costs the recomputation.
+"""
+
+from __future__ import annotations
+
+import calendar
+import contextlib
+import hashlib
+import json
+import os
+import re
+import time
+import zoneinfo
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Mapping, NamedTuple
+
+from sawc_events import Event, EventCache
+from sawc_ics import fold
+from sawc_io import open_output
+from sawc_rrule import DAYS
+from sawc_time import get_zoneinfo
+
+CACHE_VERSION = 1
+CACHE_FILE = "vtimezone.json"
+_DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
+_YEARS = re.compile(rb'"(?:start|end)"\s*:\s*"(\d{4})-')
+
+
+class Transition(NamedTuple):
+    ts: int            # epoch seconds of the change
+    before: int        # UTC offset (seconds) until then
+    after: int         # UTC offset from then on
+    dst: bool          # the new observance is daylight time
+    name: str | None   # its abbreviation
+
+
+# ---- spans ----
+
+def _year(iso) -> int | None:
+    return int(iso[:4]) if isinstance(iso, str) and iso[:4].isdigit() else None
+
+
+def event_years(events: Iterable[Mapping]) -> tuple[int, int] | None:
+    """(first, last) local year any event starts or ends in; None if there are none."""
+    if isinstance(events, EventCache):  # straight from the records, no Event objects
+        span = events.local_range()
+        return span and (time.gmtime(span[0]).tm_year, time.gmtime(span[1]).tm_year)
+    first = last = None
+    for ev in events:
+        if isinstance(ev, Event):
+            years = (time.gmtime(ev.start_ts + ev.start_offset).tm_year,
+                     time.gmtime(ev.end_ts + ev.end_offset).tm_year)
+        else:
+            years = (_year(ev.get("start")), _year(ev.get("end")))
+        for year in years:
+            if year is not None:
+                first = year if first is None or year < first else first
+                last = year if last is None or year > last else last
+    return None if first is None else (first, last)
+
+
+def file_years(path: str | Path) -> tuple[int, int] | None:
+    """event_years() of an events.json, from a scan of its "start"/"end" values."""
+    first = last = None
+    tail = b""
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            data = tail + block
+            for m in _YEARS.finditer(data):
+                year = int(m.group(1))
+                first = year if first is None or year < first else first
+                last = year if last is None or year > last else last
+            tail = data[-64:]  # a value cut at the block end is matched with the next block
+    return None if first is None else (first, last)
+
+
+# ---- transitions ----
+
+def _state(zone, ts: int) -> tuple[int, bool, str | None]:
+    local = datetime.fromtimestamp(ts, zone)
+    return int(local.utcoffset().total_seconds()), bool(local.dst()), local.tzname()
+
+
+def transitions(tzid: str, start: int, end: int) -> list[Transition]:
+    """Every offset, DST or name change of tzid between two epoch seconds."""
+    zone = get_zoneinfo(tzid)
+    found = []
+    t, before = start, _state(zone, start)
+    while t < end:
+        probe = min(t + _DAY, end)
+        if _state(zone, probe) == before:
+            t = probe
+            continue
+        lo, hi = t, probe  # the change happens in (lo, hi]
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if _state(zone, mid) == before:
+                lo = mid
+            else:
+                hi = mid
+        after = _state(zone, hi)
+        found.append(Transition(hi, before[0], after[0], after[1], after[2]))
+        t, before = hi, after
+    return found
+
+
+def _utc(year: int) -> int:
+    return calendar.timegm((year, 1, 1, 0, 0, 0))
+
+
+def _wall(ts: int, offset: int) -> datetime:
+    return _EPOCH + timedelta(seconds=ts + offset)
+
+
+def _offset(seconds: int) -> str:
+    sign = "-" if seconds < 0 else "+"
+    h, rest = divmod(abs(seconds), 3600)
+    m, s = divmod(rest, 60)
+    return f"{sign}{h:02d}{m:02d}" + (f"{s:02d}" if s else "")
+
+
+def _ordinals(wall: datetime) -> set[int]:
+    """The BYDAY ordinals matching a date: its week of the month, and -1 in the last week."""
+    ordinals = {(wall.day - 1) // 7 + 1}
+    if wall.day + 7 > calendar.monthrange(wall.year, wall.month)[1]:
+        ordinals.add(-1)
+    return ordinals
+
+
+def _observance(kind: str, before: int, after: int, name: str | None, start: datetime,
+                extra: list[str] = ()) -> list[str]:
+    lines = [f"BEGIN:{kind}", f"TZOFFSETFROM:{_offset(before)}", f"TZOFFSETTO:{_offset(after)}"]
+    if name:
+        lines.append(f"TZNAME:{name}")
+    return lines + [f"DTSTART:{start:%Y%m%dT%H%M%S}", *extra, f"END:{kind}"]
+
+
+def build_vtimezone(tzid: str, first: int, last: int) -> list[str]:
+    """Unfolded VTIMEZONE lines of tzid for local times in years first..last."""
+    span_start, span_end = _utc(first) - _DAY, _utc(last + 1) + _DAY
+    found = transitions(tzid, _utc(first - 1) - _DAY, span_end)
+    earlier = [tr for tr in found if tr.ts < span_start]
+    found = earlier[-1:] + [tr for tr in found if tr.ts >= span_start]
+
+    components: list[tuple[datetime, list[str]]] = []
+    if not earlier:
+        # No change just before the span: the zone's state then, from 1970 on
+        offset, dst, name = _state(get_zoneinfo(tzid), span_start)
+        components.append((_EPOCH, _observance("DAYLIGHT" if dst else "STANDARD", offset, offset, name, _EPOCH)))
+
+    # Per observance, runs of consecutive years sharing month, weekday, time and week become an RRULE
+    groups: dict[tuple, list[Transition]] = {}
+    for tr in found:
+        groups.setdefault((tr.dst, tr.before, tr.after, tr.name), []).append(tr)
+    for (dst, before, after, name), members in groups.items():
+        kind = "DAYLIGHT" if dst else "STANDARD"
+        runs: list[tuple[list[datetime], set[int]]] = []
+        for tr in members:
+            wall = _wall(tr.ts, tr.before)
+            if runs:
+                walls, ordinals = runs[-1]
+                prev = walls[-1]
+                shared = ordinals & _ordinals(wall)
+                if (wall.year == prev.year + 1 and (wall.month, wall.weekday(), wall.time())
+                        == (prev.month, prev.weekday(), prev.time()) and shared):
+                    walls.append(wall)
+                    runs[-1] = (walls, shared)
+                    continue
+            runs.append(([wall], _ordinals(wall)))
+        singles = []
+        for walls, ordinals in runs:
+            if len(walls) == 1:
+                singles.append(walls[0])
+                continue
+            n = -1 if -1 in ordinals else min(ordinals)
+            rule = (f"RRULE:FREQ=YEARLY;BYMONTH={walls[0].month};BYDAY={n}{DAYS[walls[0].weekday()]};"
+                    f"COUNT={len(walls)}")
+            components.append((walls[0], _observance(kind, before, after, name, walls[0], [rule])))
+        if singles:
+            rdates = [f"RDATE:{','.join(f'{w:%Y%m%dT%H%M%S}' for w in singles[1:])}"] if len(singles) > 1 else []
+            components.append((singles[0], _observance(kind, before, after, name, singles[0], rdates)))
+
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{tzid}", f"X-LIC-LOCATION:{tzid}"]
+    for _, component in sorted(components, key=lambda c: c[0]):
+        lines += component
+    return lines + ["END:VTIMEZONE"]
+
+
+# ---- caches ----
+
+def cache_path() -> Path:
+    """vtimezone.json in $SAWC_CACHE_DIR, else $XDG_CACHE_HOME/sawc or ~/.cache/sawc."""
+    root = os.environ.get("SAWC_CACHE_DIR")
+    if not root:
+        root = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "sawc"
+    return Path(root) / CACHE_FILE
+
+
+def zone_source(tzid: str) -> str:
+    """Digest of tzid's TZif data, so cached blocks follow tzdata updates."""
+    data = b""
+    for root in zoneinfo.TZPATH:
+        path = Path(root, tzid)
+        if path.is_file():
+            data = path.read_bytes()
+            break
+    else:
+        with contextlib.suppress(ImportError, OSError, ValueError):
+            from importlib import resources
+
+            data = resources.files("tzdata").joinpath("zoneinfo", *tzid.split("/")).read_bytes()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _load(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION or not isinstance(data.get("zones"), dict):
+        return {}
+    return data["zones"]
+
+
+@lru_cache(maxsize=1)
+def _disk() -> dict:
+    return _load(cache_path())
+
+
+def _store(key: str, entry: dict) -> None:
+    """Add an entry to the disk cache (merged with what other processes wrote meanwhile)."""
+    path = cache_path()
+    zones = _load(path)
+    zones[key] = entry
+    _disk()[key] = entry
+    with contextlib.suppress(OSError):
+        with open_output(path, newline=None) as out:
+            json.dump({"version": CACHE_VERSION, "zones": zones}, out, ensure_ascii=False, separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def vtimezone(tzid: str, first: int, last: int) -> tuple[str, ...]:
+    """Folded VTIMEZONE lines of tzid for years first..last (ValueError for an unknown zone)."""
+    try:
+        get_zoneinfo(tzid)
+    except (KeyError, ValueError) as e:  # ZoneInfoNotFoundError is a KeyError
+        raise ValueError(f"Unknown time zone for VTIMEZONE: {tzid!r}") from e
+    key, source = f"{tzid} {first}-{last}", zone_source(tzid)
+    entry = _disk().get(key)
+    if isinstance(entry, dict) and entry.get("source") == source and isinstance(entry.get("lines"), list):
+        return tuple(entry["lines"])
+    lines = tuple(fold(line) for line in build_vtimezone(tzid, first, last))
+    _store(key, {"source": source, "lines": list(lines)})
+    return lines
+
+
+def vtimezone_lines(tzid: str, years: tuple[int, int] | None) -> list[str]:
+    """The VTIMEZONE block for a feed spanning years (event_years()); none for an empty feed."""
+    return list(vtimezone(tzid, *years)) if years else []
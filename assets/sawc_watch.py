@@ -0,0 +1,114 @@
+"""
+sawc_watch.py — Wait for an input file to change (the generators' --watch mode)
+
+- FileWatcher(path).wait()   block until path has changed and then stayed
+                             unchanged for `debounce` seconds
+
+A change is any difference in (mtime_ns, size, inode), so editors that save by
+writing a temp file and renaming it over the sheet are caught too. On Linux
+the parent directory is watched with inotify (through ctypes, no extra
+package), so a save is noticed immediately; elsewhere, or if inotify is
+unavailable, the file is polled every `interval` seconds.
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import sys
+import time
+from pathlib import Path
+
+DEBOUNCE = 0.1       # seconds a burst of saves must be quiet before a rebuild
+POLL_INTERVAL = 0.5  # seconds between stat() calls without inotify
+
+# inotify(7) event masks
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+
+
+def _stat_key(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _inotify_fd(directory: Path) -> int | None:
+    """Non-blocking inotify descriptor watching directory, or None if unsupported."""
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes
+
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+    if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class FileWatcher:
+    """Report settled changes to one file; see the module docstring."""
+
+    def __init__(self, path: str | Path, debounce: float = DEBOUNCE, interval: float = POLL_INTERVAL):
+        self.path = Path(path)
+        self.debounce = debounce
+        self.interval = interval
+        self._last = _stat_key(self.path)
+        self._fd = _inotify_fd(self.path.parent.resolve())
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd is not None else "polling"
+
+    def _pause(self, timeout: float) -> None:
+        """Sleep for timeout seconds, or less if inotify reports activity."""
+        if self._fd is None:
+            time.sleep(timeout)
+            return
+        if select.select([self._fd], [], [], timeout)[0]:
+            try:
+                while os.read(self._fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def wait(self) -> None:
+        """Block until the file differs from the last settled state and is quiet again."""
+        while True:
+            key = self._last
+            while key == self._last or key is None:
+                self._pause(self.interval)
+                key = _stat_key(self.path)
+            # Debounce: editors often write a sheet in several steps
+            deadline = time.monotonic() + self.debounce
+            while (remaining := deadline - time.monotonic()) > 0:
+                self._pause(remaining)
+                new = _stat_key(self.path)
+                if new != key:
+                    key = new
+                    deadline = time.monotonic() + self.debounce
+            if key is not None:  # not mid-rename
+                break
+        self._last = key
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> FileWatcher:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+serve_feeds.py — Serve sawc-events.ics and filtered variants from memory
+
+Usage:
+  python assets/serve_feeds.py
+  python assets/serve_feeds.py --events assets/events.json --host 0.0.0.0 --port 8001
+
+Calendar clients poll the feed constantly, and some subscribers only want part
+of it. Static files for every combination of filters don't scale, so this
+asyncio server loads events.json once, renders every VEVENT once (with
+sawc_calendar.to_vevent) and assembles each requested feed from those blocks:
+
+  /sawc-events.ics                          every event, as generate_ics.py writes it
+  /sawc-events.ics?only=meetings            evening club meetings
+  /sawc-events.ics?only=mini                meetings with a mini competition
+  /sawc-events.ics?only=daytime             workshops, show days and other daytime events
+  /sawc-events.ics?hide=cancelled           without "NO MEETING"/"Cancelled" entries
+  /sawc-events.ics?year=2026                one year (repeatable)
+
+Parameters combine (only= and year= take comma-separated lists, matched as
+"any of"); /assets/sawc-events.ics is an alias. Rendered feeds are kept in an
+LRU of --cache-size entries, each with its gzip body and a strong ETag per
+encoding, so a repeat request costs a dict lookup and an If-None-Match poll
+from an up-to-date client gets a 304 with no body. DTSTAMP is the mtime of
+events.json, so the ETags are the same across restarts and servers. Each
+feed carries the VTIMEZONE for the years of its own events, as
+generate_ics.py would write it for them (sawc_vtimezone.py).
+
+events.json is watched (sawc_watch.FileWatcher) and reloaded in a background
+thread whenever a generator rewrites it; the cache is dropped on the swap. A
+file that fails to load is reported and the previous events keep serving.
+A fresh events.json.bin (sawc_events.py) is loaded instead of parsing the JSON.
+bench_serve_feeds.py load-tests the server and --check verifies its output.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import formatdate
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+from generate_ics import TZID, generate_ics
+from sawc_calendar import to_vevent
+from sawc_events import read_events
+from sawc_rrule import is_cancelled
+from sawc_vtimezone import event_years, vtimezone_lines
+from sawc_watch import DEBOUNCE, FileWatcher
+
+FEED_PATHS = ("/sawc-events.ics", "/assets/sawc-events.ics")
+CACHE_SIZE = 128
+MAX_AGE = 300         # seconds clients may reuse a feed without revalidating
+EVENING_HOUR = 17     # meetings start at or after this local hour; earlier is "daytime"
+GZIP_LEVEL = 6
+KINDS = ("meetings", "mini", "daytime")
+_FOOTER = "END:VCALENDAR\r\n"
+
+
+def event_kinds(ev: dict) -> frozenset[str]:
+    """The only= values an event matches."""
+    hour = datetime.fromisoformat(ev["start"]).hour
+    if hour < EVENING_HOUR:
+        return frozenset({"daytime"})
+    kinds = {"meetings"}
+    if ev.get("miniCompetition"):
+        kinds.add("mini")
+    return frozenset(kinds)
+
+
+class Query(NamedTuple):
+    """A feed request in canonical form (the LRU key)."""
+    only: frozenset[str]        # empty: any kind
+    hide_cancelled: bool
+    years: frozenset[str]       # empty: any year
+
+
+def parse_query(query: str) -> Query:
+    """Query from a URL query string; raises ValueError for anything unknown."""
+    params = parse_qs(query, keep_blank_values=True)
+    unknown = set(params) - {"only", "hide", "year"}
+    if unknown:
+        raise ValueError(f"Unknown parameter {sorted(unknown)[0]!r} (only, hide, year)")
+
+    def values(name: str) -> set[str]:
+        return {v.strip() for value in params.get(name, []) for v in value.split(",") if v.strip()}
+
+    only, hide, years = values("only"), values("hide"), values("year")
+    if only - set(KINDS):
+        raise ValueError(f"Unknown only= value {sorted(only - set(KINDS))[0]!r} ({', '.join(KINDS)})")
+    if hide - {"cancelled"}:
+        raise ValueError(f"Unknown hide= value {sorted(hide - {'cancelled'})[0]!r} (cancelled)")
+    if any(not (len(y) == 4 and y.isdigit()) for y in years):
+        raise ValueError("year= takes four-digit years")
+    return Query(frozenset(only), bool(hide), frozenset(years))
+
+
+class Rendered:
+    """One feed's bytes, gzipped bytes and their ETags."""
+    __slots__ = ("body", "gz", "etag", "gz_etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.gz = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.gz_etag = f'"{hashlib.sha256(self.gz).hexdigest()[:32]}"'
+
+
+class Feed:
+    """Pre-rendered VEVENT blocks of one events.json, plus the feed LRU."""
+
+    def __init__(self, path: Path, cache_size: int = CACHE_SIZE):
+        self.path = path
+        events = read_events(path)  # events.json.bin when it is fresh
+        stamp = datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).strftime("%Y%m%dT%H%M%S")
+        # Header (up to the VTIMEZONE) and footer exactly as generate_ics.py writes them around the events
+        self.header = generate_ics([]).removesuffix(_FOOTER).encode("utf-8")
+        self.blocks = []
+        self.meta = []  # (kinds, cancelled, year) per block
+        self.years = []  # (first, last) local year per block, for the VTIMEZONE
+        for ev in events:
+            for required in ("start", "end"):
+                if not ev.get(required):
+                    raise ValueError(f"Event missing required field: {required}\n{ev}")
+            self.blocks.append(("\r\n".join(to_vevent(ev, stamp, TZID)) + "\r\n").encode("utf-8"))
+            self.meta.append((event_kinds(ev), is_cancelled(ev), ev["start"][:4]))
+            self.years.append(event_years([ev]))
+        self.cache_size = cache_size
+        self._cache: OrderedDict[Query, Rendered] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def select(self, q: Query) -> list[int]:
+        return [i for i, (kinds, cancelled, year) in enumerate(self.meta)
+                if (not q.only or kinds & q.only) and not (q.hide_cancelled and cancelled)
+                and (not q.years or year in q.years)]
+
+    def render(self, q: Query) -> Rendered:
+        rendered = self._cache.get(q)
+        if rendered is not None:
+            self._cache.move_to_end(q)
+            return rendered
+        chosen = self.select(q)
+        years = (min(self.years[i][0] for i in chosen), max(self.years[i][1] for i in chosen)) if chosen else None
+        vtimezone = "".join(line + "\r\n" for line in vtimezone_lines(TZID, years)).encode("utf-8")
+        body = b"".join([self.header, vtimezone, *(self.blocks[i] for i in chosen), _FOOTER.encode()])
+        rendered = self._cache[q] = Rendered(body)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return rendered
+
+
+def _accepts_gzip(value: str) -> bool:
+    for coding in value.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _etag_matches(value: str, etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored."""
+    if value.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in value.split(","))
+
+
+class FeedServer:
+    """The asyncio HTTP/1.1 front end (GET and HEAD, keep-alive)."""
+
+    def __init__(self, events_path: str | Path, cache_size: int = CACHE_SIZE, max_age: int = MAX_AGE):
+        self.events_path = Path(events_path)
+        self.cache_size = cache_size
+        self.max_age = max_age
+        self.feed = Feed(self.events_path, cache_size)
+        self._date = (0, b"")
+
+    # ---- responses ----
+
+    def _date_header(self) -> bytes:
+        now = int(time.time())
+        if self._date[0] != now:
+            self._date = (now, formatdate(now, usegmt=True).encode())
+        return self._date[1]
+
+    def _response(self, status: str, headers: list[tuple[str, str]], body: bytes, head_only: bool,
+                  close: bool) -> bytes:
+        lines = [f"HTTP/1.1 {status}", *(f"{k}: {v}" for k, v in headers)]
+        if not status.startswith("304"):
+            lines.append(f"Content-Length: {len(body)}")
+        if close:
+            lines.append("Connection: close")
+        return b"".join([("\r\n".join(lines) + "\r\nDate: ").encode(), self._date_header(), b"\r\n\r\n",
+                         b"" if head_only else body])
+
+    def _error(self, status: str, message: str, close: bool, extra: list[tuple[str, str]] = ()) -> bytes:
+        return self._response(status, [("Content-Type", "text/plain; charset=utf-8"), *extra],
+                              (message + "\n").encode(), False, close)
+
+    def respond(self, method: str, target: str, headers: dict[str, str], close: bool) -> bytes:
+        if method not in ("GET", "HEAD"):
+            return self._error("405 Method Not Allowed", "Only GET and HEAD", close, [("Allow", "GET, HEAD")])
+        url = urlsplit(target)
+        if url.path not in FEED_PATHS:
+            return self._error("404 Not Found", f"Not found: {url.path}", close)
+        try:
+            query = parse_query(url.query)
+        except ValueError as e:
+            return self._error("400 Bad Request", str(e), close)
+
+        rendered = self.feed.render(query)
+        gz = _accepts_gzip(headers.get("accept-encoding", ""))
+        etag = rendered.gz_etag if gz else rendered.etag
+        common = [("ETag", etag), ("Cache-Control", f"public, max-age={self.max_age}"), ("Vary", "Accept-Encoding")]
+        if "if-none-match" in headers and _etag_matches(headers["if-none-match"], etag):
+            return self._response("304 Not Modified", common, b"", True, close)
+        common.insert(0, ("Content-Type", "text/calendar; charset=utf-8"))
+        if gz:
+            common.append(("Content-Encoding", "gzip"))
+        return self._response("200 OK", common, rendered.gz if gz else rendered.body, method == "HEAD", close)
+
+    # ---- connections ----
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request, *lines = head[:-4].decode("latin-1").split("\r\n")
+                parts = request.split()
+                if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+                    writer.write(self._error("400 Bad Request", "Malformed request line", True))
+                    break
+                method, target, version = parts
+                headers = {}
+                for line in lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                close = connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive")
+                writer.write(self.respond(method, target, headers, close))
+                await writer.drain()
+                if close:
+                    break
+        finally:
+            writer.close()
+
+    # ---- hot reload ----
+
+    def _swap(self, feed: Feed) -> None:
+        self.feed = feed
+        print(f"Reloaded {self.events_path} ({len(feed)} events)", flush=True)
+
+    def watch(self, loop: asyncio.AbstractEventLoop, debounce: float = DEBOUNCE) -> None:
+        """Reload events.json in a daemon thread after every settled change."""
+        def run() -> None:
+            with FileWatcher(self.events_path, debounce=debounce) as watcher:
+                while True:
+                    watcher.wait()
+                    try:
+                        feed = Feed(self.events_path, self.cache_size)
+                    except Exception as e:
+                        # A broken file must not take the feeds down: keep serving the old events
+                        print(f"✗ {self.events_path}: {type(e).__name__}: {e}", file=sys.stderr, flush=True)
+                        continue
+                    loop.call_soon_threadsafe(self._swap, feed)
+
+        threading.Thread(target=run, name="feed-watcher", daemon=True).start()
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        self.watch(asyncio.get_running_loop())
+        names = ", ".join(f"http://{s.getsockname()[0]}:{s.getsockname()[1]}{FEED_PATHS[0]}" for s in server.sockets)
+        print(f"Serving {len(self.feed)} events from {self.events_path} on {names}; Ctrl-C to stop", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Serve sawc-events.ics and filtered feeds from memory")
+    ap.add_argument("--events", default="./assets/events.json", help="Path to events.json (reloaded on change)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8001)
+    ap.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="Rendered feeds kept in the LRU")
+    ap.add_argument("--max-age", type=int, default=MAX_AGE, help="Cache-Control max-age in seconds")
+    args = ap.parse_args(argv)
+
+    try:
+        server = FeedServer(args.events, args.cache_size, args.max_age)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Failed to load {args.events}: {e}", file=sys.stderr)
+        return 2
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
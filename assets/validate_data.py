@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+validate_data.py — Check events.json and results.json before publishing
+
+Usage:
+  python assets/validate_data.py                        # assets/events.json and assets/data/results.json
+  python assets/validate_data.py --events feeds/2025/events.json --events feeds/mead/events.json
+  python assets/validate_data.py --results assets/data/results.json --jobs 4
+
+The generators only stop at the first event without a start or end, and
+nothing looked at results.json outside build_results_index.py. This command
+checks every event and every show year in one pass and lists every problem
+with its JSON path, so a publish can be gated on its exit status:
+
+  events.json   the root is a list of objects; id, title, start and end are
+                non-empty; every field is one of the events.json fields and a
+                string; start and end are ISO timestamps with a UTC offset and
+                the event does not end before it starts; ids are unique
+                across the whole file
+  results.json  build_results_index.validate_year() for each year: unique
+                ids and class codes; every entry has a class_id and
+                entrant_id that resolve, and winner_entry_id resolves;
+                Score within 0-MAX_SCORE, Score100 and Medal agree with
+                it (No Award when disqualified);
+                exhibit_numbers are unique within the year
+
+References and repeats are found through dict/set indexes built once per
+year (or once per events file), so every check is linear. With --jobs > 1
+and more than POOL_BYTES of input, the checks run in worker processes: each
+file is one job, and a file of POOL_BYTES or more is split into --jobs
+parts. Parsed events are slow to pickle, so every part parses the file
+itself and checks only its own range of events (the last part also checks
+ids across the whole file) or of show years; the parts' problems are joined
+in file order, as one process would list them. Smaller inputs, like the
+club's whole archive, are checked in-process, where starting workers would
+cost more than the checks.
+
+Problems are printed as "<file>: <path>: <message>", e.g.
+
+  assets/events.json: [41] (20250603-monthly-meeting): end '...' is before start '...'
+  assets/data/results.json: 2025.entries[3] (entry-2025-35): judging.Medal 'Gold' does not match Score 16.0 ...
+
+Exit status: 0 everything valid, 2 any problem (or an unreadable file).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from build_results_index import validate_year
+from sawc_events import FIELDS
+
+POOL_BYTES = 4 << 20  # below this, workers take longer to start than the checks
+REQUIRED = ("id", "title", "start", "end")
+_KNOWN = frozenset(FIELDS)
+
+
+def _when(ev: dict, field: str, where: str, problems: list[str]) -> datetime | None:
+    value = ev.get(field)
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        problems.append(f"{where}: {field} is not an ISO timestamp: {value!r}")
+        return None
+    if moment.utcoffset() is None:
+        problems.append(f"{where}: {field} has no UTC offset: {value!r}")
+        return None
+    return moment
+
+
+def check_events(events: list, start: int = 0) -> list[str]:
+    """Problems with each event of a parsed events.json (ids are checked by repeated_ids).
+
+    events may be a slice of the file; start is the index of its first event.
+    """
+    problems: list[str] = []
+    for i, ev in enumerate(events, start):
+        if not isinstance(ev, dict):
+            problems.append(f"[{i}]: expected an object, got {type(ev).__name__}")
+            continue
+        where = f"[{i}] ({ev['id']})" if isinstance(ev.get("id"), str) and ev["id"] else f"[{i}]"
+        for field in REQUIRED:
+            if ev.get(field) in (None, ""):
+                problems.append(f"{where}: missing {field}")
+        for field, value in ev.items():
+            if field not in _KNOWN:
+                problems.append(f"{where}: unknown field {field!r}")
+            elif value is not None and not isinstance(value, str):
+                problems.append(f"{where}: {field} is not a string: {value!r}")
+        start, end = _when(ev, "start", where, problems), _when(ev, "end", where, problems)
+        if start is not None and end is not None and end < start:
+            problems.append(f"{where}: end {ev['end']!r} is before start {ev['start']!r}")
+    return problems
+
+
+def repeated_ids(events: list) -> list[str]:
+    """Problems for event ids used more than once (the first use is fine)."""
+    problems = []
+    first: dict[str, int] = {}
+    for i, ev in enumerate(events):
+        event_id = ev.get("id") if isinstance(ev, dict) else None
+        if not isinstance(event_id, str) or not event_id:
+            continue
+        if event_id in first:
+            problems.append(f"[{i}] ({event_id}): repeats the id of [{first[event_id]}]")
+        else:
+            first[event_id] = i
+    return problems
+
+
+def check_file(path: str, kind: str, part: int = 0, parts: int = 1) -> tuple[str, list[str]]:
+    """(summary, problems) for one events.json ("events") or results.json ("results").
+
+    With parts > 1 only part (0-based) of the events or show years is
+    checked; run_checks() joins the parts. A file that cannot be read gives
+    (path, [the reason]) in every part.
+    """
+    try:
+        doc = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        return path, [f"cannot read: {e}"]
+    if kind == "events":
+        if not isinstance(doc, list):
+            return path, ["root must be a list of events"]
+        lo, hi = len(doc) * part // parts, len(doc) * (part + 1) // parts
+        problems = check_events(doc[lo:hi], lo)
+        if part == parts - 1:
+            problems += repeated_ids(doc)
+        return f"{len(doc)} events in {path}", problems
+    if not isinstance(doc, dict):
+        return path, ["root must be an object keyed by show year"]
+    keys = list(doc)
+    problems = []
+    for key in keys[len(keys) * part // parts:len(keys) * (part + 1) // parts]:
+        validate_year(key, doc[key], problems)
+    return f"{len(doc)} years in {path}", problems
+
+
+def run_checks(files: list[tuple[str, str]], workers: int) -> list[tuple[str, list[str]]]:
+    """check_file() for each (path, kind), in order; in a pool when workers > 1 and the input is large."""
+    sizes = [_size(path) for path, _ in files]
+    if workers <= 1 or sum(sizes) < POOL_BYTES:
+        return [check_file(path, kind) for path, kind in files]
+    # Biggest files first so a large events.json does not finish last on its own
+    split = [workers if size >= POOL_BYTES else 1 for size in sizes]
+    jobs = [(i, part) for i in sorted(range(len(files)), key=lambda i: -sizes[i]) for part in range(split[i])]
+    done: dict[tuple[int, int], tuple[str, list[str]]] = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {pool.submit(check_file, *files[i], part, split[i]): (i, part) for i, part in jobs}
+        for fut in as_completed(futures):
+            done[futures[fut]] = fut.result()
+    results = []
+    for i, (path, _) in enumerate(files):
+        summary, problems = done[i, 0]
+        if summary != path:  # an unreadable file is reported (with its path as summary) by every part
+            problems = [p for part in range(split[i]) for p in done[i, part][1]]
+        results.append((summary, problems))
+    return results
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Validate events.json and results.json, listing every problem")
+    ap.add_argument("--events", action="append", metavar="PATH",
+                    help="An events.json to check (repeatable; default assets/events.json)")
+    ap.add_argument("--results", action="append", metavar="PATH",
+                    help="A results.json to check (repeatable; default assets/data/results.json)")
+    ap.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                    help="Worker processes (default: CPU count; 1 checks in-process)")
+    args = ap.parse_args(argv)
+
+    files = [(p, "events") for p in args.events or []] + [(p, "results") for p in args.results or []]
+    if not files:
+        files = [(str(Path(__file__).with_name("events.json")), "events"),
+                 (str(Path(__file__).with_name("data") / "results.json"), "results")]
+
+    t0 = time.perf_counter()
+    problems, counts = [], []
+    for (path, _), (summary, found) in zip(files, run_checks(files, args.jobs)):
+        counts.append(summary)
+        problems += [f"{path}: {p}" for p in found]
+    elapsed = time.perf_counter() - t0
+
+    if problems:
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        print(f"ERROR: {len(problems)} problem{'s' * (len(problems) != 1)} found in {elapsed:.2f} s",
+              file=sys.stderr)
+        return 2
+    print(f"OK: {'; '.join(counts)} valid ({elapsed:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
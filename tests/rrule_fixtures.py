@@ -0,0 +1,42 @@
+"""Synthetic club schedules shared by tests/test_rrule.py and assets/bench_rrule.py."""
+
+from __future__ import annotations
+
+import random
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sawc_rrule import nth_weekday
+
+TZ = ZoneInfo("Australia/Sydney")
+VENUE = "Club Rivers 32 Littleton St, Riverwood NSW 2210"
+TOPICS = ["Racking and fining", "Oak in Wine", "Making mead", "Exotic wine tasting", "Sulphur dioxide and pH"]
+
+
+def event(i: int, day: date, hm: tuple[int, int], hours: float, title: str, **fields) -> dict:
+    """An events.json event starting at hm local time on day, lasting hours (elapsed)."""
+    start = datetime(day.year, day.month, day.day, *hm, tzinfo=TZ)
+    end = (start.astimezone(ZoneInfo("UTC")) + timedelta(hours=hours)).astimezone(TZ)
+    return {"id": f"ev-{i}", "title": title, "start": start.isoformat(), "end": end.isoformat(),
+            "location": fields.get("location", VENUE), "description": "",
+            "meetingActivity": title, "miniCompetition": fields.get("mini", ""), "comments": ""}
+
+
+def archive(years: int, topical: float, seed: int = 1) -> list[dict]:
+    """A regular club schedule: monthly meetings plus occasional workshops."""
+    rnd = random.Random(seed)
+    events = []
+    for year in range(2026 - years, 2026):
+        for month in range(1, 13):
+            day = nth_weekday(year, month, 3, 1)
+            if month == 1:
+                title = "NO MEETING"
+            elif rnd.random() < topical:
+                title = rnd.choice(TOPICS)
+            else:
+                title = "Monthly Meeting"
+            events.append(event(len(events), day, (19, 30), 2, title))
+            if month in (6, 9):
+                events.append(event(len(events), day + timedelta(days=9), (10, 0), 2, "Workshop"))
+    events.sort(key=lambda e: e["start"])
+    return events
@@ -0,0 +1,69 @@
+"""build_calendars.py jobs write what generate_events_from_clean.py writes for the same sheet."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "assets"))
+
+import build_calendars  # noqa: E402
+import generate_events_from_clean  # noqa: E402
+
+SHEET = """Date,Start,End,Meeting Activity,Location
+2/10/2025,10:00,11:00,Monthly Meeting,Club Rivers
+2/10/2025,19:30,21:30,Monthly Meeting,Club Rivers
+6/11/2025,19:30,21:30,Monthly Meeting,Club Rivers
+6/11/2025,19:30,21:30,Wine Show,
+"""
+
+
+class BatchJobTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.sheet = self.dir / "sheet.csv"
+        self.sheet.write_text(SHEET, encoding="utf-8")
+
+    def run_job(self, **job) -> dict:
+        job = {**build_calendars.JOB_DEFAULTS, "name": "test", "input": str(self.sheet), **job}
+        result = build_calendars.run_job(job)
+        self.assertIsNone(result["error"])
+        return result
+
+    def test_matches_generator(self):
+        for id_mode in ("deterministic", "uuid"):
+            for engine in ("vectorized", "rows"):
+                with self.subTest(id_mode=id_mode, engine=engine):
+                    batch, single = self.dir / "batch.json", self.dir / "single.json"
+                    self.run_job(json=str(batch), idMode=id_mode, engine=engine)
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        generate_events_from_clean.main([str(self.sheet), "--json", str(single),
+                                                         "--id-mode", id_mode, "--engine", engine])
+                    batch_events = json.loads(batch.read_text(encoding="utf-8"))
+                    single_events = json.loads(single.read_text(encoding="utf-8"))
+                    if id_mode == "uuid":  # random ids: compare everything else
+                        for ev in batch_events + single_events:
+                            ev.pop("id")
+                        self.assertEqual(batch_events, single_events)
+                    else:
+                        self.assertEqual(batch.read_bytes(), single.read_bytes())
+
+    def test_same_day_ids_are_unique(self):
+        out, ics = self.dir / "events.json", self.dir / "events.ics"
+        result = self.run_job(json=str(out), ics=str(ics), idMode="deterministic")
+        ids = [ev["id"] for ev in json.loads(out.read_text(encoding="utf-8"))]
+        self.assertEqual(result["events"], 4)
+        self.assertEqual(len(set(ids)), len(ids), ids)
+        uids = [line for line in ics.read_text(encoding="utf-8").splitlines() if line.startswith("UID:")]
+        self.assertEqual(len(set(uids)), 4, uids)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Property checks for sawc_ics.fold (RFC 5545 folding on UTF-8 octets)."""
+
+from __future__ import annotations
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "assets"))
+
+from sawc_ics import FOLD_OCTETS, fold  # noqa: E402
+
+ASCII = "abcdefghijklmnopqrstuvwxyz ABCDEFGHIJKLMNOPQRSTUVWXYZ 0123456789 ,.;:\\"
+MULTIBYTE = "éüñßøå—“”€ 中文字符 日本語 한국어 🙂📅🏆 Ωλπ"
+CASES = 5000
+
+
+def fold_before(line: str) -> str:
+    """The character-based fold sawc_ics.fold replaced."""
+    res = []
+    s = line
+    while len(s) > 74:
+        res.append(s[:74])
+        s = " " + s[74:]
+    res.append(s)
+    return "\r\n".join(res)
+
+
+def random_lines(seed: int = 1):
+    rnd = random.Random(seed)
+    for _ in range(CASES):
+        alphabet = rnd.choice([ASCII, MULTIBYTE, ASCII + MULTIBYTE])
+        yield "".join(rnd.choice(alphabet) for _ in range(rnd.randrange(0, 600)))
+
+
+class FoldTest(unittest.TestCase):
+    def test_physical_lines_fit(self):
+        for line in random_lines():
+            for part in fold(line).split("\r\n"):
+                self.assertLessEqual(len(part.encode("utf-8")), FOLD_OCTETS, line)
+
+    def test_continuations_start_with_a_space(self):
+        for line in random_lines():
+            parts = fold(line).split("\r\n")
+            self.assertTrue(all(p.startswith(" ") for p in parts[1:]), line)
+
+    def test_every_physical_line_is_utf8(self):
+        for line in random_lines():
+            for part in fold(line).encode("utf-8").split(b"\r\n"):
+                part.decode("utf-8")  # raises on a split character
+
+    def test_unfold_restores_the_line(self):
+        for line in random_lines():
+            parts = fold(line).split("\r\n")
+            self.assertEqual("".join([parts[0]] + [p[1:] for p in parts[1:]]), line)
+
+    def test_ascii_matches_the_old_fold(self):
+        for line in random_lines():
+            if line.isascii():
+                self.assertEqual(fold(line), fold_before(line))
+
+    def test_short_lines_are_unchanged(self):
+        self.assertEqual(fold("SUMMARY:Monthly Meeting"), "SUMMARY:Monthly Meeting")
+        self.assertEqual(fold("é" * (FOLD_OCTETS // 2)), "é" * (FOLD_OCTETS // 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Round-trip tests for the ICS generators' --rrule mode (sawc_rrule.py).
+
+Random schedules (missed months, cancellations, duplicate and last-weekday
+slots, DST-spanning events), a 20-year archive and assets/events.json are
+rendered by both generators with and without RRULE compression;
+sawc_rrule.expand_calendar() of the compressed feed must equal that of the
+plain feed minus the cancelled meetings that became EXDATEs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from datetime import timedelta
+from pathlib import Path
+
+ASSETS = Path(__file__).resolve().parent.parent / "assets"
+sys.path.insert(0, str(ASSETS))
+
+import generate_ics  # noqa: E402
+import generate_ics_refactored  # noqa: E402
+import sawc_vtimezone  # noqa: E402
+from rrule_fixtures import TOPICS, VENUE, archive, event  # noqa: E402
+from sawc_rrule import Series, compress, expand_calendar, is_cancelled, nth_weekday  # noqa: E402
+
+CASES = 300
+_cache_dir = tempfile.TemporaryDirectory()
+_saved_env = None
+
+
+def setUpModule():
+    # Keep computed VTIMEZONE blocks out of the user's cache
+    global _saved_env
+    _saved_env = os.environ.get("SAWC_CACHE_DIR")
+    os.environ["SAWC_CACHE_DIR"] = _cache_dir.name
+    sawc_vtimezone._disk.cache_clear()
+
+
+def tearDownModule():
+    if _saved_env is None:
+        os.environ.pop("SAWC_CACHE_DIR", None)
+    else:
+        os.environ["SAWC_CACHE_DIR"] = _saved_env
+    sawc_vtimezone._disk.cache_clear()
+    _cache_dir.cleanup()
+
+
+def random_schedule(rnd: random.Random) -> list[dict]:
+    """Irregular schedules that exercise every branch of compress()."""
+    events = []
+    weekday, n = rnd.randrange(7), rnd.choice([1, 2, 3, 4, -1])
+    first = rnd.randrange(2000, 2030)
+    for k in range(rnd.randrange(0, 60)):
+        year, month = first + k // 12, k % 12 + 1
+        if rnd.random() < 0.15:
+            continue  # no entry at all this month
+        day = nth_weekday(year, month, weekday, n)
+        r = rnd.random()
+        if r < 0.1:
+            title = rnd.choice(["NO MEETING", "Cancelled - venue closed"])
+        elif r < 0.3:
+            title = rnd.choice(TOPICS)
+        else:
+            title = "Monthly Meeting"
+        events.append(event(len(events), day, (19, 30), 2, title,
+                             location=rnd.choice([VENUE, VENUE, ""]), mini=rnd.choice(["", "", "Mead"])))
+        if rnd.random() < 0.05:  # a second event in the same slot
+            events.append(event(len(events), day, (19, 30), 2, "Monthly Meeting"))
+        if rnd.random() < 0.1:  # something else that week (may span a DST change)
+            events.append(event(len(events), day + timedelta(days=2), (rnd.choice([1, 10]), 0),
+                                 rnd.choice([2, 3, 30]), "Workshop"))
+    events.sort(key=lambda e: e["start"])
+    return events
+
+
+RENDERERS = {
+    "generate_ics": lambda events, rrule: generate_ics.generate_ics(events, rrule=rrule),
+    "generate_ics_refactored": lambda events, rrule: generate_ics_refactored.generate_ics(
+        events, generate_ics_refactored.TZID, generate_ics_refactored.CAL_NAME, generate_ics_refactored.CAL_DESC,
+        generate_ics_refactored.PRODID, generate_ics_refactored.DEFAULT_LOCATION, rrule=rrule),
+}
+
+
+class RoundTripTest(unittest.TestCase):
+    def assertRoundTrips(self, events: list[dict]) -> int:
+        """Both generators' compressed feeds expand to the plain events; returns the RRULE series."""
+        items = compress(events)
+        dropped = {m for item in items if isinstance(item, Series) for m in item.members
+                   if is_cancelled(events[m])}
+        kept = [ev for i, ev in enumerate(events) if i not in dropped]
+        for name, render in RENDERERS.items():
+            with self.subTest(generator=name):
+                self.assertEqual(expand_calendar(render(events, True)), expand_calendar(render(kept, False)))
+        return sum(isinstance(item, Series) for item in items)
+
+    def test_site_events(self):
+        events = json.loads((ASSETS / "events.json").read_text(encoding="utf-8"))
+        self.assertRoundTrips(events)
+
+    def test_archive_is_folded(self):
+        self.assertGreater(self.assertRoundTrips(archive(20, 0.3)), 0)
+
+    def test_random_schedules(self):
+        rnd = random.Random(1)
+        folded = 0
+        for i in range(CASES):
+            with self.subTest(case=i):
+                folded += self.assertRoundTrips(random_schedule(rnd))
+        self.assertGreater(folded, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()